@@ -0,0 +1,57 @@
+"""materialized latest offline price and guardrail tables
+
+Revision ID: 20260301_0002
+Revises: 20260220_0001
+Create Date: 2026-03-01 10:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20260301_0002"
+down_revision = "20260220_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "latest_offline_price",
+        sa.Column("store_id", sa.String(length=64), nullable=False),
+        sa.Column("product_norm_key", sa.String(length=128), nullable=False),
+        sa.Column("price_snapshot_key", sa.String(length=160), nullable=False),
+        sa.Column("price_won", sa.Integer(), nullable=False),
+        sa.Column("observed_at", sa.String(length=64), nullable=False),
+        sa.Column("source", sa.String(length=120), nullable=False),
+        sa.Column("notice", sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(["product_norm_key"], ["product_norm.product_norm_key"]),
+        sa.ForeignKeyConstraint(["store_id"], ["store_master.store_id"]),
+        sa.PrimaryKeyConstraint("store_id", "product_norm_key"),
+    )
+    op.create_index(
+        "idx_latest_offline_price_product",
+        "latest_offline_price",
+        ["product_norm_key"],
+        unique=False,
+    )
+
+    op.create_table(
+        "offline_price_guardrail",
+        sa.Column("product_norm_key", sa.String(length=128), nullable=False),
+        sa.Column("median_price", sa.Float(), nullable=False),
+        sa.Column("lower_bound", sa.Integer(), nullable=False),
+        sa.Column("upper_bound", sa.Integer(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(["product_norm_key"], ["product_norm.product_norm_key"]),
+        sa.PrimaryKeyConstraint("product_norm_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("offline_price_guardrail")
+
+    op.drop_index("idx_latest_offline_price_product", table_name="latest_offline_price")
+    op.drop_table("latest_offline_price")
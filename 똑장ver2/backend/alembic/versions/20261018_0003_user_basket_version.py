@@ -0,0 +1,27 @@
+"""user basket row version for optimistic concurrency
+
+Revision ID: 20261018_0003
+Revises: 20260301_0002
+Create Date: 2026-10-18 10:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0003"
+down_revision = "20260301_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user_baskets",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user_baskets", "version")
@@ -0,0 +1,35 @@
+"""persisted chat history
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18 11:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chat_messages",
+        sa.Column("message_id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.String(length=64), nullable=False),
+        sa.Column("role", sa.String(length=16), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.user_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("message_id"),
+    )
+    op.create_index("idx_chat_messages_user", "chat_messages", ["user_id", "message_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_chat_messages_user", table_name="chat_messages")
+    op.drop_table("chat_messages")
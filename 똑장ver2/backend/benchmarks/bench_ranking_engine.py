@@ -0,0 +1,115 @@
+"""RankingEngine 마이크로벤치마크.
+
+    python -m benchmarks.bench_ranking_engine [--candidates 10000] [--repeat 20]
+
+파레토 프런티어 엔진과, 커버리지 필터 2회 + 유형별 전체 정렬 3회를 하던 이전 방식을
+같은 후보 풀에서 비교한다.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable
+
+from src.application.services.ranking_engine import RankingEngine
+from src.domain.models.plan import Plan, PlanItem, PlanType
+
+
+def build_candidates(size: int, *, total_items: int = 8, seed: int = 42) -> list[Plan]:
+    rng = random.Random(seed)
+    candidates: list[Plan] = []
+    for idx in range(size):
+        coverage = rng.randint(3, total_items)
+        total = rng.randint(15000, 60000)
+        candidates.append(
+            Plan(
+                plan_type=PlanType.CHEAPEST,
+                mart_name=f"mart-{idx}",
+                items=[
+                    PlanItem(
+                        item_name=f"item_{i}",
+                        brand=None,
+                        size=None,
+                        quantity=1,
+                        price=total // coverage,
+                        store_name=f"mart-{idx}",
+                    )
+                    for i in range(coverage)
+                ],
+                estimated_total=total,
+                coverage=coverage,
+                total_basket_items=total_items,
+                coverage_ratio=coverage / total_items,
+                travel_minutes=rng.choice([None, *range(3, 90)]),
+                explanation="",
+            )
+        )
+    return candidates
+
+
+def legacy_rank_plans(candidates: list[Plan]) -> list[Plan]:
+    """이전 구현: 필터 2회, 유형별 전체 정렬, 중복 시 입력 순서 차선책."""
+    filtered = [p for p in candidates if p.coverage_ratio >= RankingEngine.MIN_COVERAGE]
+    if len(filtered) < 3:
+        filtered = [p for p in candidates if p.coverage_ratio >= RankingEngine.FALLBACK_MIN_COVERAGE]
+    if not filtered:
+        return []
+
+    cheapest = sorted(filtered, key=lambda p: (p.estimated_total, -p.coverage, p.travel_minutes or 999))[0]
+    nearest = sorted(filtered, key=lambda p: (p.travel_minutes or 999, p.estimated_total, -p.coverage))[0]
+
+    prices = [p.estimated_total for p in filtered]
+    travels = [p.travel_minutes or 999 for p in filtered]
+    coverages = [p.coverage_ratio for p in filtered]
+    price_min, travel_min, cov_min = min(prices), min(travels), min(coverages)
+    price_range = max(prices) - price_min or 1
+    travel_range = max(travels) - travel_min or 1
+    cov_range = max(coverages) - cov_min or 1
+    balanced = sorted(
+        filtered,
+        key=lambda p: 0.5 * (p.estimated_total - price_min) / price_range
+        + 0.3 * ((p.travel_minutes or 999) - travel_min) / travel_range
+        - 0.2 * (p.coverage_ratio - cov_min) / cov_range,
+    )[0]
+
+    result = [
+        cheapest.model_copy(update={"plan_type": PlanType.CHEAPEST, "badges": ["최저가"]}),
+        nearest.model_copy(update={"plan_type": PlanType.NEAREST, "badges": ["가까움"]}),
+    ]
+    existing = {p.mart_name for p in result}
+    if balanced.mart_name in existing:
+        balanced = next((p for p in filtered if p.mart_name not in existing), balanced)
+    result.append(balanced.model_copy(update={"plan_type": PlanType.BALANCED, "badges": ["추천"]}))
+    return result
+
+
+def measure(fn: Callable[[list[Plan]], list[Plan]], candidates: list[Plan], repeat: int) -> list[float]:
+    fn(candidates)  # 워밍업
+    samples: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(candidates)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    candidates = build_candidates(args.candidates)
+    engine = RankingEngine()
+    for name, fn in (("pareto", engine.rank_plans), ("legacy", legacy_rank_plans)):
+        samples = measure(fn, candidates, args.repeat)
+        print(
+            f"{name:>7}: n={len(candidates)} repeat={args.repeat} "
+            f"median={statistics.median(samples):.2f}ms min={min(samples):.2f}ms max={max(samples):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from typing import AsyncIterator
 
+import aiosqlite
 from fastapi import Header, HTTPException, Request, status
 
 from src.core.config import settings
 from src.core.security import TokenValidationError, validate_session_token
+from src.infrastructure.persistence.auth_session_cache import AuthSessionCache, get_auth_session_cache
 from src.infrastructure.persistence.user_repository import UserRepository
 
 
@@ -17,6 +21,29 @@ class AuthUser:
     session_id: str
 
 
+@asynccontextmanager
+async def read_connection(request: Request) -> AsyncIterator[aiosqlite.Connection]:
+    """읽기 전용 경로용 연결. 연결 풀이 있으면 읽기 연결을 빌리고, 없으면 공용 연결을 쓴다."""
+    pool = getattr(request.app.state, "db_pool", None)
+    if pool is None:
+        yield request.app.state.db
+        return
+    async with pool.reader() as connection:
+        yield connection
+
+
+def user_repository(request: Request) -> UserRepository:
+    """(있으면) 연결 풀의 읽기 연결과 group commit 큐를 쓰는 repository. 풀이 없으면 공용 연결.
+
+    요청마다 하나를 공유해, 한 요청의 쓰기를 `unit_of_work()`로 묶을 수 있게 한다.
+    """
+    repo = getattr(request.state, "user_repository", None)
+    if repo is None:
+        repo = UserRepository(request.app.state.db, pool=getattr(request.app.state, "db_pool", None))
+        request.state.user_repository = repo
+    return repo
+
+
 def _unauthorized(detail: str = "Unauthorized") -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,7 +77,19 @@ async def require_auth(
     if db is None:
         raise _unauthorized("Service unavailable")
 
-    repo = UserRepository(db)
+    auth_cache = get_auth_session_cache()
+    cached = auth_cache.get(claims.sid, claims.sub)
+    if cached is not None:
+        _record_session_use(auth_cache, claims.sid)
+        return AuthUser(
+            user_id=cached.user_id,
+            email=cached.email,
+            name=cached.name,
+            session_id=claims.sid,
+        )
+
+    generation = auth_cache.generation
+    repo = UserRepository(db, pool=getattr(request.app.state, "db_pool", None))
     session = await repo.get_session(claims.sid)
     if not session:
         raise _unauthorized("Session not found")
@@ -62,11 +101,21 @@ async def require_auth(
     if not user or not int(user.get("is_active", 0)):
         raise _unauthorized("User not available")
 
-    await repo.touch_session(claims.sid)
+    principal = auth_cache.put(claims.sid, user, generation)
+    if auth_cache.deferred_touch:
+        auth_cache.touch(claims.sid)
+    else:
+        await repo.touch_session(claims.sid)
 
     return AuthUser(
-        user_id=claims.sub,
-        email=str(user.get("email") or ""),
-        name=user.get("name"),
+        user_id=principal.user_id,
+        email=principal.email,
+        name=principal.name,
         session_id=claims.sid,
     )
+
+
+def _record_session_use(auth_cache: AuthSessionCache, session_id: str) -> None:
+    # 캐시 적중 시에는 지연 기록만 한다 (기록 루프가 없으면 TTL 만료 후 다음 조회에서 갱신)
+    if auth_cache.deferred_touch:
+        auth_cache.touch(session_id)
@@ -6,7 +6,7 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
-from src.api.v1.dependencies import AuthUser, require_auth
+from src.api.v1.dependencies import AuthUser, require_auth, user_repository
 from src.core.config import settings
 from src.core.security import (
     TokenValidationError,
@@ -123,8 +123,7 @@ async def login(payload: LoginRequest, request: Request):
     if "@" not in normalized_email or normalized_email.startswith("@") or normalized_email.endswith("@"):
         raise HTTPException(status_code=400, detail="Invalid email")
 
-    db = request.app.state.db
-    repo = UserRepository(db)
+    repo = user_repository(request)
 
     user = await repo.ensure_user(email=normalized_email, name=payload.name)
     if not user:
@@ -155,7 +154,7 @@ async def refresh(payload: RefreshRequest, request: Request):
     except TokenValidationError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
 
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     session = await repo.get_session(claims.sid)
     if not session:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session not found")
@@ -194,7 +193,7 @@ async def logout(
     payload: LogoutRequest,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
 
     target_session_id = current_user.session_id
     if payload.refresh_token:
@@ -1,31 +1,81 @@
 from __future__ import annotations
 
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 
-from src.api.v1.dependencies import AuthUser, require_auth
+from src.api.v1.dependencies import AuthUser, require_auth, user_repository
 from src.domain.models.basket import Basket, BasketItem
-from src.infrastructure.persistence.user_repository import UserRepository
+from src.infrastructure.persistence.basket_store import BasketSnapshot, get_versioned_basket_store
+
+T = TypeVar("T")
 
 router = APIRouter(prefix="/basket", tags=["basket"])
 
-# 그래프 노드 호환용 인메모리 캐시 (SoR는 DB)
-_basket_store_by_user: dict[str, Basket] = {}
+
+@dataclass
+class _RequestBasket:
+    basket: Basket  # 그래프 노드가 고치는 작업본
+    loaded: BasketSnapshot  # 이 요청이 읽은 내용·버전 (저장 생략 판단·충돌 감지용)
+
+
+# 요청별 작업본. 같은 사용자의 동시 요청이 서로의 작업본·읽은 버전을 덮지 않는다. SoR는 DB,
+# 버전 캐시는 VersionedBasketStore. 요청 밖(스크립트·테스트)에서는 `bind_basket()`으로 묶는다
+_request_baskets: ContextVar[Optional[dict[str, _RequestBasket]]] = ContextVar("request_baskets", default=None)
 
 
 def get_basket_store(user_id: str) -> Basket:
-    return _basket_store_by_user.setdefault(user_id, Basket(items=[]))
+    entry = (_request_baskets.get() or {}).get(user_id)
+    if entry is None:
+        # 읽지 않은 사용자는 빈 장바구니(버전 0)에서 시작한다. 저장 때 버전이 다르면 변경분만 다시 적용된다
+        return bind_basket(user_id)
+    return entry.basket
+
+
+def bind_basket(user_id: str, basket: Optional[Basket] = None, version: int = 0) -> Basket:
+    """현재 컨텍스트(요청)에 사용자 작업본을 묶는다. 이후 그래프 노드는 이 작업본을 고친다."""
+    return _remember(user_id, BasketSnapshot(basket if basket is not None else Basket(items=[]), version))
+
+
+def _remember(user_id: str, snapshot: BasketSnapshot) -> Basket:
+    entry = _RequestBasket(
+        basket=snapshot.basket,
+        loaded=BasketSnapshot(snapshot.basket.model_copy(deep=True), snapshot.version),
+    )
+    scope = _request_baskets.get()
+    if scope is None:
+        scope = {}
+        _request_baskets.set(scope)
+    # 같은 컨텍스트에서 만든 그래프 태스크도 같은 dict를 보므로 제자리로 갱신한다
+    scope[user_id] = entry
+    return entry.basket
 
 
 async def sync_basket_store_from_db(request: Request, user_id: str) -> Basket:
-    repo = UserRepository(request.app.state.db)
-    basket = await repo.get_basket(user_id)
-    _basket_store_by_user[user_id] = basket
-    return basket
+    snapshot = await get_versioned_basket_store().load(user_repository(request), user_id)
+    return _remember(user_id, snapshot)
 
 
 async def save_basket_store_to_db(request: Request, user_id: str) -> None:
-    repo = UserRepository(request.app.state.db)
-    await repo.save_basket(user_id, get_basket_store(user_id))
+    store = get_versioned_basket_store()
+    repo = user_repository(request)
+    entry = (_request_baskets.get() or {}).get(user_id)
+    if entry is None:
+        # 이 요청에서 읽거나 고친 적이 없으면 저장할 변경도 없다
+        return
+
+    saved = await store.save_changes(repo, user_id, entry.loaded, entry.basket)
+    if saved.basket is not entry.basket:
+        # 충돌 후 병합된 결과. 응답·히스토리가 같은 작업본 객체를 보므로 제자리로 바꾼다
+        entry.basket.items[:] = saved.basket.items
+    entry.loaded = BasketSnapshot(entry.basket.model_copy(deep=True), saved.version)
+
+
+async def _patch_basket(request: Request, user_id: str, mutate: Callable[[Basket], T]) -> tuple[Basket, T]:
+    snapshot, result = await get_versioned_basket_store().update(user_repository(request), user_id, mutate)
+    return _remember(user_id, snapshot), result
 
 
 @router.get("", response_model=Basket)
@@ -42,16 +92,14 @@ async def add_item(
     item: BasketItem,
     current_user: AuthUser = Depends(require_auth),
 ):
-    basket = await sync_basket_store_from_db(request, current_user.user_id)
-
-    for existing in basket.items:
-        if existing.item_name == item.item_name and existing.size == item.size and existing.brand == item.brand:
-            existing.quantity += item.quantity
-            await save_basket_store_to_db(request, current_user.user_id)
-            return basket
-
-    basket.items.append(item)
-    await save_basket_store_to_db(request, current_user.user_id)
+    def merge(basket: Basket) -> None:
+        for existing in basket.items:
+            if existing.item_name == item.item_name and existing.size == item.size and existing.brand == item.brand:
+                existing.quantity += item.quantity
+                return
+        basket.items.append(item.model_copy())
+
+    basket, _ = await _patch_basket(request, current_user.user_id, merge)
     return basket
 
 
@@ -62,12 +110,16 @@ async def update_item_quantity(
     item: BasketItem,
     current_user: AuthUser = Depends(require_auth),
 ):
-    basket = await sync_basket_store_from_db(request, current_user.user_id)
-    for existing in basket.items:
-        if existing.item_name == item_name:
-            existing.quantity = item.quantity
-            await save_basket_store_to_db(request, current_user.user_id)
-            return basket
+    def set_quantity(basket: Basket) -> bool:
+        for existing in basket.items:
+            if existing.item_name == item_name:
+                existing.quantity = item.quantity
+                return True
+        return False
+
+    basket, found = await _patch_basket(request, current_user.user_id, set_quantity)
+    if found:
+        return basket
 
     raise HTTPException(status_code=404, detail="Item not found")
 
@@ -78,9 +130,10 @@ async def remove_item(
     item_name: str,
     current_user: AuthUser = Depends(require_auth),
 ):
-    basket = await sync_basket_store_from_db(request, current_user.user_id)
-    basket.items = [i for i in basket.items if i.item_name != item_name]
-    await save_basket_store_to_db(request, current_user.user_id)
+    def remove(basket: Basket) -> None:
+        basket.items = [i for i in basket.items if i.item_name != item_name]
+
+    basket, _ = await _patch_basket(request, current_user.user_id, remove)
     return basket
 
 
@@ -89,7 +142,8 @@ async def clear_basket(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    basket = await sync_basket_store_from_db(request, current_user.user_id)
-    basket.items = []
-    await save_basket_store_to_db(request, current_user.user_id)
-    return basket
\ No newline at end of file
+    def clear(basket: Basket) -> None:
+        basket.items = []
+
+    basket, _ = await _patch_basket(request, current_user.user_id, clear)
+    return basket
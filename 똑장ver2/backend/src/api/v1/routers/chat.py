@@ -1,29 +1,41 @@
 """챗봇 API 라우터 — LangGraph 기반 장보기 비서."""
 from __future__ import annotations
 
+import json
 import logging
 import re
+import time
+from dataclasses import dataclass, field
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from src.api.v1.dependencies import AuthUser, require_auth
+from src.api.v1.dependencies import AuthUser, read_connection, require_auth, user_repository
 from src.api.v1.routers.basket import (
     get_basket_store,
     save_basket_store_to_db,
     sync_basket_store_from_db,
 )
 from src.api.v1.routers.preferences import _user_preferences, sync_preferences_from_db
+from src.application.services.chat_context import (
+    ROLE_ASSISTANT,
+    ROLE_USER,
+    ChatTurn,
+    ContextWindow,
+    build_context_window,
+)
 from src.application.services.product_matcher_db import ProductMatcherDB
+from src.core.config import settings
+from src.core.metrics import get_chat_routing_tracker
 from src.domain.models.basket import BasketItem, ItemMode
+from src.infrastructure.persistence.chat_history_store import get_chat_history_store
+from src.infrastructure.persistence.user_repository import UserRepository
 
 router = APIRouter(prefix="/chat", tags=["챗봇"])
 logger = logging.getLogger(__name__)
 
-# 사용자별 인메모리 대화 히스토리 (SoR는 사용자별 분리)
-_chat_history_by_user: dict[str, list] = {}
-_MAX_HISTORY = 20
 _SEGMENT_SPLIT_PATTERN = re.compile(r"(?:,|/|\n| 그리고 |그리고| 하고 |하고| 랑 |랑| 및 )")
 _QUANTITY_PATTERN = re.compile(r"(\d+)\s*(개|봉|팩|세트|병|캔|통|줄|묶음)")
 _SIZE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(kg|g|ml|l|구|판|모|포기|단)", re.IGNORECASE)
@@ -64,8 +76,15 @@ class ChatMessageResponse(BaseModel):
 
 # ── Helper ──────────────────────────────────────────────────────────
 
-def _chat_history_for_user(user_id: str) -> list:
-    return _chat_history_by_user.setdefault(user_id, [])
+def _context_messages(context: ContextWindow) -> list:
+    """토큰 예산에 맞춘 대화 컨텍스트를 LangGraph 메시지로 변환."""
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+    messages: list = [SystemMessage(content=context.summary)] if context.summary else []
+    for turn in context.turns:
+        message_cls = HumanMessage if turn.role == ROLE_USER else AIMessage
+        messages.append(message_cls(content=turn.content))
+    return messages
 
 
 def _build_basket_context(items: list[BasketItem]) -> str:
@@ -231,22 +250,25 @@ async def _resolve_matcher_entities(
     if db is None:
         return []
 
-    matcher = ProductMatcherDB(db)
     preferred_brands, disliked_brands = _resolve_brand_preferences(user_id)
-    merged: dict[str, dict] = {}
-
+    parsed_segments: list[tuple[int, str | None]] = []
+    items: list[BasketItem] = []
     for segment in _split_segments(message):
         candidate_text = _clean_candidate_text(segment)
         if not candidate_text or len(candidate_text) < 2:
             continue
+        parsed_segments.append((_extract_quantity(segment), _extract_size(segment)))
+        items.append(BasketItem(item_name=candidate_text, quantity=1))
 
-        qty = _extract_quantity(segment)
-        size = _extract_size(segment)
-        matched = await matcher.match(
-            BasketItem(item_name=candidate_text, quantity=1),
+    async with read_connection(request) as read_db:
+        matcher = ProductMatcherDB(read_db, search_index=getattr(request.app.state, "product_index", None))
+        matches = await matcher.match_many(
+            items,
             preferred_brands=preferred_brands,
             disliked_brands=disliked_brands,
         )
+    merged: dict[str, dict] = {}
+    for (qty, size), matched in zip(parsed_segments, matches):
         if not matched:
             continue
 
@@ -267,143 +289,312 @@ async def _resolve_matcher_entities(
     return list(merged.values())
 
 
-# ── Endpoints ───────────────────────────────────────────────────────
+# ── Turn 실행 ──────────────────────────────────────────────────────
 
-@router.post("/message", response_model=ChatMessageResponse)
-async def send_message(
-    payload: ChatMessageRequest,
-    raw_request: Request,
-    current_user: AuthUser = Depends(require_auth),
-):
-    """챗봇 메시지 전송 (LangGraph ReAct 적용)."""
-    user_id = current_user.user_id
+_EXECUTION_NODES = ("modifier", "recommender", "clarifier", "show_cart", "general")
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+@dataclass
+class _ChatTurnRun:
+    """한 번의 채팅 요청 처리에 필요한 상태 (일반/스트리밍 엔드포인트 공용)."""
+
+    user_id: str
+    message: str
+    repo: UserRepository
+    history: list[ChatTurn]
+    before_snapshot: dict[str, BasketItem]
+    basket_context: str
+    user_preferences: str
+    matcher_entities: list[dict]
+    started_at: float = field(default_factory=time.perf_counter)
+    resolved_intent: str = "general"
+    route_tier: str = "fallback"
+    llm_degraded: bool = False
+    llm_error: str | None = None
+    response_content: str = ""
+    new_turns: list[ChatTurn] = field(default_factory=list)
+
+    def initial_state(self) -> dict:
+        from langchain_core.messages import HumanMessage
+
+        context = build_context_window(
+            self.history,
+            max_tokens=settings.chat_context_max_tokens,
+            summary_max_tokens=settings.chat_summary_max_tokens,
+        )
+        return {
+            "messages": _context_messages(context) + [HumanMessage(content=self.message)],
+            "user_preferences": self.user_preferences,
+            "matcher_entities": self.matcher_entities,
+            "intent": None,
+            "next_step": None,
+            "final_response": None,
+            "user_id": self.user_id,
+            "llm_degraded": False,
+            "llm_error": None,
+            "route_tier": None,
+            "fast_path_intent": None,
+            "fast_path_confidence": None,
+        }
+
+    def apply_final_state(self, final_state: dict) -> None:
+        from src.application.graph import normalize_agent_intent
+
+        self.route_tier = str(final_state.get("route_tier") or "llm")
+        self.resolved_intent = normalize_agent_intent(final_state.get("intent"))
+        self.llm_degraded = bool(final_state.get("llm_degraded"))
+        self.llm_error = str(final_state.get("llm_error") or "") or None
+        self.response_content = str(final_state.get("final_response") or "죄송해요, 잠시 문제가 생겼어요.")
+        self.new_turns = [
+            ChatTurn(role=ROLE_USER, content=self.message),
+            ChatTurn(role=ROLE_ASSISTANT, content=self.response_content),
+        ]
+
+
+async def _start_turn(raw_request: Request, user_id: str, message: str) -> _ChatTurnRun:
     await sync_basket_store_from_db(raw_request, user_id)
     await sync_preferences_from_db(raw_request, user_id)
     basket = get_basket_store(user_id)
-    before_snapshot = _snapshot_basket(basket.items)
-    basket_context = _build_basket_context(basket.items)
     preferred_brands, disliked_brands = _resolve_brand_preferences(user_id)
     matcher_entities = await _resolve_matcher_entities(
-        payload.message,
+        message,
         request=raw_request,
         user_id=user_id,
     )
-    chat_history = _chat_history_for_user(user_id)
-    resolved_intent = "general"
-    llm_degraded = False
-    llm_error: str | None = None
+    repo = user_repository(raw_request)
+    return _ChatTurnRun(
+        user_id=user_id,
+        message=message,
+        repo=repo,
+        history=await get_chat_history_store().load(repo, user_id),
+        before_snapshot=_snapshot_basket(basket.items),
+        basket_context=_build_basket_context(basket.items),
+        user_preferences=(
+            f"선호: {', '.join(preferred_brands) if preferred_brands else '없음'} / "
+            f"비선호: {', '.join(disliked_brands) if disliked_brands else '없음'}"
+        ),
+        matcher_entities=matcher_entities,
+    )
 
-    # LangGraph 연동 시도 — API 키 없으면 fallback
+
+async def _run_fallback(run: _ChatTurnRun, error: Exception) -> None:
+    """LangGraph 실행 실패 시 규칙 기반 노드로 직접 응답."""
+    logger.warning("LangGraph 실행 실패 (fallback 응답): %s", error)
+    run.route_tier = "fallback"
+    run.llm_degraded = True
+    run.llm_error = str(error)
     try:
-        from langchain_core.messages import HumanMessage, AIMessage
-        from src.application.graph import agent_graph, normalize_agent_intent
-
-        initial_state = {
-            "messages": chat_history + [HumanMessage(content=payload.message)],
-            "user_preferences": (
-                f"선호: {', '.join(preferred_brands) if preferred_brands else '없음'} / "
-                f"비선호: {', '.join(disliked_brands) if disliked_brands else '없음'}"
-            ),
-            "matcher_entities": matcher_entities,
-            "intent": None,
+        from langchain_core.messages import HumanMessage
+        from src.application.graph import (
+            _keyword_classify,
+            clarifier_node,
+            general_node,
+            modifier_node,
+            normalize_agent_intent,
+            recommender_node,
+            show_cart_node,
+        )
+
+        fallback_intent = normalize_agent_intent(_keyword_classify(run.message))
+        fallback_state = {
+            "messages": [HumanMessage(content=run.message)],
+            "user_preferences": run.user_preferences,
+            "matcher_entities": run.matcher_entities,
+            "intent": fallback_intent,
             "next_step": None,
             "final_response": None,
-            "user_id": user_id,
-            "llm_degraded": False,
-            "llm_error": None,
+            "user_id": run.user_id,
+            "llm_degraded": True,
+            "llm_error": str(error),
         }
 
-        final_state = await agent_graph.ainvoke(initial_state)
-        resolved_intent = normalize_agent_intent(final_state.get("intent"))
-        llm_degraded = bool(final_state.get("llm_degraded"))
-        llm_error = str(final_state.get("llm_error") or "") or None
-        response_content = str(final_state.get("final_response") or "죄송해요, 잠시 문제가 생겼어요.")
-        if resolved_intent == "show_cart":
-            response_content = _build_show_cart_content(get_basket_store(user_id).items)
+        intent = str(fallback_state["intent"])
+        run.resolved_intent = intent
+        if intent == "modify":
+            fallback_result = await modifier_node(fallback_state)
+        elif intent == "show_cart":
+            fallback_result = await show_cart_node(fallback_state)
+        elif intent == "recommend":
+            fallback_result = await recommender_node(fallback_state)
+        elif intent == "clarify":
+            fallback_result = await clarifier_node(fallback_state)
+        else:
+            fallback_result = await general_node(fallback_state)
 
-        # 히스토리 업데이트
-        chat_history.append(HumanMessage(content=payload.message))
-        chat_history.append(AIMessage(content=response_content))
+        basket = get_basket_store(run.user_id)
+        run.response_content = str(
+            fallback_result.get("final_response")
+            or f"장바구니에는 {len(basket.items)}개 품목이 있어요.\n\n**장바구니 현황**:\n{run.basket_context}"
+        )
+        run.new_turns = [
+            ChatTurn(role=ROLE_USER, content=run.message),
+            ChatTurn(role=ROLE_ASSISTANT, content=run.response_content),
+        ]
+    except Exception as fallback_exc:
+        logger.warning("규칙 기반 fallback 실패: %s", fallback_exc)
+        run.response_content = "요청을 처리하는 중 문제가 생겼어요. 다시 시도해주세요."
 
-    except Exception as e:
-        logger.warning("LangGraph 실행 실패 (fallback 응답): %s", e)
-        llm_degraded = True
-        llm_error = str(e)
-        try:
-            from langchain_core.messages import HumanMessage, AIMessage
-            from src.application.graph import (
-                _keyword_classify,
-                clarifier_node,
-                general_node,
-                modifier_node,
-                normalize_agent_intent,
-                recommender_node,
-                show_cart_node,
-            )
 
-            fallback_intent = normalize_agent_intent(_keyword_classify(payload.message))
-            fallback_state = {
-                "messages": [HumanMessage(content=payload.message)],
-                "user_preferences": (
-                    f"선호: {', '.join(preferred_brands) if preferred_brands else '없음'} / "
-                    f"비선호: {', '.join(disliked_brands) if disliked_brands else '없음'}"
-                ),
-                "matcher_entities": matcher_entities,
-                "intent": fallback_intent,
-                "next_step": None,
-                "final_response": None,
-                "user_id": user_id,
-                "llm_degraded": True,
-                "llm_error": str(e),
-            }
-
-            intent = str(fallback_state["intent"])
-            resolved_intent = intent
-            if intent == "modify":
-                fallback_result = await modifier_node(fallback_state)
-            elif intent == "show_cart":
-                fallback_result = await show_cart_node(fallback_state)
-            elif intent == "recommend":
-                fallback_result = await recommender_node(fallback_state)
-            elif intent == "clarify":
-                fallback_result = await clarifier_node(fallback_state)
-            else:
-                fallback_result = await general_node(fallback_state)
-
-            response_content = str(
-                fallback_result.get("final_response")
-                or f"장바구니에는 {len(basket.items)}개 품목이 있어요.\n\n**장바구니 현황**:\n{basket_context}"
-            )
-            if resolved_intent == "show_cart":
-                response_content = _build_show_cart_content(get_basket_store(user_id).items)
-
-            chat_history.append(HumanMessage(content=payload.message))
-            chat_history.append(AIMessage(content=response_content))
-        except Exception as fallback_exc:
-            logger.warning("규칙 기반 fallback 실패: %s", fallback_exc)
-            response_content = "요청을 처리하는 중 문제가 생겼어요. 다시 시도해주세요."
-
-    # 히스토리 크기 제한
-    if len(chat_history) > _MAX_HISTORY:
-        _chat_history_by_user[user_id] = chat_history[-_MAX_HISTORY:]
-
-    await save_basket_store_to_db(raw_request, user_id)
-    after_basket = get_basket_store(user_id)
-    basket_diff = _build_basket_diff(before_snapshot, _snapshot_basket(after_basket.items))
-    if resolved_intent == "show_cart":
-        response_content = _build_show_cart_content(after_basket.items)
-    llm_notice = _build_llm_degraded_notice(llm_error if llm_degraded else None)
+async def _commit_basket(raw_request: Request, run: _ChatTurnRun) -> tuple[list[BasketItem], list[DiffItem]]:
+    await save_basket_store_to_db(raw_request, run.user_id)
+    after_items = get_basket_store(run.user_id).items
+    return after_items, _build_basket_diff(run.before_snapshot, _snapshot_basket(after_items))
+
+
+def _final_content(run: _ChatTurnRun, after_items: list[BasketItem]) -> str:
+    content = run.response_content
+    if run.resolved_intent == "show_cart":
+        content = _build_show_cart_content(after_items)
+    llm_notice = _build_llm_degraded_notice(run.llm_error if run.llm_degraded else None)
     if llm_notice:
-        response_content = f"{response_content}\n\n{llm_notice}"
+        content = f"{content}\n\n{llm_notice}"
+    return content
+
 
-    # 추천 검색어
-    suggestions = (
+def _build_suggestions(items: list[BasketItem]) -> list[str]:
+    return (
         ["분석 시작해줘", "장바구니 보여줘"]
-        if after_basket.items
+        if items
         else ["계란 30구 추가해줘", "김치찌개 재료 추천해줘"]
     )
 
-    return ChatMessageResponse(content=response_content, diff=basket_diff, suggestions=suggestions)
+
+async def _finish_turn(run: _ChatTurnRun) -> None:
+    if run.resolved_intent == "show_cart" and run.new_turns:
+        run.new_turns[-1] = ChatTurn(
+            role=ROLE_ASSISTANT,
+            content=_build_show_cart_content(get_basket_store(run.user_id).items),
+        )
+    await get_chat_routing_tracker().record(
+        tier=run.route_tier,
+        duration_ms=(time.perf_counter() - run.started_at) * 1000,
+    )
+    # 히스토리는 링 버퍼 크기(CHAT_HISTORY_MAX_MESSAGES)만큼만 DB에 남는다
+    await get_chat_history_store().append(run.repo, run.user_id, run.new_turns)
+
+
+def _sse_event(event: str, data: object) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# ── Endpoints ───────────────────────────────────────────────────────
+
+@router.post("/message", response_model=ChatMessageResponse)
+async def send_message(
+    payload: ChatMessageRequest,
+    raw_request: Request,
+    current_user: AuthUser = Depends(require_auth),
+):
+    """챗봇 메시지 전송 (LangGraph ReAct 적용)."""
+    run = await _start_turn(raw_request, current_user.user_id, payload.message)
+
+    # LangGraph 연동 시도 — API 키 없으면 fallback
+    try:
+        from src.application.graph import agent_graph
+
+        run.apply_final_state(await agent_graph.ainvoke(run.initial_state()))
+    except Exception as e:
+        await _run_fallback(run, e)
+
+    # 대화 기록과 장바구니 저장을 한 트랜잭션으로 반영한다
+    async with run.repo.unit_of_work():
+        await _finish_turn(run)
+        after_items, basket_diff = await _commit_basket(raw_request, run)
+    return ChatMessageResponse(
+        content=_final_content(run, after_items),
+        diff=basket_diff,
+        suggestions=_build_suggestions(after_items),
+    )
+
+
+@router.post("/message/stream")
+async def stream_message(
+    payload: ChatMessageRequest,
+    raw_request: Request,
+    current_user: AuthUser = Depends(require_auth),
+):
+    """챗봇 메시지 SSE 스트리밍.
+
+    이벤트 순서: `intent` → `diff`(실행 노드가 장바구니를 바꾼 직후 저장·전송) →
+    `token`(응답 텍스트 조각) → `done`(`ChatMessageResponse`와 같은 본문).
+    """
+    run = await _start_turn(raw_request, current_user.user_id, payload.message)
+
+    async def event_stream():
+        final_state: dict = {}
+        after_items: list[BasketItem] | None = None
+        basket_diff: list[DiffItem] = []
+        graph_error: Exception | None = None
+        updates = None
+        try:
+            from src.application.graph import agent_graph, normalize_agent_intent
+
+            initial_state = run.initial_state()
+            final_state.update(initial_state)
+            updates = agent_graph.astream(initial_state, stream_mode="updates").__aiter__()
+        except Exception as e:
+            graph_error = e
+
+        while updates is not None:
+            # 그래프 예외만 fallback 대상이다. 장바구니 저장 실패는 그대로 올려 보낸다
+            try:
+                update = await updates.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception as e:
+                graph_error = e
+                break
+            for node, delta in update.items():
+                final_state.update(delta or {})
+                if (delta or {}).get("route_tier"):
+                    yield _sse_event(
+                        "intent",
+                        {
+                            "intent": normalize_agent_intent(final_state.get("intent")),
+                            "route_tier": final_state.get("route_tier"),
+                        },
+                    )
+                if node in _EXECUTION_NODES:
+                    after_items, basket_diff = await _commit_basket(raw_request, run)
+                    yield _sse_event("diff", [diff.model_dump(mode="json") for diff in basket_diff])
+
+        if graph_error is None:
+            run.apply_final_state(final_state)
+        elif after_items is not None:
+            # 실행 노드가 이미 장바구니를 바꿨으므로 fallback으로 같은 요청을 다시 적용하지 않는다
+            logger.warning("LangGraph 실행 노드 이후 실패: %s", graph_error)
+            run.apply_final_state(final_state)
+            run.llm_degraded = True
+            run.llm_error = str(graph_error)
+        else:
+            await _run_fallback(run, graph_error)
+            yield _sse_event("intent", {"intent": run.resolved_intent, "route_tier": run.route_tier})
+
+        committed_now = after_items is None
+        async with run.repo.unit_of_work():
+            await _finish_turn(run)
+            if committed_now:
+                after_items, basket_diff = await _commit_basket(raw_request, run)
+        if committed_now:
+            yield _sse_event("diff", [diff.model_dump(mode="json") for diff in basket_diff])
+
+        content = _final_content(run, after_items)
+        for token in _TOKEN_PATTERN.findall(content):
+            yield _sse_event("token", {"text": token})
+
+        response = ChatMessageResponse(
+            content=content,
+            diff=basket_diff,
+            suggestions=_build_suggestions(after_items),
+        )
+        yield _sse_event("done", response.model_dump(mode="json"))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/greeting", response_model=ChatMessageResponse)
@@ -424,7 +615,10 @@ async def get_greeting(
 
 
 @router.post("/clear")
-async def clear_history(current_user: AuthUser = Depends(require_auth)):
+async def clear_history(
+    request: Request,
+    current_user: AuthUser = Depends(require_auth),
+):
     """대화 히스토리 초기화."""
-    _chat_history_by_user[current_user.user_id] = []
+    await get_chat_history_store().clear(user_repository(request), current_user.user_id)
     return {"status": "ok", "message": "대화 히스토리가 초기화되었습니다."}
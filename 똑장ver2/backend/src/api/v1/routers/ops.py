@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
 
 from src.api.v1.dependencies import AuthUser, require_auth
-from src.core.metrics import get_online_plan_kpi_tracker
+from src.core.llm import get_chat_client_pool, get_llm_response_cache
+from src.core.metrics import get_chat_routing_tracker, get_online_plan_kpi_tracker
 
 router = APIRouter(prefix="/ops", tags=["ops"])
 
@@ -25,6 +26,53 @@ async def get_online_plan_metrics(
     return await tracker.snapshot()
 
 
+@router.get("/metrics/naver-shopping")
+async def get_naver_shopping_metrics(
+    request: Request,
+    _: AuthUser = Depends(require_auth),
+):
+    shopping = getattr(request.app.state, "shopping", None)
+    if shopping is None:
+        return {"enabled": False}
+    return {"enabled": True, **await shopping.stats_snapshot()}
+
+
+@router.get("/metrics/plan-cache")
+async def get_plan_cache_metrics(
+    request: Request,
+    _: AuthUser = Depends(require_auth),
+):
+    plan_cache = getattr(request.app.state, "plan_cache", None)
+    if plan_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **plan_cache.stats()}
+
+
+@router.get("/metrics/llm-cache")
+async def get_llm_cache_metrics(
+    _: AuthUser = Depends(require_auth),
+):
+    return {**get_llm_response_cache().stats(), "clients": get_chat_client_pool().stats()}
+
+
+@router.get("/metrics/chat-routing")
+async def get_chat_routing_metrics(
+    _: AuthUser = Depends(require_auth),
+):
+    return await get_chat_routing_tracker().snapshot()
+
+
+@router.get("/metrics/db")
+async def get_db_metrics(
+    request: Request,
+    _: AuthUser = Depends(require_auth),
+):
+    db_pool = getattr(request.app.state, "db_pool", None)
+    if db_pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **db_pool.stats()}
+
+
 @router.get("/gates/online-plan-latency", response_model=OnlinePlanGateResponse)
 async def check_online_plan_latency_gate(
     _: AuthUser = Depends(require_auth),
@@ -7,9 +7,8 @@ from uuid import uuid4
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from pydantic import BaseModel, Field
 
-from src.api.v1.dependencies import AuthUser, require_auth
+from src.api.v1.dependencies import AuthUser, require_auth, user_repository
 from src.core.config import settings
-from src.infrastructure.persistence.user_repository import UserRepository
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
@@ -90,7 +89,7 @@ async def create_payment_intent(
 ):
     _validate_guardrails(payload)
 
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     if idempotency_key:
         existing = await repo.find_payment_intent_by_idempotency(
             user_id=current_user.user_id,
@@ -134,7 +133,7 @@ async def get_payment_intent(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     intent = await repo.get_payment_intent(intent_id=intent_id, user_id=current_user.user_id)
     if not intent:
         raise HTTPException(status_code=404, detail="Payment intent not found")
@@ -148,7 +147,7 @@ async def confirm_payment_intent(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     intent = await repo.get_payment_intent(intent_id=intent_id, user_id=current_user.user_id)
     if not intent:
         raise HTTPException(status_code=404, detail="Payment intent not found")
@@ -6,8 +6,11 @@
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from time import perf_counter
 from typing import List, Literal
@@ -15,27 +18,29 @@ from urllib.parse import quote, urlparse
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.api.v1.dependencies import AuthUser, require_auth
+from src.api.v1.dependencies import AuthUser, read_connection, require_auth, user_repository
 from src.api.v1.routers.basket import get_basket_store, sync_basket_store_from_db
 from src.api.v1.routers.preferences import _user_preferences, sync_preferences_from_db
 from src.application.services.canonicalization import CanonicalizationService
-from src.application.services.geo import haversine_km
+from src.application.services.geo import estimate_travel_batch
 from src.application.services.offline_plan_adapter import (
     DEFAULT_MAX_TRAVEL_MINUTES,
     DEFAULT_TRAVEL_MODE,
     DEFAULT_USER_LAT,
     DEFAULT_USER_LNG,
     OfflinePlanAdapter,
+    ProvisionalCallback,
 )
 from src.application.services.online_plan_adapter import OnlinePlanAdapter
+from src.application.services.plan_result_cache import PlanResultCache
 from src.application.services.ranking_engine import RankingEngine
 from src.core.config import settings
 from src.core.metrics import get_online_plan_kpi_tracker
 from src.domain.models.basket import Basket, BasketItem
 from src.domain.models.plan import Plan, PlanType
-from src.infrastructure.persistence.user_repository import UserRepository
 from src.infrastructure.providers.mock_providers import MockOfflineProvider
 
 router = APIRouter(tags=["plans"])
@@ -170,6 +175,34 @@ async def generate_online_plans(
     )
 
 
+@router.post("/offline/plans/generate/stream")
+async def stream_offline_plans(
+    payload: GeneratePlansRequest,
+    request: Request,
+    current_user: AuthUser = Depends(require_auth),
+):
+    return await _stream_plans(
+        payload=payload,
+        request=request,
+        mode="offline",
+        user_id=current_user.user_id,
+    )
+
+
+@router.post("/online/plans/generate/stream")
+async def stream_online_plans(
+    payload: GeneratePlansRequest,
+    request: Request,
+    current_user: AuthUser = Depends(require_auth),
+):
+    return await _stream_plans(
+        payload=payload,
+        request=request,
+        mode="online",
+        user_id=current_user.user_id,
+    )
+
+
 @router.post("/plans/generate", response_model=PlanListResponse)
 async def generate_plans_compat(
     payload: GeneratePlansRequest,
@@ -198,7 +231,7 @@ async def select_offline_plan(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     stored = await repo.get_plan_request(
         request_id=payload.request_id,
         user_id=current_user.user_id,
@@ -232,7 +265,7 @@ async def select_online_plan(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     stored = await repo.get_plan_request(
         request_id=payload.request_id,
         user_id=current_user.user_id,
@@ -275,6 +308,134 @@ async def select_online_plan(
     )
 
 
+@dataclass
+class _PlanRequest:
+    """검증·해석이 끝난 플랜 생성 요청 (일반/스트리밍 엔드포인트 공용)."""
+
+    target_basket: Basket
+    mode: str
+    resolved_context: EffectivePlanContext
+    preferred_brands: list[str]
+    disliked_brands: list[str]
+    plan_cache: PlanResultCache | None
+    cache_key: str | None
+
+    def cached(self) -> RankedPlans | None:
+        if self.plan_cache is None or self.cache_key is None:
+            return None
+        return self.plan_cache.get(self.cache_key)
+
+    def remember(self, ranked: RankedPlans) -> None:
+        if self.plan_cache is not None and self.cache_key is not None:
+            self.plan_cache.set(
+                self.cache_key,
+                ranked,
+                product_keys=ranked.product_keys,
+                degraded=bool(ranked.degraded_providers),
+            )
+
+
+async def _prepare_plan_request(
+    *,
+    payload: GeneratePlansRequest,
+    request: Request,
+    mode: str,
+    user_id: str,
+) -> _PlanRequest:
+    await sync_preferences_from_db(request, user_id)
+
+    if payload.items:
+        target_basket = Basket(items=payload.items)
+    else:
+        target_basket = await sync_basket_store_from_db(request, user_id)
+
+    if not target_basket.items:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "EMPTY_BASKET", "message": "장바구니가 비어 있습니다."},
+        )
+
+    _validate_plan_items(target_basket.items)
+
+    normalized_mode = mode.lower()
+    resolved_context = _resolve_user_context(payload.user_context)
+    preferred_brands, disliked_brands = _resolve_brand_preferences(user_id)
+
+    plan_cache: PlanResultCache | None = getattr(request.app.state, "plan_cache", None)
+    cache_key = None
+    if plan_cache is not None:
+        cache_key = plan_cache.make_key(
+            items=target_basket.items,
+            lat=resolved_context.lat,
+            lng=resolved_context.lng,
+            travel_mode=resolved_context.travel_mode,
+            max_travel_minutes=resolved_context.max_travel_minutes,
+            mode=normalized_mode,
+            preferred_brands=preferred_brands,
+            disliked_brands=disliked_brands,
+        )
+    return _PlanRequest(
+        target_basket=target_basket,
+        mode=normalized_mode,
+        resolved_context=resolved_context,
+        preferred_brands=preferred_brands,
+        disliked_brands=disliked_brands,
+        plan_cache=plan_cache,
+        cache_key=cache_key,
+    )
+
+
+async def _rank_request(
+    request: Request,
+    plan_request: _PlanRequest,
+    *,
+    user_id: str,
+    on_provisional: ProvisionalCallback | None = None,
+) -> RankedPlans:
+    return await _rank_plans(
+        request,
+        plan_request.target_basket,
+        plan_request.mode,
+        plan_request.resolved_context,
+        user_id=user_id,
+        preferred_brands=plan_request.preferred_brands,
+        disliked_brands=plan_request.disliked_brands,
+        on_provisional=on_provisional,
+    )
+
+
+async def _save_plan_response(
+    request: Request,
+    plan_request: _PlanRequest,
+    ranked: RankedPlans,
+    *,
+    user_id: str,
+) -> PlanListResponse:
+    request_id = f"req-{uuid4().hex[:16]}"
+    result = PlanListResponse(
+        top3=list(ranked.top3),
+        headline=ranked.headline,
+        last_updated=ranked.last_updated,
+        alternatives=list(ranked.alternatives),
+        meta=PlanGenerationMeta(
+            request_id=request_id,
+            generated_at=datetime.now(timezone.utc).isoformat(),
+            degraded_providers=list(ranked.degraded_providers),
+            effective_context=plan_request.resolved_context,
+            weather_note=ranked.weather_note,
+        ),
+    )
+
+    repo = user_repository(request)
+    await repo.save_plan_request(
+        request_id=request_id,
+        user_id=user_id,
+        mode=plan_request.mode,
+        response=result.model_dump(mode="json"),
+    )
+    return result
+
+
 async def _generate_plans(
     *,
     payload: GeneratePlansRequest,
@@ -289,51 +450,259 @@ async def _generate_plans(
     success = False
 
     try:
-        await sync_preferences_from_db(request, user_id)
+        plan_request = await _prepare_plan_request(payload=payload, request=request, mode=mode, user_id=user_id)
+        ranked = plan_request.cached()
+        response.headers["X-Plan-Cache"] = "hit" if ranked is not None else "miss"
 
-        if payload.items:
-            target_basket = Basket(items=payload.items)
-        else:
-            target_basket = await sync_basket_store_from_db(request, user_id)
+        if ranked is None:
+            ranked = await _rank_request(request, plan_request, user_id=user_id)
+            plan_request.remember(ranked)
 
-        if not target_basket.items:
-            raise HTTPException(
-                status_code=400,
-                detail={"code": "EMPTY_BASKET", "message": "장바구니가 비어 있습니다."},
+        observed_degraded = bool(ranked.degraded_providers)
+        result = await _save_plan_response(request, plan_request, ranked, user_id=user_id)
+
+        response.status_code = (
+            status.HTTP_206_PARTIAL_CONTENT if observed_degraded else status.HTTP_200_OK
+        )
+        success = True
+        return result
+    finally:
+        if is_online_mode:
+            elapsed_ms = (perf_counter() - started_at) * 1000
+            tracker = get_online_plan_kpi_tracker()
+            await tracker.record(
+                duration_ms=elapsed_ms,
+                degraded=observed_degraded,
+                success=success,
             )
 
-        _validate_plan_items(target_basket.items)
 
-        normalized_mode = mode.lower()
-        resolved_context = _resolve_user_context(payload.user_context)
-        degraded_providers: list[str] = []
-        weather_note: str | None = None
-        preferred_brands, disliked_brands = _resolve_brand_preferences(user_id)
+def _sse_event(event: str, data: object) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        total_items = len(target_basket.items)
-        candidates: list[Plan] = []
 
-        if normalized_mode == "online":
-            shopping_provider = getattr(request.app.state, "shopping", None)
-            if shopping_provider:
+async def _stream_plans(
+    *,
+    payload: GeneratePlansRequest,
+    request: Request,
+    mode: str,
+    user_id: str,
+) -> StreamingResponse:
+    """플랜 생성 SSE 스트림.
+
+    `provisional`(첫 후보 1개) → `top3`(경로·날씨 반영 Top3) → `done`(저장된 `request_id` 포함
+    `PlanListResponse`) 순으로 보낸다. 요청 검증 오류는 스트림을 열기 전에 HTTP 오류로 응답한다.
+    """
+    started_at = perf_counter()
+    plan_request = await _prepare_plan_request(payload=payload, request=request, mode=mode, user_id=user_id)
+    cached = plan_request.cached()
+    total_items = len(plan_request.target_basket.items)
+
+    def provisional_event(candidates: list[Plan]) -> str | None:
+        top3, _ = _select_top3(
+            candidates,
+            plan_request.mode,
+            total_items,
+            preferred_brands=plan_request.preferred_brands,
+            disliked_brands=plan_request.disliked_brands,
+        )
+        if not top3:
+            return None
+        return _sse_event("provisional", {"plan": top3[0].model_dump(mode="json"), "final": False})
+
+    async def event_stream():
+        observed_degraded = False
+        success = False
+        provisional_sent = False
+        try:
+            ranked = cached
+            if ranked is None:
+                provisional_queue: asyncio.Queue[list[Plan]] = asyncio.Queue()
+                rank_task = asyncio.create_task(
+                    _rank_request(request, plan_request, user_id=user_id, on_provisional=provisional_queue.put)
+                )
                 try:
-                    online_adapter = OnlinePlanAdapter(shopping_provider)
-                    online_result = await online_adapter.build_candidates(
-                        target_basket,
-                        preferred_brands=preferred_brands,
-                        disliked_brands=disliked_brands,
-                    )
-                    candidates = online_result.candidates
-                    degraded_providers.extend(online_result.degraded_providers)
-                except Exception as exc:
-                    logger.warning("OnlinePlanAdapter 실패, offline fallback 사용: %s", exc)
-                    degraded_providers.append("shopping")
-            else:
+                    while True:
+                        next_provisional = asyncio.ensure_future(provisional_queue.get())
+                        done, _ = await asyncio.wait(
+                            {next_provisional, rank_task},
+                            return_when=asyncio.FIRST_COMPLETED,
+                        )
+                        if next_provisional not in done:
+                            next_provisional.cancel()
+                            break
+                        event = provisional_event(next_provisional.result())
+                        if event is not None and not provisional_sent:
+                            provisional_sent = True
+                            yield event
+                    ranked = rank_task.result()
+                finally:
+                    if not rank_task.done():
+                        rank_task.cancel()
+                plan_request.remember(ranked)
+
+            if not provisional_sent and ranked.top3:
+                yield _sse_event("provisional", {"plan": ranked.top3[0].model_dump(mode="json"), "final": True})
+
+            observed_degraded = bool(ranked.degraded_providers)
+            yield _sse_event(
+                "top3",
+                {
+                    "top3": [plan.model_dump(mode="json") for plan in ranked.top3],
+                    "alternatives": [plan.model_dump(mode="json") for plan in ranked.alternatives],
+                    "headline": ranked.headline,
+                    "degraded_providers": list(ranked.degraded_providers),
+                    "weather_note": ranked.weather_note,
+                },
+            )
+
+            result = await _save_plan_response(request, plan_request, ranked, user_id=user_id)
+            success = True
+            yield _sse_event("done", result.model_dump(mode="json"))
+        except HTTPException as exc:
+            yield _sse_event("error", {"status_code": exc.status_code, "detail": exc.detail})
+        except Exception as exc:
+            logger.warning("플랜 스트리밍 실패: %s", exc)
+            yield _sse_event(
+                "error",
+                {"status_code": 500, "detail": {"code": "PLAN_STREAM_FAILED", "message": "플랜을 생성할 수 없습니다."}},
+            )
+        finally:
+            if plan_request.mode == "online":
+                await get_online_plan_kpi_tracker().record(
+                    duration_ms=(perf_counter() - started_at) * 1000,
+                    degraded=observed_degraded,
+                    success=success,
+                )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Plan-Cache": "hit" if cached is not None else "miss",
+        },
+    )
+
+
+@dataclass(frozen=True)
+class RankedPlans:
+    """요청과 무관한 플랜 생성 결과. 플랜 캐시에 그대로 보관된다."""
+
+    top3: tuple[Plan, ...]
+    alternatives: tuple[Plan, ...]
+    headline: str
+    last_updated: str
+    degraded_providers: tuple[str, ...]
+    weather_note: str | None
+    product_keys: tuple[str, ...] = ()
+
+
+async def _rank_plans(
+    request: Request,
+    target_basket: Basket,
+    normalized_mode: str,
+    resolved_context: EffectivePlanContext,
+    *,
+    user_id: str,
+    preferred_brands: list[str],
+    disliked_brands: list[str],
+    on_provisional: ProvisionalCallback | None = None,
+) -> RankedPlans:
+    """매칭 → 매장/경로 → 매장별 플랜 → 순위 → 날씨까지 전체 후보 계산.
+
+    날씨는 후보 계산과 무관하므로 처음부터 병렬로 조회한다.
+    """
+    weather_task = asyncio.create_task(
+        _get_weather_note(
+            getattr(request.app.state, "weather", None),
+            lat=resolved_context.lat,
+            lng=resolved_context.lng,
+        )
+    )
+    try:
+        candidates, degraded_providers, product_keys = await _collect_candidates(
+            request,
+            target_basket,
+            normalized_mode,
+            resolved_context,
+            user_id=user_id,
+            preferred_brands=preferred_brands,
+            disliked_brands=disliked_brands,
+            on_provisional=on_provisional,
+        )
+    except BaseException:
+        weather_task.cancel()
+        raise
+
+    top3, alternatives = _select_top3(
+        candidates,
+        normalized_mode,
+        len(target_basket.items),
+        preferred_brands=preferred_brands,
+        disliked_brands=disliked_brands,
+    )
+
+    weather_note, weather_degraded = await weather_task
+    if weather_degraded:
+        degraded_providers.append("weather")
+
+    return RankedPlans(
+        top3=tuple(top3),
+        alternatives=tuple(alternatives[:3]),
+        headline=_generate_headline(top3, normalized_mode),
+        last_updated=_now_str(),
+        degraded_providers=tuple(_dedupe(degraded_providers)),
+        weather_note=weather_note,
+        product_keys=tuple(product_keys),
+    )
+
+
+async def _collect_candidates(
+    request: Request,
+    target_basket: Basket,
+    normalized_mode: str,
+    resolved_context: EffectivePlanContext,
+    *,
+    user_id: str,
+    preferred_brands: list[str],
+    disliked_brands: list[str],
+    on_provisional: ProvisionalCallback | None = None,
+) -> tuple[list[Plan], list[str], list[str]]:
+    """온라인 쇼핑 → DB 오프라인 엔진 → mock 순으로 매장별 후보 플랜을 모은다."""
+    degraded_providers: list[str] = []
+    product_keys: list[str] = []
+    candidates: list[Plan] = []
+    if normalized_mode == "online":
+        shopping_provider = getattr(request.app.state, "shopping", None)
+        if shopping_provider:
+            try:
+                online_adapter = OnlinePlanAdapter(shopping_provider)
+                online_result = await online_adapter.build_candidates(
+                    target_basket,
+                    preferred_brands=preferred_brands,
+                    disliked_brands=disliked_brands,
+                )
+                candidates = online_result.candidates
+                degraded_providers.extend(online_result.degraded_providers)
+            except Exception as exc:
+                logger.warning("OnlinePlanAdapter 실패, offline fallback 사용: %s", exc)
                 degraded_providers.append("shopping")
+        else:
+            degraded_providers.append("shopping")
 
-        try:
-            if not candidates:
-                adapter = OfflinePlanAdapter(request.app.state.db)
+    try:
+        if not candidates:
+            async with read_connection(request) as read_db:
+                adapter = OfflinePlanAdapter(
+                    read_db,
+                    search_index=getattr(request.app.state, "product_index", None),
+                    store_index=getattr(request.app.state, "store_index", None),
+                    routing_concurrency=settings.routing_max_concurrency,
+                    routing_deadline_seconds=settings.routing_deadline_seconds,
+                    working_sets=getattr(request.app.state, "plan_working_sets", None),
+                )
                 build_result = await adapter.build_candidates(
                     target_basket,
                     mode=normalized_mode,
@@ -345,104 +714,70 @@ async def _generate_plans(
                     routing_provider=getattr(request.app.state, "routing", None),
                     preferred_brands=preferred_brands,
                     disliked_brands=disliked_brands,
+                    working_set_key=f"{user_id}:{normalized_mode}",
+                    on_provisional=on_provisional,
                 )
                 candidates = build_result.candidates
                 degraded_providers.extend(build_result.degraded_providers)
-        except Exception as exc:
-            logger.warning("OfflinePlanAdapter 실패, mock fallback 사용: %s", exc)
-
-        if not candidates:
-            candidates = await _generate_mock_candidates(
-                target_basket,
-                normalized_mode,
-                lat=resolved_context.lat,
-                lng=resolved_context.lng,
-                travel_mode=resolved_context.travel_mode,
-            )
-            if "place" not in degraded_providers:
-                degraded_providers.append("place")
-
-        if not candidates:
-            raise HTTPException(
-                status_code=503,
-                detail={"code": "DEPENDENCY_FAILURE", "message": "플랜을 생성할 수 없습니다."},
-            )
-
-        top3 = ranking_engine.rank_plans(candidates)
-        if normalized_mode == "offline":
-            order = {PlanType.NEAREST: 0, PlanType.BALANCED: 1, PlanType.CHEAPEST: 2}
-        else:
-            order = {PlanType.CHEAPEST: 0, PlanType.BALANCED: 1, PlanType.NEAREST: 2}
-        top3 = sorted(top3, key=lambda p: order.get(p.plan_type, 99))
-
-        top3_marts = {plan.mart_name for plan in top3}
-        alternatives = [candidate for candidate in candidates if candidate.mart_name not in top3_marts]
-
-        for alternative in alternatives:
-            _normalize_plan_reliability_fields(alternative, normalized_mode)
-            _sanitize_plan_external_links(alternative)
-
-        for plan in top3:
-            _normalize_plan_reliability_fields(plan, normalized_mode)
-            _sanitize_plan_external_links(plan)
-            plan.explanation = _generate_explanation(
-                plan,
-                total_items,
-                normalized_mode,
-                preferred_brands=preferred_brands,
-                disliked_brands=disliked_brands,
-            )
-
-        weather_note, weather_degraded = await _get_weather_note(
-            getattr(request.app.state, "weather", None),
+                product_keys = build_result.product_keys
+    except Exception as exc:
+        logger.warning("OfflinePlanAdapter 실패, mock fallback 사용: %s", exc)
+
+    if not candidates:
+        candidates = await _generate_mock_candidates(
+            target_basket,
+            normalized_mode,
             lat=resolved_context.lat,
             lng=resolved_context.lng,
+            travel_mode=resolved_context.travel_mode,
         )
-        if weather_degraded:
-            degraded_providers.append("weather")
-
-        deduped_degraded = _dedupe(degraded_providers)
-        observed_degraded = bool(deduped_degraded)
-        headline = _generate_headline(top3, normalized_mode)
-        generated_at = datetime.now(timezone.utc).isoformat()
-        request_id = f"req-{uuid4().hex[:16]}"
-
-        result = PlanListResponse(
-            top3=top3,
-            headline=headline,
-            last_updated=_now_str(),
-            alternatives=alternatives[:3],
-            meta=PlanGenerationMeta(
-                request_id=request_id,
-                generated_at=generated_at,
-                degraded_providers=deduped_degraded,
-                effective_context=resolved_context,
-                weather_note=weather_note,
-            ),
-        )
+        if "place" not in degraded_providers:
+            degraded_providers.append("place")
 
-        repo = UserRepository(request.app.state.db)
-        await repo.save_plan_request(
-            request_id=request_id,
-            user_id=user_id,
-            mode=normalized_mode,
-            response=result.model_dump(mode="json"),
+    if not candidates:
+        raise HTTPException(
+            status_code=503,
+            detail={"code": "DEPENDENCY_FAILURE", "message": "플랜을 생성할 수 없습니다."},
         )
 
-        response.status_code = (
-            status.HTTP_206_PARTIAL_CONTENT if deduped_degraded else status.HTTP_200_OK
+    return candidates, degraded_providers, product_keys
+
+
+def _select_top3(
+    candidates: list[Plan],
+    normalized_mode: str,
+    total_items: int,
+    *,
+    preferred_brands: list[str],
+    disliked_brands: list[str],
+) -> tuple[list[Plan], list[Plan]]:
+    """후보에서 모드별 순서의 Top3와 나머지 대안을 고르고 표시용 필드를 채운다."""
+    top3 = ranking_engine.rank_plans(candidates)
+    if normalized_mode == "offline":
+        order = {PlanType.NEAREST: 0, PlanType.BALANCED: 1, PlanType.CHEAPEST: 2}
+    else:
+        order = {PlanType.CHEAPEST: 0, PlanType.BALANCED: 1, PlanType.NEAREST: 2}
+    top3 = sorted(top3, key=lambda p: order.get(p.plan_type, 99))
+
+    top3_marts = {plan.mart_name for plan in top3}
+    alternatives = [candidate for candidate in candidates if candidate.mart_name not in top3_marts]
+
+    for alternative in alternatives:
+        _normalize_plan_reliability_fields(alternative, normalized_mode)
+        _sanitize_plan_external_links(alternative)
+
+    for plan in top3:
+        _normalize_plan_reliability_fields(plan, normalized_mode)
+        _sanitize_plan_external_links(plan)
+        plan.explanation = _generate_explanation(
+            plan,
+            total_items,
+            normalized_mode,
+            preferred_brands=preferred_brands,
+            disliked_brands=disliked_brands,
         )
-        success = True
-        return result
-    finally:
-        if is_online_mode:
-            elapsed_ms = (perf_counter() - started_at) * 1000
-            tracker = get_online_plan_kpi_tracker()
-            await tracker.record(
-                duration_ms=elapsed_ms,
-                degraded=observed_degraded,
-                success=success,
-            )
+
+    return top3, alternatives
 
 
 def _validate_plan_items(items: list[BasketItem]) -> None:
@@ -483,12 +818,13 @@ def _find_selected_plan(
 
 
 async def _resolve_store_address(request: Request, store_name: str) -> str:
-    row = await request.app.state.db.execute(
-        "SELECT address FROM store_master WHERE store_name = ? LIMIT 1",
-        (store_name,),
-    )
-    fetched = await row.fetchone()
-    await row.close()
+    async with read_connection(request) as read_db:
+        row = await read_db.execute(
+            "SELECT address FROM store_master WHERE store_name = ? LIMIT 1",
+            (store_name,),
+        )
+        fetched = await row.fetchone()
+        await row.close()
     if not fetched:
         return "주소 정보 없음"
     return str(fetched["address"] or "주소 정보 없음")
@@ -512,6 +848,9 @@ async def _generate_mock_candidates(
             mart_baskets[plan_item.store_name].append(plan_item)
 
     total_items = len(target_basket.items)
+    mocked_routes = (
+        _estimate_mock_routes(lat, lng, list(mart_baskets), travel_mode) if mode != "online" else {}
+    )
     candidates: list[Plan] = []
     for mart_name, items in mart_baskets.items():
         total_price = sum(i.price for i in items)
@@ -526,7 +865,7 @@ async def _generate_mock_candidates(
             travel_minutes = delivery["eta_minutes"]
             delivery_info = f"{delivery['benefit']} · 약 {delivery['eta_minutes']}분"
         else:
-            mocked_route = _estimate_mock_route(lat, lng, mart_name, travel_mode)
+            mocked_route = mocked_routes[mart_name]
             estimated_total = total_price
             distance_km = mocked_route["distance_km"]
             travel_minutes = mocked_route["travel_minutes"]
@@ -620,26 +959,22 @@ async def _get_weather_note(
     return " · ".join(note_parts), False
 
 
-def _estimate_mock_route(lat: float, lng: float, mart_name: str, travel_mode: str) -> dict[str, float | int]:
-    store_lat, store_lng = MOCK_STORE_COORDS.get(mart_name, (DEFAULT_USER_LAT, DEFAULT_USER_LNG))
-    distance_km = haversine_km(lat, lng, store_lat, store_lng)
+def _estimate_mock_routes(
+    lat: float,
+    lng: float,
+    mart_names: list[str],
+    travel_mode: str,
+) -> dict[str, dict[str, float | int]]:
+    coords = [MOCK_STORE_COORDS.get(mart_name, (DEFAULT_USER_LAT, DEFAULT_USER_LNG)) for mart_name in mart_names]
     return {
-        "distance_km": round(distance_km, 1),
-        "travel_minutes": _estimate_travel_minutes(distance_km, travel_mode),
+        mart_name: {
+            "distance_km": round(estimate.distance_km, 1),
+            "travel_minutes": estimate.minutes(travel_mode),
+        }
+        for mart_name, estimate in zip(mart_names, estimate_travel_batch(lat, lng, coords))
     }
 
 
-def _estimate_travel_minutes(distance_km: float, travel_mode: str) -> int:
-    normalized_mode = travel_mode.lower()
-    if normalized_mode == "walk":
-        minutes = round(distance_km * 12)
-    elif normalized_mode == "transit":
-        minutes = round(distance_km * 4)
-    else:
-        minutes = max(1, round(distance_km / 0.5))
-    return max(1, int(minutes))
-
-
 def _travel_mode_label(travel_mode: str) -> str:
     normalized_mode = travel_mode.lower()
     if normalized_mode == "transit":
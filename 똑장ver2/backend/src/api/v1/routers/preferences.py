@@ -4,8 +4,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 
-from src.api.v1.dependencies import AuthUser, require_auth
-from src.infrastructure.persistence.user_repository import UserRepository
+from src.api.v1.dependencies import AuthUser, require_auth, user_repository
 
 router = APIRouter(prefix="/preferences", tags=["선호도"])
 
@@ -25,14 +24,14 @@ class BrandPreferenceResponse(BaseModel):
 
 
 async def sync_preferences_from_db(request: Request, user_id: str) -> dict[str, list[str]]:
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     preferences = await repo.get_preferences(user_id)
     _user_preferences[user_id] = preferences
     return preferences
 
 
 async def save_preferences_to_db(request: Request, user_id: str) -> dict[str, list[str]]:
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     current = _user_preferences.get(user_id, {"like": [], "dislike": []})
     normalized = await repo.save_preferences(user_id, current)
     _user_preferences[user_id] = normalized
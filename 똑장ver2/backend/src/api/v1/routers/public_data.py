@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import httpx
 from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel, Field
 
@@ -51,9 +52,20 @@ def _build_catalog_service(request: Request) -> PublicCatalogSyncService:
         cert_key=settings.kamis_cert_key,
         cert_id=settings.kamis_cert_id,
         timeout_seconds=settings.public_catalog_timeout_seconds,
+        search_index=getattr(request.app.state, "product_index", None),
+        http_client=_kamis_http_client(request),
+        plan_cache=getattr(request.app.state, "plan_cache", None),
+        working_sets=getattr(request.app.state, "plan_working_sets", None),
+        pool=getattr(request.app.state, "db_pool", None),
+        store_index=getattr(request.app.state, "store_index", None),
     )
 
 
+def _kamis_http_client(request: Request) -> httpx.AsyncClient | None:
+    http_clients = getattr(request.app.state, "http_clients", None)
+    return http_clients.client("kamis") if http_clients is not None else None
+
+
 @router.post("/catalog/sync", response_model=PublicCatalogSyncResponse)
 async def sync_public_catalog(
     payload: PublicCatalogSyncRequest,
@@ -6,8 +6,7 @@ from typing import Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field
 
-from src.api.v1.dependencies import AuthUser, require_auth
-from src.infrastructure.persistence.user_repository import UserRepository
+from src.api.v1.dependencies import AuthUser, require_auth, user_repository
 
 router = APIRouter(prefix="/reservations", tags=["reservations"])
 
@@ -107,7 +106,7 @@ async def list_reservations(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     rows = await repo.list_reservations(current_user.user_id)
     return ReservationListResponse(
         user_id=current_user.user_id,
@@ -121,7 +120,7 @@ async def create_reservation(
     payload: CreateReservationRequest,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     created = await repo.create_reservation(
         current_user.user_id,
         {
@@ -143,7 +142,7 @@ async def update_reservation(
     if "planned_items" in patch:
         patch["planned_items"] = _sanitize_planned_items(patch.get("planned_items"))
 
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     updated = await repo.update_reservation(current_user.user_id, reservation_id, patch)
     if not updated:
         raise HTTPException(status_code=404, detail="Reservation not found")
@@ -156,7 +155,7 @@ async def delete_reservation(
     reservation_id: str,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     await repo.delete_reservation(current_user.user_id, reservation_id)
     rows = await repo.list_reservations(current_user.user_id)
     return ReservationListResponse(
@@ -5,8 +5,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel, Field
 
-from src.api.v1.dependencies import AuthUser, require_auth
-from src.infrastructure.persistence.user_repository import UserRepository
+from src.api.v1.dependencies import AuthUser, require_auth, user_repository
 
 router = APIRouter(prefix="/users/me", tags=["users"])
 
@@ -35,7 +34,7 @@ async def get_profile(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     profile = await repo.get_profile(current_user.user_id)
     return UserProfileResponse.model_validate(profile)
 
@@ -46,7 +45,7 @@ async def upsert_profile(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     saved = await repo.save_profile(current_user.user_id, payload.model_dump(mode="json"))
     return UserProfileResponse.model_validate(saved)
 
@@ -56,7 +55,7 @@ async def list_orders(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     orders = await repo.list_orders(current_user.user_id)
     return OrdersResponse(orders=orders)
 
@@ -67,6 +66,6 @@ async def create_order(
     request: Request,
     current_user: AuthUser = Depends(require_auth),
 ):
-    repo = UserRepository(request.app.state.db)
+    repo = user_repository(request)
     stored = await repo.upsert_order(current_user.user_id, payload)
     return {"order": stored}
\ No newline at end of file
@@ -3,14 +3,16 @@ from __future__ import annotations
 
 import logging
 import re
+from dataclasses import dataclass
 from typing import TypedDict, Annotated, Literal
 
 from langchain_core.messages import SystemMessage, BaseMessage
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 
-from src.application.prompts import render_prompt
-from src.core.llm import ainvoke_json_with_model_fallback, is_openai_configured
+from src.application.prompts import prompt_template_version, render_prompt
+from src.core.llm import ainvoke_json_with_model_fallback, is_openai_configured, llm_cache_key
+from src.core.metrics import get_chat_routing_tracker
 from src.domain.models.basket import BasketItem, ItemMode
 from src.api.v1.routers.basket import get_basket_store
 
@@ -148,6 +150,9 @@ class ChatState(TypedDict):
     user_id: str
     llm_degraded: bool | None
     llm_error: str | None
+    route_tier: str | None
+    fast_path_intent: str | None
+    fast_path_confidence: float | None
 
 
 # ── 2. LLM 설정 (모델 fallback) ─────────────────────────────────────
@@ -179,6 +184,115 @@ def _default_entity_action_from_intent(raw_intent: object) -> str:
 
 # ── 3. Node 구현 ────────────────────────────────────────────────────
 
+_ANALYZER_PROMPT = "analyzer.system.txt"
+_ANALYZER_TEMPERATURE = 0.1
+# 직전 대화를 가리키는 표현. 이런 발화는 직전 턴까지 캐시 키에 넣는다
+_CONTEXT_REFERENCE_MARKERS = ("그거", "그것", "이거", "이것", "저거", "아까", "방금", "위에", "다시", "같은 걸", "그걸")
+
+
+def _analyzer_cache_key(messages: list[BaseMessage], preferences: str, basket_desc: str) -> str:
+    last_msg = str(messages[-1].content) if messages else ""
+    parts = [preferences, basket_desc, last_msg]
+    if any(marker in last_msg for marker in _CONTEXT_REFERENCE_MARKERS):
+        parts.extend(str(message.content) for message in messages[-3:-1])
+    return llm_cache_key(
+        template_version=prompt_template_version(_ANALYZER_PROMPT),
+        temperature=_ANALYZER_TEMPERATURE,
+        parts=parts,
+    )
+
+
+# 규칙 파서 확신도가 이 값 이상이면 LLM 분석 없이 바로 노드로 보낸다
+FAST_PATH_MIN_CONFIDENCE = 0.85
+# "우유 안 담아도 돼", "우유 말고 두유", "빼지 마" — 부정/대체 표현은 규칙 파서가 뒤집어 읽는다
+_NEGATION_PATTERN = re.compile(r"(?:^|\s)안(?:\s|담|넣|사|빼)|말고|지\s*마|빼지|않")
+# "-ㄹ까", "-나요", "-니"로 끝나는 발화는 요청이 아니라 질문
+_QUESTION_ENDINGS = ("까", "까요", "나요", "니")
+# 어미가 붙어도 잡히도록 어간 단위로 본다 ("담고 … 빼줘")
+_ADD_STEMS = ("담", "추가", "넣", "사줘", "주문")
+_REMOVE_STEMS = ("빼", "삭제", "취소", "지우", "지워", "제거")
+
+
+@dataclass(frozen=True)
+class FastPathDecision:
+    intent: str | None
+    confidence: float
+    reason: str
+
+
+def score_fast_path(text: str) -> FastPathDecision:
+    """규칙 파서가 발화를 얼마나 확실히 해석하는지 점수화.
+
+    담기/빼기/장바구니 보기 중 모호함이 없는 발화만 높은 점수를 받는다.
+    지시어(그거, 아까…)·추천·질문·부정이 섞이거나 담기와 빼기가 함께 있으면 LLM에 넘긴다.
+    """
+    raw = str(text or "").strip()
+    normalized = raw.lower()
+    if not normalized:
+        return FastPathDecision(None, 0.0, "empty")
+
+    has_add = any(kw in normalized for kw in ADD_KEYWORDS)
+    has_remove = any(kw in normalized for kw in REMOVE_KEYWORDS)
+    if any(kw in normalized for kw in SHOW_CART_KEYWORDS):
+        if has_add or has_remove:
+            return FastPathDecision("show_cart", 0.5, "show_cart_mixed")
+        return FastPathDecision("show_cart", 0.95, "show_cart_keyword")
+
+    if any(stem in normalized for stem in _ADD_STEMS) and any(stem in normalized for stem in _REMOVE_STEMS):
+        return FastPathDecision("modify", 0.5, "mixed_add_remove")
+
+    ambiguous = (
+        "?" in normalized
+        or normalized.rstrip(" .!~…").endswith(_QUESTION_ENDINGS)
+        or _NEGATION_PATTERN.search(normalized) is not None
+        or any(marker in normalized for marker in _CONTEXT_REFERENCE_MARKERS)
+        or any(kw in normalized for kw in (*RECOMMEND_KEYWORDS, *ASK_KEYWORDS))
+    )
+
+    if has_remove and not has_add:
+        keyword = next(kw for kw in REMOVE_KEYWORDS if kw in normalized)
+        prefix = raw.split(keyword)[0].strip()
+        if prefix and _extract_item_name(prefix, allow_fallback=False) and not ambiguous:
+            return FastPathDecision("modify", 0.9, "remove_known_item")
+        return FastPathDecision("modify", 0.5, "remove_unresolved")
+
+    if has_add and not has_remove:
+        if _extract_recipe_bundle_items(raw) and not ambiguous:
+            return FastPathDecision("modify", 0.9, "recipe_bundle")
+        segments = _split_item_segments(raw)
+        all_known = all(_extract_item_name(segment, allow_fallback=False) for segment in segments)
+        if all_known and not ambiguous:
+            return FastPathDecision("modify", 0.9, "add_known_items")
+        return FastPathDecision("modify", 0.5, "add_unresolved")
+
+    if _extract_item_name(normalized) and not ambiguous:
+        # "우유 2개"처럼 키워드 없는 품목 발화 — 후속 질문 여부는 LLM 판단을 따른다
+        confidence = 0.75 if _contains_add_details(raw) else 0.6
+        return FastPathDecision("modify", confidence, "item_without_keyword")
+
+    return FastPathDecision(None, 0.0, "no_rule_match")
+
+
+async def fast_router_node(state: ChatState) -> dict:
+    """규칙 기반 1차 라우터. 확신도가 낮으면 후보만 남기고 analyzer로 넘긴다."""
+    last_msg = state["messages"][-1].content if state["messages"] else ""
+    decision = score_fast_path(str(last_msg))
+    update: dict = {
+        "fast_path_intent": decision.intent,
+        "fast_path_confidence": decision.confidence,
+    }
+    if decision.intent is not None and decision.confidence >= FAST_PATH_MIN_CONFIDENCE:
+        update.update(
+            {
+                "intent": decision.intent,
+                "route_tier": "rule",
+                "llm_degraded": False,
+                "llm_error": None,
+            }
+        )
+    return update
+
+
 async def analyzer_node(state: ChatState) -> dict:
     """사용자 의도 분석 노드."""
     basket = get_basket_store(state.get("user_id", "unknown_user"))
@@ -190,6 +304,7 @@ async def analyzer_node(state: ChatState) -> dict:
         intent = _keyword_classify(last_msg)
         return {
             "intent": intent,
+            "route_tier": "keyword",
             "llm_degraded": True,
             "llm_error": "OPENAI_NOT_CONFIGURED",
         }
@@ -199,14 +314,18 @@ async def analyzer_node(state: ChatState) -> dict:
     ) or "비어 있음"
 
     prompt = render_prompt(
-        "analyzer.system.txt",
+        _ANALYZER_PROMPT,
         preferences=state["user_preferences"],
         basket_status=basket_desc,
     )
 
     try:
         messages = [SystemMessage(content=prompt)] + list(state["messages"])
-        result = await ainvoke_json_with_model_fallback(messages, temperature=0.1)
+        result = await ainvoke_json_with_model_fallback(
+            messages,
+            temperature=_ANALYZER_TEMPERATURE,
+            cache_key=_analyzer_cache_key(list(state["messages"]), state["user_preferences"], basket_desc),
+        )
         raw_intent = result.get("intent", "general")
         normalized_intent = normalize_agent_intent(raw_intent)
         intent = _override_intent_with_item_heuristic(last_msg, normalized_intent)
@@ -218,9 +337,14 @@ async def analyzer_node(state: ChatState) -> dict:
             state.get("matcher_entities"),
             llm_entities,
         )
+        rule_intent = state.get("fast_path_intent")
+        if rule_intent:
+            # 규칙 후보와 LLM 판단이 얼마나 일치하는지 — 임계값 조정 근거
+            await get_chat_routing_tracker().record_agreement(rule_intent=rule_intent, llm_intent=intent)
         return {
             "intent": intent,
             "matcher_entities": merged_entities,
+            "route_tier": "llm",
             "llm_degraded": False,
             "llm_error": None,
         }
@@ -228,6 +352,7 @@ async def analyzer_node(state: ChatState) -> dict:
         logger.warning("LLM analyzer failed, fallback classifier used: %s", exc)
         return {
             "intent": _keyword_classify(last_msg),
+            "route_tier": "keyword",
             "llm_degraded": True,
             "llm_error": str(exc),
         }
@@ -776,10 +901,18 @@ def route_intent(state: ChatState) -> Literal["modifier", "recommender", "clarif
     return mapping.get(intent, "general")
 
 
+def route_fast_path(state: ChatState) -> Literal["modifier", "show_cart", "analyzer"]:
+    """fast_router가 확정한 요청만 바로 실행 노드로, 나머지는 analyzer로."""
+    if state.get("route_tier") != "rule":
+        return "analyzer"
+    return "show_cart" if state.get("intent") == "show_cart" else "modifier"
+
+
 # ── 5. Graph 조립 ──────────────────────────────────────────────────
 
 workflow = StateGraph(ChatState)
 
+workflow.add_node("fast_router", fast_router_node)
 workflow.add_node("analyzer", analyzer_node)
 workflow.add_node("modifier", modifier_node)
 workflow.add_node("recommender", recommender_node)
@@ -787,7 +920,17 @@ workflow.add_node("clarifier", clarifier_node)
 workflow.add_node("show_cart", show_cart_node)
 workflow.add_node("general", general_node)
 
-workflow.set_entry_point("analyzer")
+workflow.set_entry_point("fast_router")
+
+workflow.add_conditional_edges(
+    "fast_router",
+    route_fast_path,
+    {
+        "modifier": "modifier",
+        "show_cart": "show_cart",
+        "analyzer": "analyzer",
+    },
+)
 
 workflow.add_conditional_edges(
     "analyzer",
@@ -1,3 +1,3 @@
-from src.application.prompts.loader import load_prompt_template, render_prompt
+from src.application.prompts.loader import load_prompt_template, prompt_template_version, render_prompt
 
-__all__ = ["load_prompt_template", "render_prompt"]
+__all__ = ["load_prompt_template", "prompt_template_version", "render_prompt"]
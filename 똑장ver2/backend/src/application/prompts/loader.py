@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import string
 from functools import lru_cache
 from pathlib import Path
@@ -31,6 +32,12 @@ def load_prompt_template(name: str) -> str:
     return path.read_text(encoding="utf-8")
 
 
+@lru_cache(maxsize=128)
+def prompt_template_version(name: str) -> str:
+    """템플릿 내용 해시. 프롬프트가 바뀌면 LLM 응답 캐시 키도 바뀌도록 쓴다."""
+    return hashlib.sha256(load_prompt_template(name).encode("utf-8")).hexdigest()[:12]
+
+
 def render_prompt(name: str, **variables: str) -> str:
     template = load_prompt_template(name)
     required_fields = {
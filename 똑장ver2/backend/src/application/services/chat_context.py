@@ -0,0 +1,97 @@
+"""토큰 예산에 맞춘 대화 컨텍스트 구성.
+
+최근 턴부터 예산이 허락하는 만큼 원문으로 넣고, 남은 이전 턴은 사용자 발화만 짧게
+줄인 요약 한 줄로 접는다. 세션이 길어져도 analyzer 프롬프트 크기가 예산 안에 머문다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+ROLE_USER = "user"
+ROLE_ASSISTANT = "assistant"
+
+# 요약에 넣는 이전 발화 하나의 최대 글자 수
+_SUMMARY_SNIPPET_CHARS = 40
+
+
+@dataclass(frozen=True)
+class ChatTurn:
+    role: str
+    content: str
+
+
+@dataclass(frozen=True)
+class ContextWindow:
+    turns: tuple[ChatTurn, ...]
+    summary: Optional[str]
+    estimated_tokens: int
+    dropped_turns: int
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 보수적 추정: 한글 등 비ASCII는 글자당 1, ASCII는 4글자당 1."""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_count = len(text) - non_ascii
+    return non_ascii + (ascii_count + 3) // 4 + 1
+
+
+def build_context_window(
+    history: Sequence[ChatTurn],
+    *,
+    max_tokens: int,
+    summary_max_tokens: int = 0,
+    estimate: Callable[[str], int] = estimate_tokens,
+) -> ContextWindow:
+    budget = max(0, int(max_tokens))
+    used = 0
+    kept: list[ChatTurn] = []
+    for turn in reversed(history):
+        cost = estimate(turn.content)
+        if used + cost > budget:
+            break
+        kept.append(turn)
+        used += cost
+    kept.reverse()
+    # 어시스턴트 응답으로 시작하면 맥락이 어색하므로 사용자 발화부터 시작
+    while kept and kept[0].role != ROLE_USER:
+        used -= estimate(kept[0].content)
+        kept.pop(0)
+
+    older = history[: len(history) - len(kept)]
+    summary = _summarize(older, summary_max_tokens, estimate)
+    if summary is not None:
+        used += estimate(summary)
+    return ContextWindow(
+        turns=tuple(kept),
+        summary=summary,
+        estimated_tokens=used,
+        dropped_turns=len(older),
+    )
+
+
+def _summarize(
+    older: Sequence[ChatTurn],
+    max_tokens: int,
+    estimate: Callable[[str], int],
+) -> Optional[str]:
+    if not older or max_tokens <= 0:
+        return None
+    prefix = "이전 대화 요약 — 사용자 요청: "
+    snippets: list[str] = []
+    used = estimate(prefix)
+    # 가까운 과거부터 채우고 출력은 시간순으로
+    for turn in reversed(older):
+        if turn.role != ROLE_USER:
+            continue
+        snippet = " ".join(turn.content.split())
+        if len(snippet) > _SUMMARY_SNIPPET_CHARS:
+            snippet = snippet[:_SUMMARY_SNIPPET_CHARS] + "…"
+        cost = estimate(snippet)
+        if used + cost > max_tokens:
+            break
+        snippets.append(snippet)
+        used += cost
+    if not snippets:
+        return None
+    return prefix + " / ".join(reversed(snippets))
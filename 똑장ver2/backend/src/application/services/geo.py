@@ -2,10 +2,25 @@
 from __future__ import annotations
 
 import math
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+
+EARTH_RADIUS_KM = 6371.0
+TRAVEL_MODES = ("walk", "transit", "car")
+
+
+@dataclass(frozen=True)
+class TravelEstimate:
+    """직선거리 기준 이동 추정치 (모드별 분)."""
+
+    distance_km: float
+    minutes_by_mode: dict[str, int]
+
+    def minutes(self, travel_mode: str) -> int:
+        return self.minutes_by_mode.get(travel_mode.lower(), self.minutes_by_mode["car"])
 
 
 def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    r = 6371.0
     d_lat = math.radians(lat2 - lat1)
     d_lng = math.radians(lng2 - lng1)
     a = (
@@ -14,5 +29,55 @@ def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
         * math.cos(math.radians(lat2))
         * math.sin(d_lng / 2) ** 2
     )
-    return r * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def haversine_many_km(
+    origin_lat: float,
+    origin_lng: float,
+    points: Iterable[tuple[float, float]],
+) -> list[float]:
+    """출발지 하나에서 여러 좌표까지의 거리. 출발지 삼각함수는 한 번만 계산한다."""
+    radians = math.radians
+    sin = math.sin
+    cos = math.cos
+    origin_lat_rad = radians(origin_lat)
+    origin_lng_rad = radians(origin_lng)
+    origin_cos = cos(origin_lat_rad)
+
+    distances: list[float] = []
+    for lat, lng in points:
+        lat_rad = radians(lat)
+        sin_d_lat = sin((lat_rad - origin_lat_rad) / 2)
+        sin_d_lng = sin((radians(lng) - origin_lng_rad) / 2)
+        a = sin_d_lat * sin_d_lat + origin_cos * cos(lat_rad) * sin_d_lng * sin_d_lng
+        distances.append(EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+    return distances
+
+
+def estimate_travel_minutes(distance_km: float, travel_mode: str) -> int:
+    normalized_mode = travel_mode.lower()
+    if normalized_mode == "walk":
+        # 평균 도보 속도(약 5km/h) 기준: 1km ≈ 12분
+        minutes = round(distance_km * 12)
+    elif normalized_mode == "transit":
+        # 대중교통 평균 15km/h + 대기시간 포함 근사
+        minutes = round(distance_km * 4)
+    else:
+        minutes = max(1, round(distance_km / 0.5))
+    return max(1, int(minutes))
+
 
+def estimate_travel_batch(
+    origin_lat: float,
+    origin_lng: float,
+    points: Sequence[tuple[float, float]],
+) -> list[TravelEstimate]:
+    """여러 목적지의 거리(소수 1자리 반올림 전 값)와 모든 이동수단 소요시간을 한 번에 계산."""
+    return [
+        TravelEstimate(
+            distance_km=distance,
+            minutes_by_mode={mode: estimate_travel_minutes(distance, mode) for mode in TRAVEL_MODES},
+        )
+        for distance in haversine_many_km(origin_lat, origin_lng, points)
+    ]
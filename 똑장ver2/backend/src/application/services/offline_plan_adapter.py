@@ -5,15 +5,18 @@
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-import statistics
-from typing import Optional
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Optional
 
 import aiosqlite
 
-from src.application.services.geo import haversine_km
+from src.application.services.geo import estimate_travel_batch, estimate_travel_minutes, haversine_km
 from src.application.services.product_matcher_db import MatchResult, ProductMatcherDB
-from src.domain.models.basket import Basket
+from src.application.services.product_search_index import ProductSearchIndex
+from src.application.services.store_spatial_index import StoreSpatialIndex
+from src.core.ttl_cache import BoundedTTLCache
+from src.domain.models.basket import Basket, BasketItem
 from src.domain.models.plan import (
     MissingPlanItem,
     Plan,
@@ -21,15 +24,18 @@ from src.domain.models.plan import (
     PlanItem,
     PlanType,
 )
+from src.infrastructure.persistence.latest_offline_price import MIN_REASONABLE_OFFLINE_UNIT_PRICE
 
 
 DEFAULT_USER_LAT = 37.4985
 DEFAULT_USER_LNG = 127.0292
 DEFAULT_TRAVEL_MODE = "walk"
 DEFAULT_MAX_TRAVEL_MINUTES = 30
-MIN_REASONABLE_OFFLINE_UNIT_PRICE = 100
-OFFLINE_OUTLIER_LOWER_RATIO = 0.45
-OFFLINE_OUTLIER_UPPER_RATIO = 2.2
+DEFAULT_ROUTING_CONCURRENCY = 8
+DEFAULT_ROUTING_DEADLINE_SECONDS = 2.5
+
+# 경로 API 응답 전에 직선거리 기준으로 만든 임시 후보를 받는 콜백
+ProvisionalCallback = Callable[[list[Plan]], Awaitable[None]]
 
 
 @dataclass
@@ -38,20 +44,159 @@ class RouteInfo:
     travel_minutes: int
 
 
+@dataclass
+class PriceMatrix:
+    """후보 매장 × 매칭 품목의 최신 가격과 결품 대체품."""
+
+    latest: dict[str, dict[str, dict]]
+    alternatives: dict[tuple[str, str], PlanAlternative]
+
+    def snapshots_for(self, store_id: str) -> dict[str, dict]:
+        return self.latest.get(store_id, {})
+
+    def alternative_for(self, store_id: str, product_norm_key: str) -> Optional[PlanAlternative]:
+        return self.alternatives.get((store_id, product_norm_key))
+
+
 @dataclass
 class CandidateBuildResult:
     candidates: list[Plan]
     degraded_providers: list[str]
     candidate_store_count: int
     filtered_store_count: int
+    # 후보 계산에 쓰인 상품 키 (플랜 캐시 무효화 기준)
+    product_keys: list[str] = field(default_factory=list)
+
+
+def _empty_build_result(degraded_providers: Optional[list[str]] = None) -> CandidateBuildResult:
+    return CandidateBuildResult(
+        candidates=[],
+        degraded_providers=degraded_providers or [],
+        candidate_store_count=0,
+        filtered_store_count=0,
+    )
+
+
+def _basket_match_key(item: BasketItem) -> str:
+    """매칭 결과를 재사용하는 기준. 수량은 매칭에 영향이 없어 제외한다."""
+    mode = item.mode.value if hasattr(item.mode, "value") else str(item.mode)
+    return "|".join(
+        [
+            item.item_name.strip().lower(),
+            (item.brand or "").strip().lower(),
+            (item.size or "").strip().lower(),
+            mode,
+        ]
+    )
+
+
+@dataclass
+class CandidateWorkingSet:
+    """사용자별 후보 계산 작업 집합 (매칭 결과, 매장/경로, 매장별 가격 행)."""
+
+    context_key: tuple
+    matches: dict[str, Optional[MatchResult]]
+    guardrails: dict[str, tuple[int, int]]
+    loaded_products: set[str]
+    store_routes: list[tuple[dict, RouteInfo]]
+    degraded: list[str]
+    candidate_store_count: int
+    price_matrix: PriceMatrix
+
+    def matched_items(self, basket: Basket) -> list[tuple[int, MatchResult]]:
+        matched_items: list[tuple[int, MatchResult]] = []
+        for idx, item in enumerate(basket.items):
+            matched = self.matches.get(_basket_match_key(item))
+            if matched:
+                matched_items.append((idx, matched))
+        return matched_items
+
+    def copy(self) -> "CandidateWorkingSet":
+        # 매장 목록/경로는 불변으로 공유하고, 품목 단위로 바뀌는 맵만 복사
+        return CandidateWorkingSet(
+            context_key=self.context_key,
+            matches=dict(self.matches),
+            guardrails=dict(self.guardrails),
+            loaded_products=set(self.loaded_products),
+            store_routes=self.store_routes,
+            degraded=self.degraded,
+            candidate_store_count=self.candidate_store_count,
+            price_matrix=PriceMatrix(
+                latest={store_id: dict(rows) for store_id, rows in self.price_matrix.latest.items()},
+                alternatives=dict(self.price_matrix.alternatives),
+            ),
+        )
+
+    def drop_products(self, product_keys: set[str]) -> None:
+        for store_id in list(self.price_matrix.latest):
+            rows = self.price_matrix.latest[store_id]
+            for key in product_keys:
+                rows.pop(key, None)
+            if not rows:
+                del self.price_matrix.latest[store_id]
+        self.price_matrix.alternatives = {
+            pair: alternative
+            for pair, alternative in self.price_matrix.alternatives.items()
+            if pair[1] not in product_keys
+        }
+        for key in product_keys:
+            self.guardrails.pop(key, None)
+        self.loaded_products -= product_keys
+
+    def merge_prices(self, partial: PriceMatrix) -> None:
+        for store_id, rows in partial.latest.items():
+            self.price_matrix.latest.setdefault(store_id, {}).update(rows)
+        self.price_matrix.alternatives.update(partial.alternatives)
+
+
+class CandidateWorkingSetStore:
+    """사용자별 CandidateWorkingSet LRU. 카탈로그 동기화 시 관련 상품을 쓰는 항목을 버린다."""
+
+    def __init__(self, *, max_entries: int = 512, ttl_seconds: float = 600.0) -> None:
+        self._entries: BoundedTTLCache[str, CandidateWorkingSet] = BoundedTTLCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+
+    def get(self, key: str) -> Optional[CandidateWorkingSet]:
+        cached = self._entries.get(key)
+        return cached.value if cached is not None else None
+
+    def set(self, key: str, working_set: CandidateWorkingSet) -> None:
+        self._entries.set(key, working_set)
+
+    def invalidate_products(self, product_keys: Iterable[str]) -> int:
+        keys = set(product_keys)
+        stale = [key for key, working_set in self._entries.items() if working_set.loaded_products & keys]
+        for key in stale:
+            self._entries.pop(key)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return self._entries.stats()
 
 
 class OfflinePlanAdapter:
     """DB 스냅샷 기반 후보 플랜 생성기."""
 
-    def __init__(self, db: aiosqlite.Connection):
+    def __init__(
+        self,
+        db: aiosqlite.Connection,
+        search_index: Optional[ProductSearchIndex] = None,
+        store_index: Optional[StoreSpatialIndex] = None,
+        routing_concurrency: int = DEFAULT_ROUTING_CONCURRENCY,
+        routing_deadline_seconds: float = DEFAULT_ROUTING_DEADLINE_SECONDS,
+        working_sets: Optional[CandidateWorkingSetStore] = None,
+    ):
         self._db = db
-        self._matcher = ProductMatcherDB(db)
+        self._working_sets = working_sets
+        self._matcher = ProductMatcherDB(db, search_index=search_index)
+        self._store_index = store_index
+        self._routing_concurrency = max(1, routing_concurrency)
+        self._routing_deadline_seconds = routing_deadline_seconds
 
     async def build_candidates(
         self,
@@ -65,114 +210,327 @@ class OfflinePlanAdapter:
         routing_provider: object | None = None,
         preferred_brands: Optional[list[str]] = None,
         disliked_brands: Optional[list[str]] = None,
+        working_set_key: Optional[str] = None,
+        on_provisional: Optional[ProvisionalCallback] = None,
     ) -> CandidateBuildResult:
+        """매장별 후보 플랜 생성.
+
+        `on_provisional`을 주면 경로 API를 기다리는 동안 직선거리 ETA로 만든 임시 후보를
+        먼저 넘긴다. 작업 집합을 재사용해 경로 조회가 없으면 호출하지 않는다.
+        """
         if not basket.items:
-            return CandidateBuildResult(
-                candidates=[],
-                degraded_providers=[],
-                candidate_store_count=0,
-                filtered_store_count=0,
+            return _empty_build_result()
+
+        context_key = (
+            mode,
+            float(lat),
+            float(lng),
+            travel_mode,
+            int(max_travel_minutes),
+            tuple(preferred_brands or ()),
+            tuple(disliked_brands or ()),
+        )
+        working_set: Optional[CandidateWorkingSet] = None
+        if self._working_sets is not None and working_set_key:
+            working_set = self._working_sets.get(working_set_key)
+
+        if working_set is not None and working_set.context_key == context_key:
+            # 같은 조건에서 장바구니만 바뀐 경우 — 바뀐 품목의 매칭/가격만 다시 조회
+            working_set = await self._update_working_set(
+                working_set,
+                basket,
+                preferred_brands=preferred_brands,
+                disliked_brands=disliked_brands,
+            )
+        else:
+            matched_items = await self._match_basket_items(
+                basket,
+                preferred_brands=preferred_brands,
+                disliked_brands=disliked_brands,
             )
+            if not matched_items:
+                return _empty_build_result()
+
+            provisional = None
+            if on_provisional is not None:
+                async def provisional(
+                    store_routes: list[tuple[dict, RouteInfo]],
+                    price_matrix: PriceMatrix,
+                    guardrails: dict[str, tuple[int, int]],
+                ) -> None:
+                    await on_provisional(
+                        self._build_plans(
+                            store_routes,
+                            basket,
+                            matched_items,
+                            mode,
+                            travel_mode,
+                            price_matrix=price_matrix,
+                            price_guardrails=guardrails,
+                            preferred_brands=preferred_brands,
+                            disliked_brands=disliked_brands,
+                        )
+                    )
+
+            working_set, place_degraded = await self._build_working_set(
+                basket,
+                matched_items,
+                context_key=context_key,
+                mode=mode,
+                lat=lat,
+                lng=lng,
+                travel_mode=travel_mode,
+                max_travel_minutes=max_travel_minutes,
+                place_provider=place_provider,
+                routing_provider=routing_provider,
+                on_provisional=provisional,
+            )
+            if working_set is None:
+                return _empty_build_result(["place"] if place_degraded else [])
+
+        if self._working_sets is not None and working_set_key:
+            self._working_sets.set(working_set_key, working_set)
+
+        matched_items = working_set.matched_items(basket)
+        if not matched_items:
+            return _empty_build_result()
 
-        matched_items = await self._match_basket_items(
+        candidates = self._build_plans(
+            working_set.store_routes,
             basket,
+            matched_items,
+            mode,
+            travel_mode,
+            price_matrix=working_set.price_matrix,
+            price_guardrails=working_set.guardrails,
             preferred_brands=preferred_brands,
             disliked_brands=disliked_brands,
         )
-        if not matched_items:
-            return CandidateBuildResult(
-                candidates=[],
-                degraded_providers=[],
-                candidate_store_count=0,
-                filtered_store_count=0,
-            )
 
-        guardrails = await self._build_price_guardrails(
-            [matched.product_norm_key for _, matched in matched_items]
+        return CandidateBuildResult(
+            candidates=candidates,
+            degraded_providers=list(working_set.degraded),
+            candidate_store_count=working_set.candidate_store_count,
+            filtered_store_count=len(working_set.store_routes),
+            product_keys=list(dict.fromkeys(matched.product_norm_key for _, matched in matched_items)),
         )
 
+    async def _build_working_set(
+        self,
+        basket: Basket,
+        matched_items: list[tuple[int, MatchResult]],
+        *,
+        context_key: tuple,
+        mode: str,
+        lat: float,
+        lng: float,
+        travel_mode: str,
+        max_travel_minutes: int,
+        place_provider: object | None,
+        routing_provider: object | None,
+        on_provisional: Optional[Callable[[list[tuple[dict, RouteInfo]], PriceMatrix, dict], Awaitable[None]]] = None,
+    ) -> tuple[Optional[CandidateWorkingSet], bool]:
+        product_keys = [matched.product_norm_key for _, matched in matched_items]
+        guardrails = await self._build_price_guardrails(product_keys)
+
         radius_km = self._estimate_radius(max_travel_minutes, travel_mode)
         stores, place_degraded = await self._find_candidate_stores(
             lat, lng, radius_km=radius_km, limit=30, place_provider=place_provider
         )
         if not stores:
-            return CandidateBuildResult(
-                candidates=[],
-                degraded_providers=["place"] if place_degraded else [],
-                candidate_store_count=0,
-                filtered_store_count=0,
-            )
+            return None, place_degraded
 
         degraded: list[str] = []
         if place_degraded:
             degraded.append("place")
 
-        store_routes: list[tuple[dict, RouteInfo]] = []
-        all_routes: list[tuple[dict, RouteInfo]] = []
-        routing_degraded = False
-        for store in stores:
-            route, route_degraded = await self._estimate_route(
+        routes_task = asyncio.ensure_future(
+            self._estimate_routes(
                 lat,
                 lng,
-                float(store["lat"]),
-                float(store["lng"]),
+                stores,
                 travel_mode=travel_mode,
                 routing_provider=routing_provider,
             )
-            all_routes.append((store, route))
-            if route_degraded:
-                routing_degraded = True
-            if mode != "offline" or route.travel_minutes <= max_travel_minutes:
-                store_routes.append((store, route))
-
-        if not store_routes and all_routes:
-            # 이동시간 필터에 걸려도 가까운 후보를 제한적으로 노출
-            store_routes = sorted(all_routes, key=lambda sr: sr[1].travel_minutes)[:3]
-            if "place" not in degraded:
-                degraded.append("place")
+        )
+        try:
+            if on_provisional is not None and routing_provider is not None:
+                # 경로 API를 기다리는 동안 직선거리 ETA로 임시 후보를 먼저 계산
+                straight_routes = [
+                    RouteInfo(distance_km=round(estimate.distance_km, 1), travel_minutes=estimate.minutes(travel_mode))
+                    for estimate in estimate_travel_batch(
+                        lat,
+                        lng,
+                        [(float(store["lat"]), float(store["lng"])) for store in stores],
+                    )
+                ]
+                provisional_routes, _ = self._filter_store_routes(stores, straight_routes, mode, max_travel_minutes)
+                provisional_matrix = await self._load_price_matrix(
+                    [store["store_id"] for store, _ in provisional_routes],
+                    matched_items,
+                    guardrails,
+                )
+                await on_provisional(provisional_routes, provisional_matrix, guardrails)
+            routes, routing_degraded = await routes_task
+        finally:
+            if not routes_task.done():
+                routes_task.cancel()
+
+        store_routes, fell_back = self._filter_store_routes(stores, routes, mode, max_travel_minutes)
+        if fell_back and "place" not in degraded:
+            degraded.append("place")
 
         if routing_degraded and "routing" not in degraded:
             degraded.append("routing")
 
+        price_matrix = await self._load_price_matrix(
+            [store["store_id"] for store, _ in store_routes],
+            matched_items,
+            guardrails,
+        )
+        matches: dict[str, Optional[MatchResult]] = {_basket_match_key(item): None for item in basket.items}
+        for basket_idx, matched in matched_items:
+            matches[_basket_match_key(basket.items[basket_idx])] = matched
+
+        working_set = CandidateWorkingSet(
+            context_key=context_key,
+            matches=matches,
+            guardrails=guardrails,
+            loaded_products=set(product_keys),
+            store_routes=store_routes,
+            degraded=degraded,
+            candidate_store_count=len(stores),
+            price_matrix=price_matrix,
+        )
+        return working_set, place_degraded
+
+    @staticmethod
+    def _filter_store_routes(
+        stores: list[dict],
+        routes: list[RouteInfo],
+        mode: str,
+        max_travel_minutes: int,
+    ) -> tuple[list[tuple[dict, RouteInfo]], bool]:
+        all_routes = list(zip(stores, routes))
+        store_routes = [
+            (store, route)
+            for store, route in all_routes
+            if mode != "offline" or route.travel_minutes <= max_travel_minutes
+        ]
+        if not store_routes and all_routes:
+            # 이동시간 필터에 걸려도 가까운 후보를 제한적으로 노출
+            return sorted(all_routes, key=lambda sr: sr[1].travel_minutes)[:3], True
+        return store_routes, False
+
+    def _build_plans(
+        self,
+        store_routes: list[tuple[dict, RouteInfo]],
+        basket: Basket,
+        matched_items: list[tuple[int, MatchResult]],
+        mode: str,
+        travel_mode: str,
+        *,
+        price_matrix: PriceMatrix,
+        price_guardrails: dict[str, tuple[int, int]],
+        preferred_brands: Optional[list[str]] = None,
+        disliked_brands: Optional[list[str]] = None,
+    ) -> list[Plan]:
         candidates: list[Plan] = []
         for store, route in store_routes:
-            plan = await self._build_store_plan(
+            plan = self._build_store_plan(
                 store,
                 route,
                 basket,
                 matched_items,
                 mode,
                 travel_mode,
-                price_guardrails=guardrails,
+                price_matrix=price_matrix,
+                price_guardrails=price_guardrails,
                 preferred_brands=preferred_brands,
                 disliked_brands=disliked_brands,
             )
             if plan:
                 candidates.append(plan)
+        return candidates
 
-        return CandidateBuildResult(
-            candidates=candidates,
-            degraded_providers=degraded,
-            candidate_store_count=len(stores),
-            filtered_store_count=len(store_routes),
-        )
-
-    async def _match_basket_items(
+    async def _update_working_set(
         self,
+        previous: CandidateWorkingSet,
         basket: Basket,
+        *,
         preferred_brands: Optional[list[str]] = None,
         disliked_brands: Optional[list[str]] = None,
-    ) -> list[tuple[int, MatchResult]]:
-        result: list[tuple[int, MatchResult]] = []
-        for idx, item in enumerate(basket.items):
-            matched = await self._matcher.match(
-                item,
+    ) -> CandidateWorkingSet:
+        """이전 작업 집합을 복사해 추가된 품목만 매칭하고, 새 상품의 가드레일/가격 행만 조회한다."""
+        working_set = previous.copy()
+
+        basket_keys = {_basket_match_key(item): item for item in basket.items}
+        new_items = [item for key, item in basket_keys.items() if key not in working_set.matches]
+        if new_items:
+            matches = await self._matcher.match_many(
+                new_items,
                 preferred_brands=preferred_brands,
                 disliked_brands=disliked_brands,
             )
-            if matched:
-                result.append((idx, matched))
-        return result
+            for item, matched in zip(new_items, matches):
+                working_set.matches[_basket_match_key(item)] = matched
+
+        # 빠진 품목과 더 이상 쓰지 않는 상품 가격 행 정리
+        for key in [key for key in working_set.matches if key not in basket_keys]:
+            del working_set.matches[key]
+        active_products = {matched.product_norm_key for matched in working_set.matches.values() if matched}
+        stale_products = working_set.loaded_products - active_products
+        if stale_products:
+            working_set.drop_products(stale_products)
+
+        new_products = {
+            matched.product_norm_key: matched
+            for matched in working_set.matches.values()
+            if matched and matched.product_norm_key not in working_set.loaded_products
+        }
+        if new_products:
+            new_matched = list(enumerate(new_products.values()))
+            working_set.guardrails.update(await self._build_price_guardrails(list(new_products)))
+            known_store_ids = set(working_set.price_matrix.latest)
+            partial = await self._load_price_matrix(
+                [store["store_id"] for store, _ in working_set.store_routes],
+                new_matched,
+                working_set.guardrails,
+                known_store_ids=known_store_ids,
+            )
+            working_set.merge_prices(partial)
+
+            # 새 상품 덕분에 처음 후보가 된 매장은 기존 품목의 대체품도 필요
+            opened_stores = set(partial.latest) - known_store_ids
+            old_products = {
+                matched.product_norm_key: matched
+                for matched in working_set.matches.values()
+                if matched and matched.product_norm_key in working_set.loaded_products
+            }
+            needed = {
+                (store_id, key)
+                for store_id in opened_stores
+                for key in old_products
+                if not self._has_valid_price(
+                    working_set.price_matrix.snapshots_for(store_id).get(key), key, working_set.guardrails
+                )
+            }
+            working_set.price_matrix.alternatives.update(await self._load_alternatives(needed, old_products))
+            working_set.loaded_products.update(new_products)
+        return working_set
+
+    async def _match_basket_items(
+        self,
+        basket: Basket,
+        preferred_brands: Optional[list[str]] = None,
+        disliked_brands: Optional[list[str]] = None,
+    ) -> list[tuple[int, MatchResult]]:
+        matches = await self._matcher.match_many(
+            basket.items,
+            preferred_brands=preferred_brands,
+            disliked_brands=disliked_brands,
+        )
+        return [(idx, matched) for idx, matched in enumerate(matches) if matched]
 
     async def _find_candidate_stores(
         self,
@@ -182,18 +540,22 @@ class OfflinePlanAdapter:
         limit: int,
         place_provider: object | None = None,
     ) -> tuple[list[dict], bool]:
-        lat_range = radius_km / 111.0
-        lng_range = radius_km / 88.0
-        rows = await self._db.execute(
-            """SELECT * FROM store_master
-               WHERE is_active = 1
-                 AND lat BETWEEN ? AND ?
-                 AND lng BETWEEN ? AND ?
-               ORDER BY updated_at DESC
-               LIMIT ?""",
-            (lat - lat_range, lat + lat_range, lng - lng_range, lng + lng_range, limit),
-        )
-        db_stores = [dict(row) for row in await rows.fetchall()]
+        if self._store_index is not None and self._store_index.is_ready:
+            # 공간 색인이 있으면 반경 내 가까운 순으로 조회
+            db_stores = [store for store, _ in self._store_index.nearest(lat, lng, radius_km, limit)]
+        else:
+            lat_range = radius_km / 111.0
+            lng_range = radius_km / 88.0
+            rows = await self._db.execute(
+                """SELECT * FROM store_master
+                   WHERE is_active = 1
+                     AND lat BETWEEN ? AND ?
+                     AND lng BETWEEN ? AND ?
+                   ORDER BY updated_at DESC
+                   LIMIT ?""",
+                (lat - lat_range, lat + lat_range, lng - lng_range, lng + lng_range, limit),
+            )
+            db_stores = [dict(row) for row in await rows.fetchall()]
 
         if not db_stores:
             fallback = await self._find_fallback_stores(limit)
@@ -215,7 +577,7 @@ class OfflinePlanAdapter:
         except Exception:
             return db_stores, True
 
-    async def _build_store_plan(
+    def _build_store_plan(
         self,
         store: dict,
         route: RouteInfo,
@@ -223,12 +585,12 @@ class OfflinePlanAdapter:
         matched_items: list[tuple[int, MatchResult]],
         mode: str,
         travel_mode: str,
+        price_matrix: PriceMatrix,
         price_guardrails: dict[str, tuple[int, int]],
         preferred_brands: Optional[list[str]] = None,
         disliked_brands: Optional[list[str]] = None,
     ) -> Optional[Plan]:
-        product_keys = [m.product_norm_key for _, m in matched_items]
-        snapshots = await self._find_latest_snapshots(store["store_id"], product_keys)
+        snapshots = price_matrix.snapshots_for(store["store_id"])
         if not snapshots:
             return None
 
@@ -243,7 +605,7 @@ class OfflinePlanAdapter:
             snap = snapshots.get(matched.product_norm_key)
             if not snap:
                 basket_item = basket.items[basket_idx]
-                alternative = await self._find_alternative_for_missing(store["store_id"], matched)
+                alternative = price_matrix.alternative_for(store["store_id"], matched.product_norm_key)
                 missing_items.append(
                     MissingPlanItem(
                         item_name=basket_item.item_name,
@@ -263,7 +625,7 @@ class OfflinePlanAdapter:
                 unit_price,
                 price_guardrails,
             ):
-                alternative = await self._find_alternative_for_missing(store["store_id"], matched)
+                alternative = price_matrix.alternative_for(store["store_id"], matched.product_norm_key)
                 missing_items.append(
                     MissingPlanItem(
                         item_name=basket_item.item_name,
@@ -351,67 +713,126 @@ class OfflinePlanAdapter:
             expected_delivery_hours=expected_delivery_hours,
         )
 
-    async def _find_latest_snapshots(self, store_id: str, product_keys: list[str]) -> dict[str, dict]:
-        if not product_keys:
-            return {}
-        placeholders = ",".join("?" for _ in product_keys)
-        rows = await self._db.execute(
-            f"""SELECT * FROM offline_price_snapshot
-                WHERE store_id = ? AND product_norm_key IN ({placeholders})
-                ORDER BY observed_at DESC""",
-            [store_id, *product_keys],
+    async def _load_price_matrix(
+        self,
+        store_ids: list[str],
+        matched_items: list[tuple[int, MatchResult]],
+        guardrails: dict[str, tuple[int, int]],
+        known_store_ids: Iterable[str] = (),
+    ) -> PriceMatrix:
+        """모든 (매장, 품목) 쌍의 최신가를 물질화 테이블에서 한 번에 조회하고, 결품/이상치 쌍의 대체품을 일괄 계산."""
+        product_keys = list(dict.fromkeys(m.product_norm_key for _, m in matched_items))
+        unique_store_ids = list(dict.fromkeys(store_ids))
+        if not product_keys or not unique_store_ids:
+            return PriceMatrix(latest={}, alternatives={})
+
+        store_placeholders = ",".join("?" for _ in unique_store_ids)
+        key_placeholders = ",".join("?" for _ in product_keys)
+        cursor = await self._db.execute(
+            f"""SELECT * FROM latest_offline_price
+                WHERE store_id IN ({store_placeholders})
+                  AND product_norm_key IN ({key_placeholders})""",
+            [*unique_store_ids, *product_keys],
         )
-        latest: dict[str, dict] = {}
-        for row in await rows.fetchall():
-            row_dict = dict(row)
-            key = row_dict["product_norm_key"]
-            if key not in latest:
-                latest[key] = row_dict
-        return latest
+        rows = await cursor.fetchall()
+        await cursor.close()
 
-    async def _find_alternative_for_missing(
+        latest: dict[str, dict[str, dict]] = {}
+        for row in rows:
+            row_dict = dict(row)
+            latest.setdefault(str(row_dict["store_id"]), {})[str(row_dict["product_norm_key"])] = row_dict
+
+        # 스냅샷이 하나도 없는 매장은 플랜이 만들어지지 않으므로 대체품도 필요 없다
+        # (known_store_ids: 다른 품목 스냅샷이 이미 있는 매장 — 증분 조회용)
+        needed: set[tuple[str, str]] = set()
+        stores_with_snapshots = set(latest) | (set(known_store_ids) & set(unique_store_ids))
+        for store_id in stores_with_snapshots:
+            snapshots = latest.get(store_id, {})
+            for key in product_keys:
+                if not self._has_valid_price(snapshots.get(key), key, guardrails):
+                    needed.add((store_id, key))
+
+        matched_by_key = {m.product_norm_key: m for _, m in matched_items}
+        alternatives = await self._load_alternatives(needed, matched_by_key)
+        return PriceMatrix(latest=latest, alternatives=alternatives)
+
+    async def _load_alternatives(
         self,
-        store_id: str,
-        matched: MatchResult,
-    ) -> Optional[PlanAlternative]:
-        rows = await self._db.execute(
-            """SELECT p.normalized_name, p.brand, p.size_display, ps.price_won
-               FROM product_norm source
-               JOIN product_norm p ON p.normalized_name = source.normalized_name
-               JOIN offline_price_snapshot ps ON p.product_norm_key = ps.product_norm_key
-               WHERE source.product_norm_key = ?
-                 AND ps.store_id = ?
-                 AND p.product_norm_key != source.product_norm_key
-               ORDER BY ps.price_won ASC
-               LIMIT 1""",
-            (matched.product_norm_key, store_id),
+        needed: set[tuple[str, str]],
+        matched_by_key: dict[str, MatchResult],
+    ) -> dict[tuple[str, str], PlanAlternative]:
+        if not needed:
+            return {}
+
+        alternatives: dict[tuple[str, str], PlanAlternative] = {}
+        store_ids = sorted({store_id for store_id, _ in needed})
+        source_keys = sorted({key for _, key in needed})
+        store_placeholders = ",".join("?" for _ in store_ids)
+        key_placeholders = ",".join("?" for _ in source_keys)
+
+        # 1) 같은 품목명의 다른 상품 중 매장별 최저가 (최신가 기준, MIN 집계의 나머지 컬럼은 최저가 행 값)
+        cursor = await self._db.execute(
+            f"""SELECT source.product_norm_key AS source_key, lp.store_id,
+                       p.normalized_name, p.brand, p.size_display, MIN(lp.price_won) AS price_won
+                FROM product_norm source
+                JOIN product_norm p ON p.normalized_name = source.normalized_name
+                JOIN latest_offline_price lp ON p.product_norm_key = lp.product_norm_key
+                WHERE source.product_norm_key IN ({key_placeholders})
+                  AND lp.store_id IN ({store_placeholders})
+                  AND p.product_norm_key != source.product_norm_key
+                GROUP BY source.product_norm_key, lp.store_id""",
+            [*source_keys, *store_ids],
         )
-        alternative = await rows.fetchone()
+        for row in await cursor.fetchall():
+            pair = (str(row["store_id"]), str(row["source_key"]))
+            if pair in needed:
+                alternatives[pair] = self._to_plan_alternative(dict(row), matched_by_key[pair[1]])
+        await cursor.close()
 
-        if not alternative and matched.category:
+        # 2) 없으면 같은 카테고리 + 품목명 앞 2글자 포함 상품 중 최저가
+        category_sources: dict[str, tuple[str, str]] = {}
+        category_stores: set[str] = set()
+        for store_id, key in needed:
+            if (store_id, key) in alternatives:
+                continue
+            matched = matched_by_key[key]
             token = str(matched.normalized_name or "")[:2]
-            if token:
-                rows = await self._db.execute(
-                    """SELECT p.normalized_name, p.brand, p.size_display, ps.price_won
-                       FROM product_norm source
-                       JOIN product_norm p ON p.category = source.category
-                       JOIN offline_price_snapshot ps ON p.product_norm_key = ps.product_norm_key
-                       WHERE source.product_norm_key = ?
-                         AND source.category = ?
-                         AND p.category = source.category
-                         AND p.normalized_name LIKE ?
-                         AND ps.store_id = ?
-                         AND p.product_norm_key != source.product_norm_key
-                       ORDER BY ps.price_won ASC
-                       LIMIT 1""",
-                    (matched.product_norm_key, matched.category, f"%{token}%", store_id),
-                )
-                alternative = await rows.fetchone()
+            if matched.category and token:
+                category_sources[key] = (matched.category, f"%{token}%")
+                category_stores.add(store_id)
+
+        if category_sources:
+            values = ",".join("(?, ?, ?)" for _ in category_sources)
+            store_placeholders = ",".join("?" for _ in category_stores)
+            params: list[str] = []
+            for key, (category, pattern) in category_sources.items():
+                params.extend((key, category, pattern))
+            cursor = await self._db.execute(
+                f"""WITH missing_source(source_key, category, name_pattern) AS (VALUES {values})
+                    SELECT missing_source.source_key, lp.store_id,
+                           p.normalized_name, p.brand, p.size_display, MIN(lp.price_won) AS price_won
+                    FROM missing_source
+                    JOIN product_norm source
+                      ON source.product_norm_key = missing_source.source_key
+                     AND source.category = missing_source.category
+                    JOIN product_norm p
+                      ON p.category = source.category
+                     AND p.normalized_name LIKE missing_source.name_pattern
+                    JOIN latest_offline_price lp ON p.product_norm_key = lp.product_norm_key
+                    WHERE lp.store_id IN ({store_placeholders})
+                      AND p.product_norm_key != source.product_norm_key
+                    GROUP BY missing_source.source_key, lp.store_id""",
+                [*params, *sorted(category_stores)],
+            )
+            for row in await cursor.fetchall():
+                pair = (str(row["store_id"]), str(row["source_key"]))
+                if pair in needed and pair not in alternatives:
+                    alternatives[pair] = self._to_plan_alternative(dict(row), matched_by_key[pair[1]])
+            await cursor.close()
 
-        if not alternative:
-            return None
+        return alternatives
 
-        row = dict(alternative)
+    def _to_plan_alternative(self, row: dict, matched: MatchResult) -> PlanAlternative:
         return PlanAlternative(
             item_name=row.get("normalized_name") or matched.normalized_name,
             brand=row.get("brand"),
@@ -420,42 +841,101 @@ class OfflinePlanAdapter:
             reason="동일 카테고리 대체품",
         )
 
+    async def _estimate_routes(
+        self,
+        lat: float,
+        lng: float,
+        stores: list[dict],
+        travel_mode: str,
+        routing_provider: object | None = None,
+    ) -> tuple[list[RouteInfo], bool]:
+        """후보 매장 경로를 동시성 제한/마감 시간 안에서 병렬 조회. 마감을 넘긴 구간은 직선거리 대체."""
+        # 직선거리/ETA는 후보 매장 전체를 한 번에 계산해 두고, 경로 API 실패 시 대체값으로 쓴다
+        straight_estimates = estimate_travel_batch(
+            lat,
+            lng,
+            [(float(store["lat"]), float(store["lng"])) for store in stores],
+        )
+        straight_routes = [
+            RouteInfo(
+                distance_km=round(estimate.distance_km, 1),
+                travel_minutes=estimate.minutes(travel_mode),
+            )
+            for estimate in straight_estimates
+        ]
+        if not routing_provider or not stores:
+            return straight_routes, True
+
+        semaphore = asyncio.Semaphore(self._routing_concurrency)
+
+        async def estimate(store: dict, straight_distance_km: float) -> tuple[RouteInfo, bool]:
+            async with semaphore:
+                return await self._estimate_route(
+                    lat,
+                    lng,
+                    store,
+                    travel_mode=travel_mode,
+                    straight_distance_km=straight_distance_km,
+                    routing_provider=routing_provider,
+                )
+
+        tasks = [
+            asyncio.create_task(estimate(store, straight.distance_km))
+            for store, straight in zip(stores, straight_estimates)
+        ]
+        _, pending = await asyncio.wait(tasks, timeout=self._routing_deadline_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        routes: list[RouteInfo] = []
+        routing_degraded = False
+        for task, straight_route in zip(tasks, straight_routes):
+            if task in pending:
+                routes.append(straight_route)
+                routing_degraded = True
+                continue
+            route, route_degraded = task.result()
+            routes.append(route)
+            routing_degraded = routing_degraded or route_degraded
+        return routes, routing_degraded
+
     async def _estimate_route(
         self,
         origin_lat: float,
         origin_lng: float,
-        dest_lat: float,
-        dest_lng: float,
+        store: dict,
         travel_mode: str,
-        routing_provider: object | None = None,
+        straight_distance_km: float,
+        routing_provider: object,
     ) -> tuple[RouteInfo, bool]:
-        distance = haversine_km(origin_lat, origin_lng, dest_lat, dest_lng)
-        if routing_provider:
-            try:
-                route = await routing_provider.estimate_route(
-                    {"lat": origin_lat, "lng": origin_lng},
-                    {"lat": dest_lat, "lng": dest_lng},
-                    travel_mode,
+        distance = straight_distance_km
+        try:
+            route = await routing_provider.estimate_route(
+                {"lat": origin_lat, "lng": origin_lng},
+                {"lat": float(store["lat"]), "lng": float(store["lng"]), "store_id": store.get("store_id")},
+                travel_mode,
+            )
+            provider_distance = route.get("distance_km")
+            if isinstance(provider_distance, (float, int)):
+                distance = float(provider_distance)
+            provider_minutes = route.get("duration_min", route.get("travel_minutes"))
+            if isinstance(provider_minutes, (float, int)):
+                return (
+                    RouteInfo(
+                        distance_km=round(distance, 1),
+                        travel_minutes=max(1, int(round(float(provider_minutes)))),
+                    ),
+                    False,
                 )
-                provider_distance = route.get("distance_km")
-                if isinstance(provider_distance, (float, int)):
-                    distance = float(provider_distance)
-                provider_minutes = route.get("duration_min", route.get("travel_minutes"))
-                if isinstance(provider_minutes, (float, int)):
-                    return (
-                        RouteInfo(
-                            distance_km=round(distance, 1),
-                            travel_minutes=max(1, int(round(float(provider_minutes)))),
-                        ),
-                        False,
-                    )
-            except Exception:
-                pass
+        except Exception:
+            pass
 
         return (
             RouteInfo(
                 distance_km=round(distance, 1),
-                travel_minutes=self._estimate_offline_minutes(distance, travel_mode),
+                travel_minutes=estimate_travel_minutes(distance, travel_mode),
             ),
             True,
         )
@@ -539,18 +1019,6 @@ class OfflinePlanAdapter:
             return max_minutes * 15 / 60 * 1.5
         return max_minutes * 30 / 60 * 1.5
 
-    def _estimate_offline_minutes(self, distance_km: float, travel_mode: str) -> int:
-        normalized_mode = travel_mode.lower()
-        if normalized_mode == "walk":
-            # 평균 도보 속도(약 5km/h) 기준: 1km ≈ 12분
-            minutes = round(distance_km * 12)
-        elif normalized_mode == "transit":
-            # 대중교통 평균 15km/h + 대기시간 포함 근사
-            minutes = round(distance_km * 4)
-        else:
-            minutes = max(1, round(distance_km / 0.5))
-        return max(1, int(minutes))
-
     def _travel_mode_label(self, travel_mode: str) -> str:
         normalized_mode = travel_mode.lower()
         if normalized_mode == "transit":
@@ -615,32 +1083,27 @@ class OfflinePlanAdapter:
         unique_keys = list(dict.fromkeys(product_keys))
         placeholders = ",".join("?" for _ in unique_keys)
         cursor = await self._db.execute(
-            f"""SELECT product_norm_key, price_won
-                FROM offline_price_snapshot
-                WHERE product_norm_key IN ({placeholders})
-                  AND price_won > 0""",
+            f"""SELECT product_norm_key, lower_bound, upper_bound
+                FROM offline_price_guardrail
+                WHERE product_norm_key IN ({placeholders})""",
             unique_keys,
         )
         rows = await cursor.fetchall()
         await cursor.close()
+        return {
+            str(row["product_norm_key"]): (int(row["lower_bound"]), int(row["upper_bound"]))
+            for row in rows
+        }
 
-        prices_by_key: dict[str, list[int]] = {}
-        for row in rows:
-            key = str(row["product_norm_key"])
-            price = int(row["price_won"])
-            if price <= 0:
-                continue
-            prices_by_key.setdefault(key, []).append(price)
-
-        guardrails: dict[str, tuple[int, int]] = {}
-        for key, prices in prices_by_key.items():
-            if not prices:
-                continue
-            median_price = float(statistics.median(prices))
-            lower_bound = max(MIN_REASONABLE_OFFLINE_UNIT_PRICE, int(median_price * OFFLINE_OUTLIER_LOWER_RATIO))
-            upper_bound = max(lower_bound + 1, int(median_price * OFFLINE_OUTLIER_UPPER_RATIO))
-            guardrails[key] = (lower_bound, upper_bound)
-        return guardrails
+    def _has_valid_price(
+        self,
+        snap: Optional[dict],
+        product_norm_key: str,
+        guardrails: dict[str, tuple[int, int]],
+    ) -> bool:
+        return snap is not None and self._is_price_within_guardrail(
+            product_norm_key, int(snap["price_won"]), guardrails
+        )
 
     def _is_price_within_guardrail(
         self,
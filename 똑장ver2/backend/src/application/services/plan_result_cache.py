@@ -0,0 +1,125 @@
+"""플랜 생성 결과 캐시.
+
+장바구니 정규화 해시, 위치 격자, 이동수단/시간, 모드, 브랜드 선호를 키로 순위가 매겨진
+응답 본문을 보관한다. 카탈로그 동기화로 관련 상품 가격이 바뀌면 해당 항목만 무효화한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Generic, Iterable, Optional, Sequence, TypeVar
+
+from src.core.ttl_cache import BoundedTTLCache
+from src.domain.models.basket import BasketItem
+
+T = TypeVar("T")
+
+# 소수 셋째 자리 ≈ 100m 격자
+DEFAULT_GRID_DIGITS = 3
+
+
+@dataclass(frozen=True)
+class _CachedPlans(Generic[T]):
+    body: T
+    product_keys: frozenset[str]
+
+
+class PlanResultCache(Generic[T]):
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        degraded_ttl_seconds: float = 30.0,
+        grid_digits: int = DEFAULT_GRID_DIGITS,
+    ) -> None:
+        self._entries: BoundedTTLCache[str, _CachedPlans[T]] = BoundedTTLCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+        self._max_entries = max(1, int(max_entries))
+        self._degraded_ttl_seconds = max(0.0, float(degraded_ttl_seconds))
+        self._grid_digits = int(grid_digits)
+        # product_norm_key -> 그 상품이 들어간 캐시 키
+        self._keys_by_product: dict[str, set[str]] = {}
+        self._product_refs = 0
+        self._invalidations = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "PlanResultCache":
+        return cls(
+            max_entries=settings.plan_cache_max_entries,
+            ttl_seconds=settings.plan_cache_ttl_seconds,
+            degraded_ttl_seconds=settings.plan_cache_degraded_ttl_seconds,
+        )
+
+    def make_key(
+        self,
+        *,
+        items: Sequence[BasketItem],
+        lat: float,
+        lng: float,
+        travel_mode: str,
+        max_travel_minutes: int,
+        mode: str,
+        preferred_brands: Iterable[str] = (),
+        disliked_brands: Iterable[str] = (),
+    ) -> str:
+        basket = sorted(
+            json.dumps(item.model_dump(mode="json"), ensure_ascii=False, sort_keys=True) for item in items
+        )
+        payload = {
+            "basket": basket,
+            "cell": [round(float(lat), self._grid_digits), round(float(lng), self._grid_digits)],
+            "travel_mode": travel_mode,
+            "max_travel_minutes": int(max_travel_minutes),
+            "mode": mode,
+            "like": sorted(set(preferred_brands)),
+            "dislike": sorted(set(disliked_brands)),
+        }
+        raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[T]:
+        cached = self._entries.get(key)
+        return cached.value.body if cached is not None else None
+
+    def set(self, key: str, body: T, product_keys: Iterable[str] = (), degraded: bool = False) -> None:
+        keys = frozenset(product_keys)
+        ttl = self._degraded_ttl_seconds if degraded else None
+        self._entries.set(key, _CachedPlans(body=body, product_keys=keys), ttl_seconds=ttl)
+        for product_key in keys:
+            self._keys_by_product.setdefault(product_key, set()).add(key)
+        self._product_refs += len(keys)
+        if self._product_refs > self._max_entries * 4:
+            self._prune_product_index()
+
+    def invalidate_products(self, product_keys: Iterable[str]) -> int:
+        removed = 0
+        for product_key in set(product_keys):
+            keys = self._keys_by_product.pop(product_key, set())
+            self._product_refs -= len(keys)
+            for key in keys:
+                if self._entries.pop(key) is not None:
+                    removed += 1
+        self._invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_product.clear()
+        self._product_refs = 0
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "invalidations": self._invalidations}
+
+    def _prune_product_index(self) -> None:
+        # LRU/TTL로 빠진 캐시 키가 역색인에 쌓이지 않도록 정리
+        for product_key in list(self._keys_by_product):
+            live = {key for key in self._keys_by_product[product_key] if key in self._entries}
+            if live:
+                self._keys_by_product[product_key] = live
+            else:
+                del self._keys_by_product[product_key]
+        self._product_refs = sum(len(keys) for keys in self._keys_by_product.values())
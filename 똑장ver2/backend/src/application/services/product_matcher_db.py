@@ -5,15 +5,26 @@
 from __future__ import annotations
 
 import difflib
-import json
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Iterable, Optional
 
 import aiosqlite
 
+from src.application.services.product_search_index import (
+    ProductSearchIndex,
+    normalize_search_text,
+    parse_aliases,
+)
 from src.domain.models.basket import BasketItem
 
+_TOKEN_RE = re.compile(r"[0-9a-zA-Z가-힣]+")
+_SIZE_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(kg|g|mg|l|ml|ea|구|리터|밀리리터|모|포기|단)",
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class MatchResult:
@@ -25,18 +36,170 @@ class MatchResult:
     score: float
 
 
+@dataclass(frozen=True)
+class CandidateFeatures:
+    """후보 상품의 점수 계산용 사전 정규화 결과."""
+
+    name: str
+    aliases: tuple[str, ...]
+    tokens: frozenset[str]
+    brand: str
+    size: str
+    size_metric: Optional[tuple[float, str]]
+
+
+_FEATURE_CACHE_MAX = 4096
+_feature_cache: "OrderedDict[str, tuple[tuple[Any, ...], CandidateFeatures]]" = OrderedDict()
+
+
+def _tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    return [t.lower() for t in _TOKEN_RE.findall(text)]
+
+
+def _size_metric(text: Optional[str]) -> Optional[tuple[float, str]]:
+    if not text:
+        return None
+    match = _SIZE_RE.search(text)
+    if not match:
+        return None
+
+    value = float(match.group(1))
+    unit = match.group(2).lower()
+    if unit in {"kg"}:
+        return value * 1000.0, "g"
+    if unit in {"g"}:
+        return value, "g"
+    if unit in {"mg"}:
+        return value / 1000.0, "g"
+    if unit in {"l", "리터"}:
+        return value * 1000.0, "ml"
+    if unit in {"ml", "밀리리터"}:
+        return value, "ml"
+    if unit in {"ea", "구"}:
+        return value, "ea"
+    if unit in {"모"}:
+        return value, "tofu_block"
+    if unit in {"포기"}:
+        return value, "head"
+    if unit in {"단"}:
+        return value, "bundle"
+    return None
+
+
+def _build_features(row: dict) -> CandidateFeatures:
+    raw_aliases = parse_aliases(row.get("aliases_json"))
+    tokens = set(_tokenize(row.get("normalized_name")))
+    for alias in raw_aliases:
+        tokens.update(_tokenize(alias))
+    return CandidateFeatures(
+        name=normalize_search_text(row.get("normalized_name")),
+        aliases=tuple(normalize_search_text(a) for a in raw_aliases),
+        tokens=frozenset(tokens),
+        brand=normalize_search_text(row.get("brand")),
+        size=normalize_search_text(row.get("size_display")),
+        size_metric=_size_metric(row.get("size_display")),
+    )
+
+
+def get_candidate_features(row: dict) -> CandidateFeatures:
+    """product_norm 행의 feature를 캐시에서 조회(없거나 행이 바뀌었으면 새로 계산)."""
+    key = str(row.get("product_norm_key") or "")
+    signature = (
+        row.get("normalized_name"),
+        row.get("aliases_json"),
+        row.get("brand"),
+        row.get("size_display"),
+    )
+    cached = _feature_cache.get(key) if key else None
+    if cached is not None and cached[0] == signature:
+        _feature_cache.move_to_end(key)
+        return cached[1]
+
+    features = _build_features(row)
+    if key:
+        _feature_cache[key] = (signature, features)
+        _feature_cache.move_to_end(key)
+        while len(_feature_cache) > _FEATURE_CACHE_MAX:
+            _feature_cache.popitem(last=False)
+    return features
+
+
+def invalidate_candidate_features(keys: Optional[Iterable[str]] = None) -> None:
+    """카탈로그 동기화 후 호출. keys가 없으면 전체 무효화."""
+    if keys is None:
+        _feature_cache.clear()
+        return
+    for key in keys:
+        _feature_cache.pop(key, None)
+
+
+def _is_brand_match(candidate_brand: str, requested_brand: str) -> bool:
+    if not candidate_brand or not requested_brand:
+        return False
+    return candidate_brand == requested_brand or requested_brand in candidate_brand or candidate_brand in requested_brand
+
+
+def _is_size_match(
+    candidate_size: str,
+    candidate_metric: Optional[tuple[float, str]],
+    requested_size: str,
+    requested_metric: Optional[tuple[float, str]],
+) -> bool:
+    if not candidate_size or not requested_size:
+        return False
+    if candidate_metric and requested_metric:
+        c_value, c_unit = candidate_metric
+        r_value, r_unit = requested_metric
+        if c_unit != r_unit or r_value <= 0:
+            return False
+        return abs(c_value - r_value) / r_value <= 0.2
+    return candidate_size == requested_size
+
+
+@dataclass(frozen=True)
+class _QueryFeatures:
+    text: str
+    tokens: frozenset[str]
+    brand: str
+    size: str
+    size_metric: Optional[tuple[float, str]]
+    preferred: frozenset[str]
+    disliked: frozenset[str]
+
+    @classmethod
+    def build(
+        cls,
+        item: BasketItem,
+        preferred_brands: Optional[list[str]],
+        disliked_brands: Optional[list[str]],
+    ) -> "_QueryFeatures":
+        return cls(
+            text=normalize_search_text(item.item_name),
+            tokens=frozenset(_tokenize(item.item_name)),
+            brand=normalize_search_text(item.brand) if item.brand else "",
+            size=normalize_search_text(item.size) if item.size else "",
+            size_metric=_size_metric(item.size) if item.size else None,
+            preferred=frozenset(normalize_search_text(v) for v in (preferred_brands or []) if v),
+            disliked=frozenset(normalize_search_text(v) for v in (disliked_brands or []) if v),
+        )
+
+
 class ProductMatcherDB:
     """BasketItem을 product_norm_key에 매칭."""
 
     _MIN_MATCH_SCORE = 0.35
-    _TOKEN_RE = re.compile(r"[0-9a-zA-Z가-힣]+")
-    _SIZE_RE = re.compile(
-        r"(\d+(?:\.\d+)?)\s*(kg|g|mg|l|ml|ea|구|리터|밀리리터|모|포기|단)",
-        re.IGNORECASE,
-    )
+    # SQLite 복합 SELECT 항목 수 제한(기본 500) 이내로 나눠 조회
+    _PATTERNS_PER_QUERY = 100
 
-    def __init__(self, db: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        db: aiosqlite.Connection,
+        search_index: Optional[ProductSearchIndex] = None,
+    ) -> None:
         self._db = db
+        self._search_index = search_index
 
     async def match(
         self,
@@ -46,32 +209,63 @@ class ProductMatcherDB:
     ) -> Optional[MatchResult]:
         """BasketItem을 product_norm에서 검색 기반으로 매칭."""
         candidates = await self._fetch_candidates(item.item_name)
+        return self._pick_best(item, candidates, preferred_brands, disliked_brands)
+
+    async def match_many(
+        self,
+        items: list[BasketItem],
+        preferred_brands: Optional[list[str]] = None,
+        disliked_brands: Optional[list[str]] = None,
+    ) -> list[Optional[MatchResult]]:
+        """여러 품목을 한 번의 후보 조회로 매칭. 결과는 items 순서와 같다."""
+        candidates_by_query = await self._fetch_candidates_many([item.item_name for item in items])
+        return [
+            self._pick_best(item, candidates_by_query.get(item.item_name, []), preferred_brands, disliked_brands)
+            for item in items
+        ]
+
+    def _pick_best(
+        self,
+        item: BasketItem,
+        candidates: list[dict],
+        preferred_brands: Optional[list[str]],
+        disliked_brands: Optional[list[str]],
+    ) -> Optional[MatchResult]:
         if not candidates:
             return None
 
-        scored = sorted(
-            candidates,
-            key=lambda c: self._score_candidate(c, item, preferred_brands, disliked_brands),
-            reverse=True,
-        )
-        best = scored[0]
-        score = self._score_candidate(best, item, preferred_brands, disliked_brands)
+        # 후보별 점수는 질의당 한 번만 계산
+        query = _QueryFeatures.build(item, preferred_brands, disliked_brands)
+        scored: list[tuple[float, dict, CandidateFeatures]] = []
+        for candidate in candidates:
+            features = get_candidate_features(candidate)
+            scored.append((self._score_candidate(features, item, query), candidate, features))
+        scored.sort(key=lambda entry: entry[0], reverse=True)
+        score, best, _ = scored[0]
         if score < self._MIN_MATCH_SCORE:
             return None
 
         # 브랜드 지정 시 브랜드 우선
         if item.brand:
-            brand_filtered = [c for c in scored if self._is_brand_match(c.get("brand"), item.brand)]
-            if brand_filtered:
-                best = brand_filtered[0]
-                score = self._score_candidate(best, item, preferred_brands, disliked_brands)
+            brand_filtered = next(
+                (entry for entry in scored if _is_brand_match(entry[2].brand, query.brand)),
+                None,
+            )
+            if brand_filtered is not None:
+                score, best, _ = brand_filtered
 
         # 사이즈 지정 시 사이즈 우선
         if item.size:
-            size_filtered = [c for c in scored if self._is_size_match(c.get("size_display"), item.size)]
-            if size_filtered:
-                best = size_filtered[0]
-                score = self._score_candidate(best, item, preferred_brands, disliked_brands)
+            size_filtered = next(
+                (
+                    entry
+                    for entry in scored
+                    if _is_size_match(entry[2].size, entry[2].size_metric, query.size, query.size_metric)
+                ),
+                None,
+            )
+            if size_filtered is not None:
+                score, best, _ = size_filtered
 
         return MatchResult(
             product_norm_key=best["product_norm_key"],
@@ -83,146 +277,92 @@ class ProductMatcherDB:
         )
 
     async def _fetch_candidates(self, query: str) -> list[dict]:
-        tokens = [t for t in self._tokenize(query) if len(t) >= 2]
-        patterns = [query, *tokens[:3]]
-        seen: set[str] = set()
-        results: list[dict] = []
-
-        for pattern in patterns:
+        return (await self._fetch_candidates_many([query])).get(query, [])
+
+    async def _fetch_candidates_many(self, queries: list[str]) -> dict[str, list[dict]]:
+        unique_queries = list(dict.fromkeys(queries))
+        if self._search_index is not None and self._search_index.is_ready:
+            return {query: self._search_index.search(query) for query in unique_queries}
+
+        # (질의 순번, 패턴 순번, 패턴) — 패턴별 LIMIT 80을 UNION ALL 한 번으로 조회
+        patterns: list[tuple[int, int, str]] = []
+        for query_idx, query in enumerate(unique_queries):
+            tokens = [t for t in _tokenize(query) if len(t) >= 2]
+            for pattern_idx, pattern in enumerate([query, *tokens[:3]]):
+                patterns.append((query_idx, pattern_idx, pattern))
+
+        results: dict[str, list[dict]] = {query: [] for query in unique_queries}
+        seen: dict[str, set[str]] = {query: set() for query in unique_queries}
+        for offset in range(0, len(patterns), self._PATTERNS_PER_QUERY):
+            chunk = patterns[offset : offset + self._PATTERNS_PER_QUERY]
+            sql = " UNION ALL ".join(
+                """SELECT * FROM (
+                       SELECT ? AS _query_idx, ? AS _pattern_idx, * FROM product_norm
+                       WHERE normalized_name LIKE ? OR aliases_json LIKE ?
+                       ORDER BY normalized_name LIMIT 80
+                   )"""
+                for _ in chunk
+            )
+            params: list[Any] = []
+            for query_idx, pattern_idx, pattern in chunk:
+                params.extend((query_idx, pattern_idx, f"%{pattern}%", f"%{pattern}%"))
             rows = await self._db.execute(
-                """SELECT * FROM product_norm
-                   WHERE normalized_name LIKE ? OR aliases_json LIKE ?
-                   ORDER BY normalized_name LIMIT 80""",
-                (f"%{pattern}%", f"%{pattern}%"),
+                f"{sql} ORDER BY _query_idx, _pattern_idx, normalized_name",
+                params,
             )
             for row in await rows.fetchall():
                 row_dict = dict(row)
+                query = unique_queries[row_dict.pop("_query_idx")]
+                row_dict.pop("_pattern_idx", None)
                 key = row_dict["product_norm_key"]
-                if key in seen:
+                if key in seen[query]:
                     continue
-                seen.add(key)
-                results.append(row_dict)
+                seen[query].add(key)
+                results[query].append(row_dict)
 
-        if results:
+        if all(results.values()):
             return results
 
         rows = await self._db.execute("SELECT * FROM product_norm ORDER BY normalized_name LIMIT 200")
-        return [dict(row) for row in await rows.fetchall()]
+        fallback = [dict(row) for row in await rows.fetchall()]
+        for query, candidates in results.items():
+            if not candidates:
+                results[query] = fallback
+        return results
 
     def _score_candidate(
         self,
-        candidate: dict,
+        candidate: CandidateFeatures,
         item: BasketItem,
-        preferred_brands: Optional[list[str]] = None,
-        disliked_brands: Optional[list[str]] = None,
+        query: _QueryFeatures,
     ) -> float:
-        query = self._normalize(item.item_name)
-        name = self._normalize(candidate.get("normalized_name"))
-        aliases = [self._normalize(a) for a in self._parse_aliases(candidate.get("aliases_json"))]
+        text = query.text
+        name = candidate.name
+        aliases = candidate.aliases
 
-        name_sim = difflib.SequenceMatcher(None, query, name).ratio() if query and name else 0.0
-        alias_sim = max((difflib.SequenceMatcher(None, query, a).ratio() for a in aliases), default=0.0)
+        name_sim = difflib.SequenceMatcher(None, text, name).ratio() if text and name else 0.0
+        alias_sim = max((difflib.SequenceMatcher(None, text, a).ratio() for a in aliases), default=0.0)
         max_sim = max(name_sim, alias_sim)
 
-        query_tokens = set(self._tokenize(item.item_name))
-        text_tokens = set(self._tokenize(candidate.get("normalized_name")))
-        for alias in self._parse_aliases(candidate.get("aliases_json")):
-            text_tokens.update(self._tokenize(alias))
-        token_overlap = (len(query_tokens & text_tokens) / len(query_tokens)) if query_tokens else 0.0
+        token_overlap = (len(query.tokens & candidate.tokens) / len(query.tokens)) if query.tokens else 0.0
 
         contains_bonus = 0.0
-        if query and (query in name or any(query in a for a in aliases)):
+        if text and (text in name or any(text in a for a in aliases)):
             contains_bonus += 0.18
-        if name and query and name in query:
+        if name and text and name in text:
             contains_bonus += 0.1
 
         score = 0.55 * max_sim + 0.25 * token_overlap + contains_bonus
 
         if item.brand:
-            score += 0.25 if self._is_brand_match(candidate.get("brand"), item.brand) else -0.15
+            score += 0.25 if _is_brand_match(candidate.brand, query.brand) else -0.15
         if item.size:
-            score += 0.2 if self._is_size_match(candidate.get("size_display"), item.size) else -0.1
+            matched = _is_size_match(candidate.size, candidate.size_metric, query.size, query.size_metric)
+            score += 0.2 if matched else -0.1
 
-        candidate_brand = self._normalize(candidate.get("brand"))
-        preferred = {self._normalize(v) for v in (preferred_brands or []) if v}
-        disliked = {self._normalize(v) for v in (disliked_brands or []) if v}
-        if candidate_brand and preferred and candidate_brand in preferred:
+        if candidate.brand and query.preferred and candidate.brand in query.preferred:
             score += 0.12
-        if candidate_brand and disliked and candidate_brand in disliked:
+        if candidate.brand and query.disliked and candidate.brand in query.disliked:
             score -= 0.2
 
         return score
-
-    def _parse_aliases(self, aliases_raw: Optional[str]) -> list[str]:
-        if not aliases_raw:
-            return []
-        try:
-            parsed = json.loads(aliases_raw)
-            if isinstance(parsed, list):
-                return [str(v) for v in parsed if isinstance(v, str)]
-            return []
-        except (json.JSONDecodeError, TypeError):
-            return []
-
-    def _normalize(self, text: Optional[str]) -> str:
-        if not text:
-            return ""
-        lowered = text.lower()
-        return "".join(self._TOKEN_RE.findall(lowered))
-
-    def _tokenize(self, text: Optional[str]) -> list[str]:
-        if not text:
-            return []
-        return [t.lower() for t in self._TOKEN_RE.findall(text)]
-
-    def _is_brand_match(self, candidate_brand: Optional[str], requested_brand: str) -> bool:
-        c = self._normalize(candidate_brand)
-        r = self._normalize(requested_brand)
-        if not c or not r:
-            return False
-        return c == r or r in c or c in r
-
-    def _is_size_match(self, candidate_size: Optional[str], requested_size: str) -> bool:
-        c_norm = self._normalize(candidate_size)
-        r_norm = self._normalize(requested_size)
-        if not c_norm or not r_norm:
-            return False
-
-        c_metric = self._size_metric(candidate_size)
-        r_metric = self._size_metric(requested_size)
-        if c_metric and r_metric:
-            c_value, c_unit = c_metric
-            r_value, r_unit = r_metric
-            if c_unit != r_unit or r_value <= 0:
-                return False
-            return abs(c_value - r_value) / r_value <= 0.2
-        return c_norm == r_norm
-
-    def _size_metric(self, text: Optional[str]) -> Optional[tuple[float, str]]:
-        if not text:
-            return None
-        match = self._SIZE_RE.search(text)
-        if not match:
-            return None
-
-        value = float(match.group(1))
-        unit = match.group(2).lower()
-        if unit in {"kg"}:
-            return value * 1000.0, "g"
-        if unit in {"g"}:
-            return value, "g"
-        if unit in {"mg"}:
-            return value / 1000.0, "g"
-        if unit in {"l", "리터"}:
-            return value * 1000.0, "ml"
-        if unit in {"ml", "밀리리터"}:
-            return value, "ml"
-        if unit in {"ea", "구"}:
-            return value, "ea"
-        if unit in {"모"}:
-            return value, "tofu_block"
-        if unit in {"포기"}:
-            return value, "head"
-        if unit in {"단"}:
-            return value, "bundle"
-        return None
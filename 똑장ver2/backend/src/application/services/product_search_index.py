@@ -0,0 +1,173 @@
+"""product_norm 후보 검색용 인메모리 역색인.
+
+정규화된 품목명/별칭을 음절 bigram(1글자는 unigram)으로 쪼개 역색인을 만들고,
+질의 n-gram 커버리지 순으로 후보를 돌려준다. 한글은 음절 단위가 곧 의미 단위에
+가까워 형태소 분석 없이도 `LIKE '%...%'` 부분일치를 대체할 수 있다.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterable, Optional
+
+import aiosqlite
+
+_TOKEN_RE = re.compile(r"[0-9a-zA-Z가-힣]+")
+
+
+def normalize_search_text(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return "".join(_TOKEN_RE.findall(text.lower()))
+
+
+def parse_aliases(aliases_raw: Optional[str]) -> list[str]:
+    if not aliases_raw:
+        return []
+    try:
+        parsed = json.loads(aliases_raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(parsed, list):
+        return []
+    return [str(v) for v in parsed if isinstance(v, str)]
+
+
+def _ngrams(normalized: str) -> set[str]:
+    if not normalized:
+        return set()
+    if len(normalized) == 1:
+        return {normalized}
+    return {normalized[i : i + 2] for i in range(len(normalized) - 1)}
+
+
+def _index_terms(normalized: str) -> set[str]:
+    # 1글자 질의("파", "무")도 찾을 수 있도록 unigram을 함께 색인
+    return _ngrams(normalized) | set(normalized)
+
+
+class ProductSearchIndex:
+    """product_norm 이름/별칭 n-gram 역색인.
+
+    앱 시작 시 `rebuild()`로 전체 적재하고, 카탈로그 동기화가 product_norm을
+    upsert 하면 `upsert_rows()`로 증분 반영한다.
+    """
+
+    CANDIDATE_LIMIT = 120
+    FALLBACK_LIMIT = 200
+
+    def __init__(self) -> None:
+        self._rows: dict[str, dict[str, Any]] = {}
+        self._texts: dict[str, tuple[str, ...]] = {}
+        self._terms: dict[str, set[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._sorted_keys: list[str] | None = None
+        self.is_ready = False
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    async def rebuild(self, db: aiosqlite.Connection) -> int:
+        cursor = await db.execute("SELECT * FROM product_norm")
+        rows = await cursor.fetchall()
+        await cursor.close()
+
+        self._rows.clear()
+        self._texts.clear()
+        self._terms.clear()
+        self._postings.clear()
+        self._sorted_keys = None
+        self.upsert_rows(dict(row) for row in rows)
+        self.is_ready = True
+        return len(self._rows)
+
+    def upsert_rows(self, rows: Iterable[dict[str, Any]]) -> int:
+        count = 0
+        for row in rows:
+            key = str(row.get("product_norm_key") or "")
+            if not key:
+                continue
+            self._unlink(key)
+
+            texts = tuple(
+                text
+                for text in (
+                    normalize_search_text(row.get("normalized_name")),
+                    *(normalize_search_text(alias) for alias in parse_aliases(row.get("aliases_json"))),
+                )
+                if text
+            )
+            terms: set[str] = set()
+            for text in texts:
+                terms |= _index_terms(text)
+            for term in terms:
+                self._postings.setdefault(term, set()).add(key)
+
+            self._rows[key] = dict(row)
+            self._texts[key] = texts
+            self._terms[key] = terms
+            count += 1
+
+        if count:
+            self._sorted_keys = None
+        return count
+
+    def remove(self, product_norm_key: str) -> None:
+        if self._unlink(product_norm_key):
+            self._sorted_keys = None
+
+    def get(self, product_norm_key: str) -> Optional[dict[str, Any]]:
+        return self._rows.get(product_norm_key)
+
+    def search(self, query: str, limit: int = CANDIDATE_LIMIT) -> list[dict[str, Any]]:
+        """질의 n-gram 커버리지 내림차순 후보 목록. 적중이 없으면 이름순 상위 N개."""
+        normalized = normalize_search_text(query)
+        query_terms = _ngrams(normalized)
+        if not query_terms:
+            return self._fallback()
+
+        hits: dict[str, int] = {}
+        for term in query_terms:
+            for key in self._postings.get(term, ()):
+                hits[key] = hits.get(key, 0) + 1
+        if not hits:
+            return self._fallback()
+
+        total = len(query_terms)
+
+        def rank(key: str) -> tuple[float, int, int, str]:
+            texts = self._texts.get(key, ())
+            contains = any(normalized in text for text in texts)
+            # 같은 커버리지라면 더 짧은(질의에 가까운) 이름을 먼저: "우유" > "딸기우유"
+            shortest = min((len(text) for text in texts), default=0)
+            return (
+                -(hits[key] / total),
+                0 if contains else 1,
+                shortest,
+                str(self._rows[key].get("normalized_name") or ""),
+            )
+
+        ranked = sorted(hits, key=rank)
+        return [self._rows[key] for key in ranked[: max(1, limit)]]
+
+    def _fallback(self) -> list[dict[str, Any]]:
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(
+                self._rows,
+                key=lambda key: str(self._rows[key].get("normalized_name") or ""),
+            )
+        return [self._rows[key] for key in self._sorted_keys[: self.FALLBACK_LIMIT]]
+
+    def _unlink(self, key: str) -> bool:
+        if key not in self._rows:
+            return False
+        for term in self._terms.pop(key, set()):
+            bucket = self._postings.get(term)
+            if bucket is None:
+                continue
+            bucket.discard(key)
+            if not bucket:
+                self._postings.pop(term, None)
+        self._rows.pop(key, None)
+        self._texts.pop(key, None)
+        return True
@@ -10,6 +10,14 @@ from typing import Any, Sequence
 import aiosqlite
 import httpx
 
+from src.application.services.offline_plan_adapter import CandidateWorkingSetStore
+from src.application.services.plan_result_cache import PlanResultCache
+from src.application.services.product_matcher_db import invalidate_candidate_features
+from src.application.services.product_search_index import ProductSearchIndex
+from src.application.services.store_spatial_index import StoreSpatialIndex
+from src.infrastructure.persistence.connection_pool import SqliteConnectionPool
+from src.infrastructure.persistence.latest_offline_price import refresh_latest_offline_prices
+
 logger = logging.getLogger(__name__)
 
 KAMIS_ENDPOINT = "https://www.kamis.or.kr/service/price/xml.do"
@@ -18,6 +26,17 @@ PUBLIC_DATA_BRAND = "참가격"
 _PLACEHOLDER_PREFIX = "__SET_IN_SECRET_MANAGER__"
 _NON_DIGIT = re.compile(r"[^0-9]")
 _UNIT_PARSER = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)\s*([a-zA-Z가-힣]+)\s*$")
+_PRODUCT_COLUMNS = (
+    "product_norm_key",
+    "normalized_name",
+    "brand",
+    "size_value",
+    "size_unit",
+    "size_display",
+    "category",
+    "aliases_json",
+    "updated_at",
+)
 
 
 @dataclass(frozen=True)
@@ -161,11 +180,23 @@ class PublicCatalogSyncService:
         cert_key: str,
         cert_id: str,
         timeout_seconds: float = 12.0,
+        search_index: ProductSearchIndex | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        plan_cache: PlanResultCache | None = None,
+        working_sets: CandidateWorkingSetStore | None = None,
+        pool: SqliteConnectionPool | None = None,
+        store_index: StoreSpatialIndex | None = None,
     ) -> None:
         self._db = db
+        self._pool = pool
+        self._store_index = store_index
+        self._http_client = http_client
         self._cert_key = cert_key
         self._cert_id = cert_id
         self._timeout_seconds = max(3.0, float(timeout_seconds))
+        self._search_index = search_index
+        self._plan_cache = plan_cache
+        self._working_sets = working_sets
 
     @property
     def is_configured(self) -> bool:
@@ -189,9 +220,15 @@ class PublicCatalogSyncService:
                 "errors": [],
             }
 
-        store_rows = await self._db.execute("SELECT store_id FROM store_master WHERE is_active = 1")
-        stores = [str(row["store_id"]) for row in await store_rows.fetchall()]
+        store_rows = await self._db.execute("SELECT * FROM store_master WHERE is_active = 1")
+        active_stores = [dict(row) for row in await store_rows.fetchall()]
         await store_rows.close()
+        stores = [str(row["store_id"]) for row in active_stores]
+        if self._store_index is not None:
+            # 매장 추가·비활성화가 플랜 후보 검색(공간 색인)에 반영되도록 동기화 때마다 맞춘다
+            changed_stores = self._store_index.reconcile(active_stores)
+            if changed_stores:
+                self._invalidate_store_plans(changed_stores)
         if not stores:
             return {
                 "status": "skipped",
@@ -207,17 +244,16 @@ class PublicCatalogSyncService:
         fetched_items: list[KamisItem] = []
         errors: list[str] = []
 
-        async with httpx.AsyncClient(timeout=self._timeout_seconds) as client:
-            tasks = [
-                self._fetch_category_safe(client=client, category_code=category)
-                for category in normalized_categories
-            ]
-            results = await asyncio.gather(*tasks)
-            for category_code, category_items, error in results:
-                if error:
-                    errors.append(f"{category_code}:{error}")
-                    continue
-                fetched_items.extend(category_items)
+        if self._http_client is not None:
+            results = await self._fetch_categories(self._http_client, normalized_categories)
+        else:
+            async with httpx.AsyncClient(timeout=self._timeout_seconds) as client:
+                results = await self._fetch_categories(client, normalized_categories)
+        for category_code, category_items, error in results:
+            if error:
+                errors.append(f"{category_code}:{error}")
+                continue
+            fetched_items.extend(category_items)
 
         if not fetched_items:
             return {
@@ -246,37 +282,77 @@ class PublicCatalogSyncService:
             observed_date=observed_date,
         )
 
-        await self._db.execute("BEGIN")
-        try:
-            await self._db.executemany(
+        await self._write_catalog(product_rows, snapshot_rows)
+
+        invalidate_candidate_features(row[0] for row in product_rows)
+        if self._search_index is not None:
+            self._search_index.upsert_rows(dict(zip(_PRODUCT_COLUMNS, row)) for row in product_rows)
+        changed_products = {row[2] for row in snapshot_rows} | {row[0] for row in product_rows}
+        if self._plan_cache is not None:
+            self._plan_cache.invalidate_products(changed_products)
+        if self._working_sets is not None:
+            self._working_sets.invalidate_products(changed_products)
+
+        status = "ok" if not errors else "partial"
+        return {
+            "status": status,
+            "reason": None if status == "ok" else "Some categories failed",
+            "categories": normalized_categories,
+            "fetched_items": len(fetched_items),
+            "upserted_products": len(product_rows),
+            "upserted_snapshots": len(snapshot_rows),
+            "stores": len(stores),
+            "errors": errors,
+            "observed_at": observed_at,
+        }
+
+    def _invalidate_store_plans(self, store_ids: set[str]) -> None:
+        # 캐시된 플랜·작업 집합은 상품 키로만 색인돼 있고, 새로 생긴 매장은 어느 항목에도 없으므로 모두 버린다
+        logger.info("매장 변경 %s건 → 플랜 캐시/작업 집합 초기화", len(store_ids))
+        if self._plan_cache is not None:
+            self._plan_cache.clear()
+        if self._working_sets is not None:
+            self._working_sets.clear()
+
+    async def _write_catalog(self, product_rows: list[tuple], snapshot_rows: list[tuple]) -> None:
+        async def op(db: aiosqlite.Connection) -> None:
+            await db.executemany(
                 """INSERT OR REPLACE INTO product_norm
                    (product_norm_key, normalized_name, brand, size_value, size_unit, size_display, category, aliases_json, updated_at)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 product_rows,
             )
-            await self._db.executemany(
+            await db.executemany(
                 """INSERT OR REPLACE INTO offline_price_snapshot
                    (price_snapshot_key, store_id, product_norm_key, price_won, observed_at, source, notice, created_at)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
                 snapshot_rows,
             )
+            await refresh_latest_offline_prices(db, (row[2] for row in snapshot_rows))
+
+        if self._pool is not None:
+            # 공유 writer 연결은 큐로만 쓴다 (같은 배치의 다른 쓰기와 원자성 유지)
+            await self._pool.write(op)
+            return
+
+        await self._db.execute("BEGIN")
+        try:
+            await op(self._db)
             await self._db.commit()
         except Exception:
             await self._db.rollback()
             raise
 
-        status = "ok" if not errors else "partial"
-        return {
-            "status": status,
-            "reason": None if status == "ok" else "Some categories failed",
-            "categories": normalized_categories,
-            "fetched_items": len(fetched_items),
-            "upserted_products": len(product_rows),
-            "upserted_snapshots": len(snapshot_rows),
-            "stores": len(stores),
-            "errors": errors,
-            "observed_at": observed_at,
-        }
+    async def _fetch_categories(
+        self,
+        client: httpx.AsyncClient,
+        category_codes: list[str],
+    ) -> list[tuple[str, list[KamisItem], str | None]]:
+        tasks = [
+            self._fetch_category_safe(client=client, category_code=category)
+            for category in category_codes
+        ]
+        return list(await asyncio.gather(*tasks))
 
     async def _fetch_category_safe(
         self,
@@ -307,7 +383,7 @@ class PublicCatalogSyncService:
             "p_category_code": category_code,
             "p_regday": regday,
         }
-        response = await client.get(KAMIS_ENDPOINT, params=params)
+        response = await client.get(KAMIS_ENDPOINT, params=params, timeout=self._timeout_seconds)
         response.raise_for_status()
         payload = response.json()
 
@@ -1,10 +1,36 @@
 """랭킹 엔진 — Top3 플랜 선정 (TRD 12절 기반)."""
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Callable, List, NamedTuple, Optional, Sequence
 
 from src.domain.models.plan import Plan, PlanType
 
+_UNKNOWN_TRAVEL_MINUTES = 999
+
+
+class _Candidate(NamedTuple):
+    """순위 계산용 경량 레코드. `index`는 입력 후보 목록의 위치(동점 시 먼저 온 후보 우선).
+
+    지배 관계: 가격·이동시간·커버리지가 모두 같거나 낫고, 가격/이동시간/커버 품목 수 중 하나는
+    엄격히 나은 후보. 지배당한 후보는 Cheapest/Nearest/Balanced 어느 기준으로도 1위가 될 수 없다.
+    """
+
+    total: int
+    travel: int
+    coverage: int
+    ratio: float
+    index: int
+    mart: str
+
+
+class _Ranges(NamedTuple):
+    price_min: int
+    price_range: int
+    travel_min: int
+    travel_range: int
+    cov_min: float
+    cov_range: float
+
 
 class RankingEngine:
     """3종 플랜(Cheapest/Nearest/Balanced) 정책으로 Top3 선정."""
@@ -19,110 +45,150 @@ class RankingEngine:
         수집된 플랜 후보군에서 Cheapest / Nearest / Balanced Top3 선정.
 
         1. 커버리지 필터 (60%, 부족 시 40%)
-        2. 각 유형별 최적 1개 선정
-        3. BALANCED가 다른 유형과 매장 중복 시 차선책 교체
-        """
-        if not candidates:
-            return []
+        2. 가격·이동시간·커버리지 파레토 프런티어를 한 번에 계산
+        3. 프런티어에서 유형별 최적 1개 선정
+        4. BALANCED가 다른 유형과 매장 중복 시 남은 매장 중 균형 점수 최고로 교체
 
+        후보는 경량 레코드로만 비교하고, Plan 복사본은 최종 Top3만 만든다.
+        """
         # 1) 커버리지 필터
-        filtered = self._filter_by_coverage(candidates, self.MIN_COVERAGE)
-        if len(filtered) < 3:
-            filtered = self._filter_by_coverage(candidates, self.FALLBACK_MIN_COVERAGE)
-        if not filtered:
+        rows = self._filter_by_coverage(candidates)
+        if not rows:
             return []
 
-        # 2) 유형별 최적 선정
-        cheapest = self._pick_cheapest(filtered)
-        nearest = self._pick_nearest(filtered)
-        balanced = self._pick_balanced(filtered)
+        # 2) 프런티어 + 균형 점수 정규화 범위
+        frontier, ranges = self._pareto_frontier(rows)
+        score = self._balanced_scorer(ranges)
+
+        # 3) 유형별 최적 선정 (동점이면 입력 순서가 앞선 후보)
+        cheapest = min(frontier, key=lambda r: (r.total, -r.coverage, r.travel, r.index))
+        nearest = min(frontier, key=lambda r: (r.travel, r.total, -r.coverage, r.index))
+        balanced = min(frontier, key=lambda r: (score(r), r.index))
 
-        # 3) 결과 조립 + 중복 제거
-        result = []
-        if cheapest:
-            result.append(cheapest)
-        if nearest:
-            result.append(nearest)
-        if balanced:
-            balanced = self._deduplicate(balanced, result, filtered)
-            if balanced:
-                result.append(balanced)
+        # 4) 중복 제거
+        taken_marts = {cheapest.mart, nearest.mart}
+        if balanced.mart in taken_marts:
+            balanced = self._runner_up(rows, taken_marts, score) or balanced
 
-        return result[:3]
+        return [
+            self._materialize(candidates, cheapest, PlanType.CHEAPEST, "최저가"),
+            self._materialize(candidates, nearest, PlanType.NEAREST, "가까움"),
+            self._materialize(candidates, balanced, PlanType.BALANCED, "추천"),
+        ]
 
     # ── private ─────────────────────────────────────────────────────
 
-    @staticmethod
-    def _filter_by_coverage(candidates: List[Plan], min_ratio: float) -> List[Plan]:
-        return [p for p in candidates if p.coverage_ratio >= min_ratio]
+    def _filter_by_coverage(self, candidates: Sequence[Plan]) -> list[tuple]:
+        """커버리지 필터 (60%, 부족 시 40%)를 한 번에 적용. `_Candidate` 필드 순서의 튜플을 돌려준다."""
+        rows: list[tuple] = []
+        strict_count = 0
+        fallback_min = self.FALLBACK_MIN_COVERAGE
+        strict_min = self.MIN_COVERAGE
+        for index, plan in enumerate(candidates):
+            ratio = plan.coverage_ratio
+            if ratio < fallback_min:
+                continue
+            if ratio >= strict_min:
+                strict_count += 1
+            rows.append(
+                (
+                    plan.estimated_total,
+                    plan.travel_minutes or _UNKNOWN_TRAVEL_MINUTES,
+                    plan.coverage,
+                    ratio,
+                    index,
+                    plan.mart_name,
+                )
+            )
+        if strict_count >= 3:
+            return [row for row in rows if row[3] >= strict_min]
+        return rows
 
     @staticmethod
-    def _pick_cheapest(candidates: List[Plan]) -> Optional[Plan]:
-        """total_price ASC → coverage DESC → travel_minutes ASC."""
-        if not candidates:
-            return None
-        best = sorted(
-            candidates,
-            key=lambda p: (p.estimated_total, -p.coverage, p.travel_minutes or 999),
-        )
-        plan = best[0].model_copy(update={"plan_type": PlanType.CHEAPEST, "badges": ["최저가"]})
-        return plan
+    def _pareto_frontier(rows: list[tuple]) -> tuple[list[_Candidate], _Ranges]:
+        """한 번 훑으며 비지배 후보(BNL 윈도)와 가격/이동시간/커버리지 최소·최대를 함께 구한다.
 
-    @staticmethod
-    def _pick_nearest(candidates: List[Plan]) -> Optional[Plan]:
-        """travel_minutes ASC → total_price ASC → coverage DESC."""
-        if not candidates:
-            return None
-        best = sorted(
-            candidates,
-            key=lambda p: (p.travel_minutes or 999, p.estimated_total, -p.coverage),
+        후보 수만큼 도는 루프라 지배 판정을 함수로 빼지 않고 비교를 풀어 쓴다.
+        """
+        price_min = price_max = rows[0][0]
+        travel_min = travel_max = rows[0][1]
+        cov_min = cov_max = rows[0][3]
+        window: list[tuple] = []
+        for row in rows:
+            total, travel, coverage, ratio = row[0], row[1], row[2], row[3]
+            if total < price_min:
+                price_min = total
+            elif total > price_max:
+                price_max = total
+            if travel < travel_min:
+                travel_min = travel
+            elif travel > travel_max:
+                travel_max = travel
+            if ratio < cov_min:
+                cov_min = ratio
+            elif ratio > cov_max:
+                cov_max = ratio
+
+            dominated = False
+            for kept in window:
+                if (
+                    kept[0] <= total
+                    and kept[1] <= travel
+                    and kept[2] >= coverage
+                    and kept[3] >= ratio
+                    and (kept[0] < total or kept[1] < travel or kept[2] > coverage)
+                ):
+                    dominated = True
+                    break
+            if dominated:
+                continue
+            window = [
+                kept
+                for kept in window
+                if not (
+                    total <= kept[0]
+                    and travel <= kept[1]
+                    and coverage >= kept[2]
+                    and ratio >= kept[3]
+                    and (total < kept[0] or travel < kept[1] or coverage > kept[2])
+                )
+            ]
+            window.append(row)
+
+        ranges = _Ranges(
+            price_min=price_min,
+            price_range=price_max - price_min or 1,
+            travel_min=travel_min,
+            travel_range=travel_max - travel_min or 1,
+            cov_min=cov_min,
+            cov_range=cov_max - cov_min or 1,
         )
-        plan = best[0].model_copy(update={"plan_type": PlanType.NEAREST, "badges": ["가까움"]})
-        return plan
+        return [_Candidate._make(row) for row in window], ranges
 
-    def _pick_balanced(self, candidates: List[Plan]) -> Optional[Plan]:
+    @staticmethod
+    def _balanced_scorer(ranges: _Ranges) -> Callable[[tuple], float]:
         """0.5*norm_price + 0.3*norm_travel - 0.2*norm_coverage (낮을수록 좋음)."""
-        if not candidates:
-            return None
 
-        prices = [p.estimated_total for p in candidates]
-        travels = [p.travel_minutes or 999 for p in candidates]
-        coverages = [p.coverage_ratio for p in candidates]
-
-        price_min, price_max = min(prices), max(prices)
-        travel_min, travel_max = min(travels), max(travels)
-        cov_min, cov_max = min(coverages), max(coverages)
-        price_range = price_max - price_min or 1
-        travel_range = travel_max - travel_min or 1
-        cov_range = cov_max - cov_min or 1
-
-        scored: list[tuple[float, Plan]] = []
-        for p in candidates:
-            norm_price = (p.estimated_total - price_min) / price_range
-            norm_travel = ((p.travel_minutes or 999) - travel_min) / travel_range
-            norm_cov = (p.coverage_ratio - cov_min) / cov_range
-            score = 0.5 * norm_price + 0.3 * norm_travel - 0.2 * norm_cov
-            scored.append((score, p))
-
-        scored.sort(key=lambda x: x[0])
-        plan = scored[0][1].model_copy(update={"plan_type": PlanType.BALANCED, "badges": ["추천"]})
-        return plan
+        def score(record: tuple) -> float:
+            norm_price = (record[0] - ranges.price_min) / ranges.price_range
+            norm_travel = (record[1] - ranges.travel_min) / ranges.travel_range
+            norm_cov = (record[3] - ranges.cov_min) / ranges.cov_range
+            return 0.5 * norm_price + 0.3 * norm_travel - 0.2 * norm_cov
+
+        return score
+
+    @staticmethod
+    def _runner_up(
+        rows: list[tuple],
+        taken_marts: set[str],
+        score: Callable[[tuple], float],
+    ) -> Optional[_Candidate]:
+        """선정된 매장을 뺀 나머지 중 균형 점수 최소 후보 (= 남은 후보 프런티어의 최적점)."""
+        remaining = [row for row in rows if row[5] not in taken_marts]
+        if not remaining:
+            return None
+        return _Candidate._make(min(remaining, key=lambda row: (score(row), row[4])))
 
     @staticmethod
-    def _deduplicate(
-        balanced: Plan,
-        existing: List[Plan],
-        candidates: List[Plan],
-    ) -> Optional[Plan]:
-        """BALANCED가 기존 선정 결과와 같은 매장이면 차선책으로 교체."""
-        existing_marts = {p.mart_name for p in existing}
-        if balanced.mart_name not in existing_marts:
-            return balanced
-
-        # 차선책 검색
-        for p in candidates:
-            if p.mart_name not in existing_marts and p.mart_name != balanced.mart_name:
-                return p.model_copy(update={"plan_type": PlanType.BALANCED, "badges": ["추천"]})
-
-        # 대안 없으면 그냥 반환
-        return balanced
+    def _materialize(candidates: Sequence[Plan], record: _Candidate, plan_type: PlanType, badge: str) -> Plan:
+        return candidates[record.index].model_copy(update={"plan_type": plan_type, "badges": [badge]})
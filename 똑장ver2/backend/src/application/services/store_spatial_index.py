@@ -0,0 +1,140 @@
+"""활성 매장(store_master) 균일 격자 공간 색인.
+
+위경도를 고정 크기 격자 셀로 나눠 매장을 담아 두고, 반경 질의 시 반경을 덮는
+셀만 훑어 haversine 거리순으로 돌려준다. 전국 단위로 매장이 늘어도 질의 비용은
+주변 셀의 매장 수에만 비례한다.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Iterable
+
+import aiosqlite
+
+from src.application.services.geo import haversine_km
+
+_KM_PER_LAT_DEGREE = 111.0
+
+
+class StoreSpatialIndex:
+    """store_master 활성 매장 k-최근접(반경 내) 질의용 격자 색인.
+
+    앱 시작 시 `rebuild()`로 적재하고, 매장 정보가 바뀌면 `upsert_rows()`/`remove()`로
+    증분 반영한다. 카탈로그 동기화는 읽어 온 활성 매장 목록으로 `reconcile()`한다.
+    """
+
+    CELL_DEGREES = 0.01  # 위도 기준 약 1.1km
+
+    def __init__(self, cell_degrees: float = CELL_DEGREES) -> None:
+        self._cell_degrees = cell_degrees
+        self._stores: dict[str, dict[str, Any]] = {}
+        self._cell_of: dict[str, tuple[int, int]] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self.is_ready = False
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    async def rebuild(self, db: aiosqlite.Connection) -> int:
+        cursor = await db.execute("SELECT * FROM store_master WHERE is_active = 1")
+        rows = await cursor.fetchall()
+        await cursor.close()
+
+        self._stores.clear()
+        self._cell_of.clear()
+        self._cells.clear()
+        self.upsert_rows(dict(row) for row in rows)
+        self.is_ready = True
+        return len(self._stores)
+
+    def upsert_rows(self, rows: Iterable[dict[str, Any]]) -> int:
+        count = 0
+        for row in rows:
+            store_id = str(row.get("store_id") or "")
+            if not store_id:
+                continue
+            self.remove(store_id)
+            if not int(row.get("is_active", 1) or 0):
+                continue
+            try:
+                lat = float(row["lat"])
+                lng = float(row["lng"])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            cell = self._cell(lat, lng)
+            self._stores[store_id] = dict(row)
+            self._cell_of[store_id] = cell
+            self._cells.setdefault(cell, set()).add(store_id)
+            count += 1
+        return count
+
+    def reconcile(self, rows: Iterable[dict[str, Any]]) -> set[str]:
+        """활성 매장 전체 목록에 맞춘다. 바뀐(추가·삭제·정보 변경) 매장 ID를 돌려준다."""
+        active = {str(row.get("store_id") or ""): dict(row) for row in rows}
+        active.pop("", None)
+        changed = {store_id for store_id in self._stores if store_id not in active}
+        for store_id in changed:
+            self.remove(store_id)
+        updated = {store_id for store_id, row in active.items() if self._stores.get(store_id) != row}
+        self.upsert_rows(active[store_id] for store_id in updated)
+        self.is_ready = True
+        return changed | updated
+
+    def remove(self, store_id: str) -> None:
+        cell = self._cell_of.pop(store_id, None)
+        self._stores.pop(store_id, None)
+        if cell is None:
+            return
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            return
+        bucket.discard(store_id)
+        if not bucket:
+            self._cells.pop(cell, None)
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        limit: int,
+    ) -> list[tuple[dict[str, Any], float]]:
+        """반경 내 매장을 (매장 row, 거리 km) 거리 오름차순으로 최대 limit개."""
+        if radius_km <= 0 or limit <= 0 or not self._stores:
+            return []
+
+        lat_span = radius_km / _KM_PER_LAT_DEGREE
+        cos_lat = max(math.cos(math.radians(lat)), 0.01)
+        lng_span = radius_km / (_KM_PER_LAT_DEGREE * cos_lat)
+        min_cell = self._cell(lat - lat_span, lng - lng_span)
+        max_cell = self._cell(lat + lat_span, lng + lng_span)
+
+        found: list[tuple[float, str]] = []
+        cell_count = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if cell_count > len(self._cells):
+            # 반경이 색인 전체보다 넓으면 셀 순회 대신 비어있지 않은 셀만 확인
+            cells = [
+                cell
+                for cell in self._cells
+                if min_cell[0] <= cell[0] <= max_cell[0] and min_cell[1] <= cell[1] <= max_cell[1]
+            ]
+        else:
+            cells = [
+                (cell_lat, cell_lng)
+                for cell_lat in range(min_cell[0], max_cell[0] + 1)
+                for cell_lng in range(min_cell[1], max_cell[1] + 1)
+            ]
+
+        for cell in cells:
+            for store_id in self._cells.get(cell, ()):
+                store = self._stores[store_id]
+                distance = haversine_km(lat, lng, float(store["lat"]), float(store["lng"]))
+                if distance <= radius_km:
+                    found.append((distance, store_id))
+
+        found.sort()
+        return [(self._stores[store_id], distance) for distance, store_id in found[:limit]]
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return (math.floor(lat / self._cell_degrees), math.floor(lng / self._cell_degrees))
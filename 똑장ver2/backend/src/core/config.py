@@ -42,6 +42,13 @@ class Settings:
     # DB (MAIN_DB_PATH 우선, 기존 DB_PATH fallback)
     db_path: str = os.getenv("MAIN_DB_PATH") or os.getenv("DB_PATH", str(_DATA_DIR / "main.db"))
     cache_db_path: str = os.getenv("CACHE_DB_PATH", str(_DATA_DIR / "cache.db"))
+    db_read_pool_size: int = int(os.getenv("DB_READ_POOL_SIZE", "4"))
+    db_write_batch_size: int = int(os.getenv("DB_WRITE_BATCH_SIZE", "64"))
+    db_commit_window_ms: float = float(os.getenv("DB_COMMIT_WINDOW_MS", "2"))
+    db_synchronous: str = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    db_cache_size_kib: int = int(os.getenv("DB_CACHE_SIZE_KIB", "16384"))
+    db_mmap_size_bytes: int = int(os.getenv("DB_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+    db_busy_timeout_ms: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
 
     # Auth / Session
     jwt_secret: str = os.getenv("JWT_SECRET", "dev-insecure-secret-change-me")
@@ -57,6 +64,10 @@ class Settings:
     # LLM
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-5-mini")
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+    llm_cache_ttl_seconds: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(6 * 3600)))
+    llm_request_timeout_seconds: float = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "30"))
 
     # 네이버 API (쇼핑 + Local)
     naver_client_id: str = os.getenv("NAVER_CLIENT_ID", "")
@@ -83,8 +94,32 @@ class Settings:
     # 캐시 TTL (초)
     cache_ttl_place: int = int(os.getenv("CACHE_TTL_PLACE", "1800"))
     cache_ttl_route_car: int = int(os.getenv("CACHE_TTL_ROUTE_CAR", "600"))
+    cache_ttl_route_default: int = int(os.getenv("CACHE_TTL_ROUTE_DEFAULT", "3600"))
     cache_ttl_weather: int = int(os.getenv("CACHE_TTL_WEATHER", "1800"))
+    cache_memory_max_entries: int = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", "2048"))
+    cache_memory_max_bytes: int = int(os.getenv("CACHE_MEMORY_MAX_BYTES", str(4 * 1024 * 1024)))
+    cache_flush_interval_seconds: float = float(os.getenv("CACHE_FLUSH_INTERVAL_SECONDS", "0.5"))
+    cache_flush_max_pending: int = int(os.getenv("CACHE_FLUSH_MAX_PENDING", "256"))
+    cache_sweep_interval_seconds: float = float(os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "300"))
+    cache_sweep_batch_size: int = int(os.getenv("CACHE_SWEEP_BATCH_SIZE", "500"))
+    auth_session_cache_ttl_seconds: float = float(os.getenv("AUTH_SESSION_CACHE_TTL_SECONDS", "30"))
+    auth_session_cache_max_entries: int = int(os.getenv("AUTH_SESSION_CACHE_MAX_ENTRIES", "10000"))
+    auth_touch_flush_interval_seconds: float = float(os.getenv("AUTH_TOUCH_FLUSH_INTERVAL_SECONDS", "15"))
+    basket_cache_max_entries: int = int(os.getenv("BASKET_CACHE_MAX_ENTRIES", "10000"))
+    basket_update_max_retries: int = int(os.getenv("BASKET_UPDATE_MAX_RETRIES", "3"))
+    chat_history_max_messages: int = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", "40"))
+    chat_history_cache_max_users: int = int(os.getenv("CHAT_HISTORY_CACHE_MAX_USERS", "5000"))
+    chat_context_max_tokens: int = int(os.getenv("CHAT_CONTEXT_MAX_TOKENS", "1200"))
+    chat_summary_max_tokens: int = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "200"))
+    plan_cache_max_entries: int = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1024"))
+    plan_cache_ttl_seconds: int = int(os.getenv("PLAN_CACHE_TTL_SECONDS", "300"))
+    plan_cache_degraded_ttl_seconds: int = int(os.getenv("PLAN_CACHE_DEGRADED_TTL_SECONDS", "30"))
+    plan_working_set_max_entries: int = int(os.getenv("PLAN_WORKING_SET_MAX_ENTRIES", "512"))
+    plan_working_set_ttl_seconds: int = int(os.getenv("PLAN_WORKING_SET_TTL_SECONDS", "600"))
     naver_shopping_cache_ttl_seconds: int = int(os.getenv("NAVER_SHOPPING_CACHE_TTL_SECONDS", "120"))
+    naver_shopping_cache_max_entries: int = int(os.getenv("NAVER_SHOPPING_CACHE_MAX_ENTRIES", "512"))
+    naver_shopping_cache_max_bytes: int = int(os.getenv("NAVER_SHOPPING_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+    naver_shopping_cache_stale_seconds: int = int(os.getenv("NAVER_SHOPPING_CACHE_STALE_SECONDS", "600"))
 
     # Provider timeout/retry/circuit-breaker
     naver_shopping_timeout_seconds: float = float(os.getenv("NAVER_SHOPPING_TIMEOUT_SECONDS", "4.5"))
@@ -99,6 +134,18 @@ class Settings:
         os.getenv("NAVER_SHOPPING_CIRCUIT_COOLDOWN_SECONDS", "30")
     )
 
+    # 외부 API 공용 HTTP 클라이언트 풀 (업스트림 호스트별)
+    http_max_connections_per_host: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    http_keepalive_expiry_seconds: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    http_connect_timeout_seconds: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "3.0"))
+    http_read_timeout_seconds: float = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "10.0"))
+    http_enable_http2: bool = os.getenv("HTTP_ENABLE_HTTP2", "true").lower() == "true"
+
+    # 경로 조회 fan-out (매장별 병렬 조회 동시성/전체 마감 시간)
+    routing_max_concurrency: int = int(os.getenv("ROUTING_MAX_CONCURRENCY", "8"))
+    routing_deadline_seconds: float = float(os.getenv("ROUTING_DEADLINE_SECONDS", "2.5"))
+
     # PostgreSQL/Alembic migration 준비
     postgres_dsn: str = os.getenv("POSTGRES_DSN", "")
 
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import json
 import logging
 import time
-from typing import Any, Iterable
+import unicodedata
+from typing import Any, Iterable, Optional, Protocol
 
 from langchain_core.messages import BaseMessage
 
 from src.core.config import settings
+from src.core.ttl_cache import BoundedTTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,169 @@ _OPENAI_COOLDOWN_SECONDS = 300
 _openai_blocked_until_ts = 0.0
 
 
+class _PersistentJsonCache(Protocol):
+    async def get(self, key: str) -> Optional[dict]: ...
+
+    async def set(self, key: str, value: dict, ttl_seconds: int) -> Any: ...
+
+
+class LlmResponseCache:
+    """LLM JSON 응답 캐시.
+
+    인프로세스 LRU/TTL을 먼저 보고, 없으면 붙어 있는 영속 캐시(캐시 DB의 CacheService)를
+    본다. 같은 모델·온도·프롬프트 버전·정규화된 입력이면 OpenAI를 호출하지 않는다.
+    """
+
+    def __init__(self, *, max_entries: int = 2048, ttl_seconds: int = 6 * 3600, enabled: bool = True) -> None:
+        self._memory: BoundedTTLCache[str, dict] = BoundedTTLCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._enabled = enabled
+        self._persistent: Optional[_PersistentJsonCache] = None
+        self._stats = {"hits": 0, "persistent_hits": 0, "misses": 0, "stores": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def attach(self, persistent: Optional[_PersistentJsonCache]) -> None:
+        self._persistent = persistent
+
+    async def get(self, key: str) -> Optional[dict]:
+        if not self._enabled:
+            return None
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._stats["hits"] += 1
+            return copy.deepcopy(cached.value)
+        if self._persistent is not None:
+            try:
+                value = await self._persistent.get(key)
+            except Exception as exc:
+                logger.warning("LLM 응답 캐시 조회 실패: %s", exc)
+                value = None
+            if isinstance(value, dict):
+                self._stats["persistent_hits"] += 1
+                self._memory.set(key, value)
+                return copy.deepcopy(value)
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: dict) -> None:
+        if not self._enabled:
+            return
+        stored = copy.deepcopy(value)
+        self._memory.set(key, stored)
+        self._stats["stores"] += 1
+        if self._persistent is not None:
+            try:
+                await self._persistent.set(key, stored, self._ttl_seconds)
+            except Exception as exc:
+                logger.warning("LLM 응답 캐시 저장 실패: %s", exc)
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["persistent_hits"] + self._stats["misses"]
+        hit_rate = (self._stats["hits"] + self._stats["persistent_hits"]) / lookups if lookups else None
+        return {
+            **self._stats,
+            "enabled": self._enabled,
+            "entries": len(self._memory),
+            "hit_rate": round(hit_rate, 4) if hit_rate is not None else None,
+        }
+
+
+_llm_response_cache = LlmResponseCache(
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    enabled=settings.llm_cache_enabled,
+)
+
+
+def get_llm_response_cache() -> LlmResponseCache:
+    return _llm_response_cache
+
+
+def normalize_llm_text(text: str) -> str:
+    """캐시 키용 정규화: 유니코드 NFC, 공백 접기, 소문자."""
+    return " ".join(unicodedata.normalize("NFC", str(text or "")).split()).lower()
+
+
+def llm_cache_key(
+    *,
+    template_version: str,
+    temperature: float,
+    parts: Iterable[str],
+    model: Optional[str] = None,
+) -> str:
+    payload = {
+        "model": model or settings.openai_model,
+        "temperature": round(float(temperature), 3),
+        "template": template_version,
+        "parts": [normalize_llm_text(part) for part in parts],
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return "llm:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ChatClientPool:
+    """(모델, 온도)별 ChatOpenAI 인스턴스 캐시.
+
+    호출마다 ChatOpenAI를 만들면 내부 HTTP 클라이언트와 연결도 새로 맺는다.
+    lifespan에서 공용 httpx 클라이언트를 붙이면 모든 인스턴스가 그 keep-alive 연결을 쓴다.
+    """
+
+    def __init__(self, *, timeout_seconds: float = 30.0) -> None:
+        self._timeout_seconds = max(1.0, float(timeout_seconds))
+        self._clients: dict[tuple[str, str, float], Any] = {}
+        self._http_client: Any = None
+        self._stats = {"created": 0, "reused": 0}
+
+    def attach_http_client(self, http_client: Any) -> None:
+        # 붙어 있던 인스턴스는 이전 클라이언트를 잡고 있으므로 비운다
+        self._http_client = http_client
+        self._clients.clear()
+
+    def get(self, model: str, temperature: float) -> Any:
+        key = (settings.openai_api_key, model, round(float(temperature), 3))
+        client = self._clients.get(key)
+        if client is not None:
+            self._stats["reused"] += 1
+            return client
+
+        from langchain_openai import ChatOpenAI
+
+        options: dict[str, Any] = {
+            "model": model,
+            "api_key": settings.openai_api_key,
+            "temperature": temperature,
+            "timeout": self._timeout_seconds,
+        }
+        if self._http_client is not None:
+            options["http_async_client"] = self._http_client
+        client = ChatOpenAI(**options)
+        self._clients[key] = client
+        self._stats["created"] += 1
+        return client
+
+    def clear(self) -> None:
+        self._clients.clear()
+
+    def stats(self) -> dict:
+        return {**self._stats, "clients": len(self._clients), "shared_http_client": self._http_client is not None}
+
+
+_chat_client_pool = ChatClientPool(timeout_seconds=settings.llm_request_timeout_seconds)
+
+
+def get_chat_client_pool() -> ChatClientPool:
+    return _chat_client_pool
+
+
 def is_openai_configured() -> bool:
     api_key = (settings.openai_api_key or "").strip()
     return bool(api_key) and not api_key.startswith(_PLACEHOLDER_PREFIX)
@@ -58,60 +225,68 @@ def _is_auth_related_error(error_text: str) -> bool:
     )
 
 
-async def ainvoke_with_model_fallback(
-    messages: Iterable[BaseMessage],
-    *,
-    temperature: float = 0.2,
-) -> Any:
-    global _openai_blocked_until_ts
-
+def _ensure_openai_available() -> list[str]:
     if not is_openai_configured():
         raise RuntimeError("OPENAI_NOT_CONFIGURED")
 
-    now_ts = time.time()
-    if _openai_blocked_until_ts > now_ts:
+    if _openai_blocked_until_ts > time.time():
         raise RuntimeError("OPENAI_TEMPORARILY_BLOCKED")
 
     models = _iter_models()
     if not models:
         raise RuntimeError("OPENAI_MODEL_NOT_CONFIGURED")
+    return models
+
 
-    from langchain_openai import ChatOpenAI
+def _all_models_failed(errors: list[str], auth_related_failures: int, model_count: int) -> RuntimeError:
+    global _openai_blocked_until_ts
+
+    if auth_related_failures == model_count:
+        _openai_blocked_until_ts = time.time() + _OPENAI_COOLDOWN_SECONDS
+        logger.warning("OpenAI calls blocked for %ss due to repeated auth/model errors", _OPENAI_COOLDOWN_SECONDS)
 
+    return RuntimeError(f"OPENAI_ALL_MODELS_FAILED ({', '.join(errors)})")
+
+
+async def ainvoke_with_model_fallback(
+    messages: Iterable[BaseMessage],
+    *,
+    temperature: float = 0.2,
+) -> Any:
+    models = _ensure_openai_available()
+    pool = get_chat_client_pool()
     message_list = list(messages)
     errors: list[str] = []
     auth_related_failures = 0
     for model in models:
         try:
-            llm = ChatOpenAI(
-                model=model,
-                api_key=settings.openai_api_key,
-                temperature=temperature,
-            )
-            response = await llm.ainvoke(message_list)
+            response = await pool.get(model, temperature).ainvoke(message_list)
             if model != settings.openai_model:
                 logger.info("OpenAI fallback model success: %s", model)
             return response
         except Exception as exc:
             error_name = exc.__class__.__name__
-            error_text = str(exc)
             errors.append(f"{model}:{error_name}")
-            if _is_auth_related_error(error_text):
+            if _is_auth_related_error(str(exc)):
                 auth_related_failures += 1
             logger.warning("OpenAI model invocation failed (%s): %s", model, error_name)
 
-    if auth_related_failures == len(models):
-        _openai_blocked_until_ts = time.time() + _OPENAI_COOLDOWN_SECONDS
-        logger.warning("OpenAI calls blocked for %ss due to repeated auth/model errors", _OPENAI_COOLDOWN_SECONDS)
-
-    raise RuntimeError(f"OPENAI_ALL_MODELS_FAILED ({', '.join(errors)})")
+    raise _all_models_failed(errors, auth_related_failures, len(models))
 
 
 async def ainvoke_json_with_model_fallback(
     messages: Iterable[BaseMessage],
     *,
     temperature: float = 0.1,
+    cache_key: Optional[str] = None,
 ) -> dict[str, Any]:
+    """JSON 응답 호출. `cache_key`를 주면 같은 키의 이전 응답을 재사용한다."""
+    cache = get_llm_response_cache()
+    if cache_key is not None:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     response = await ainvoke_with_model_fallback(messages, temperature=temperature)
     raw_content = getattr(response, "content", "")
 
@@ -133,4 +308,6 @@ async def ainvoke_json_with_model_fallback(
     parsed = json.loads(cleaned)
     if not isinstance(parsed, dict):
         raise RuntimeError("OPENAI_JSON_OBJECT_REQUIRED")
+    if cache_key is not None:
+        await cache.set(cache_key, parsed)
     return parsed
@@ -56,6 +56,53 @@ class OnlinePlanKpiTracker:
         }
 
 
+class ChatRoutingTracker:
+    """챗봇 라우팅 단계(rule/llm/fallback)별 지연과 rule↔LLM 의도 일치율."""
+
+    def __init__(self, window_size: int = 500):
+        self._window_size = max(20, window_size)
+        self._latencies: dict[str, deque[float]] = {}
+        self._counts: dict[str, int] = {}
+        # LLM 단계로 간 요청에서 rule 후보 의도와 LLM 의도를 비교한 결과
+        self._agreements: deque[bool] = deque(maxlen=self._window_size)
+        self._lock = asyncio.Lock()
+
+    async def record(self, *, tier: str, duration_ms: float) -> None:
+        async with self._lock:
+            window = self._latencies.setdefault(tier, deque(maxlen=self._window_size))
+            window.append(max(0.0, float(duration_ms)))
+            self._counts[tier] = self._counts.get(tier, 0) + 1
+
+    async def record_agreement(self, *, rule_intent: str, llm_intent: str) -> None:
+        async with self._lock:
+            self._agreements.append(rule_intent == llm_intent)
+
+    async def snapshot(self) -> dict:
+        async with self._lock:
+            latencies = {tier: sorted(values) for tier, values in self._latencies.items()}
+            counts = dict(self._counts)
+            agreements = list(self._agreements)
+
+        total = sum(counts.values())
+        return {
+            "total_requests": total,
+            "tiers": {
+                tier: {
+                    "requests": counts.get(tier, 0),
+                    "share": (counts.get(tier, 0) / total) if total else 0.0,
+                    "p50_ms": _percentile(values, 0.50),
+                    "p95_ms": _percentile(values, 0.95),
+                    "p99_ms": _percentile(values, 0.99),
+                }
+                for tier, values in latencies.items()
+            },
+            "agreement": {
+                "samples": len(agreements),
+                "ratio": (sum(agreements) / len(agreements)) if agreements else None,
+            },
+        }
+
+
 def _percentile(values: list[float], ratio: float) -> float | None:
     if not values:
         return None
@@ -73,3 +120,9 @@ _online_plan_kpi = OnlinePlanKpiTracker(window_size=settings.online_plan_metrics
 def get_online_plan_kpi_tracker() -> OnlinePlanKpiTracker:
     return _online_plan_kpi
 
+
+_chat_routing = ChatRoutingTracker(window_size=settings.online_plan_metrics_window_size)
+
+
+def get_chat_routing_tracker() -> ChatRoutingTracker:
+    return _chat_routing
@@ -0,0 +1,153 @@
+"""크기 제한 LRU + TTL 인프로세스 캐시 (stale-while-revalidate 지원).
+
+항목 수와 추정 바이트 합계 두 상한을 두고, 넘치면 가장 오래 안 쓴 항목부터 내보낸다.
+만료 후 `stale_seconds` 동안은 stale 값으로 응답할 수 있게 남겨 두어, 호출자가
+즉시 응답하고 백그라운드에서 갱신할 수 있다. 이벤트 루프 단일 스레드에서만 쓰므로
+연산 중 await가 없고 별도 잠금이 필요 없다.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    expires_at: float
+    size: int
+
+
+@dataclass(frozen=True)
+class CacheLookup(Generic[V]):
+    value: V
+    stale: bool
+
+
+class BoundedTTLCache(Generic[K, V]):
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: Optional[int] = None,
+        stale_seconds: float = 0.0,
+        sizeof: Optional[Callable[[V], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._max_bytes = int(max_bytes) if max_bytes else None
+        self._ttl_seconds = max(0.0, float(ttl_seconds))
+        self._stale_seconds = max(0.0, float(stale_seconds))
+        self._sizeof = sizeof or (lambda _: 1)
+        self._clock = clock
+        self._entries: "OrderedDict[K, _Entry[V]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: K) -> Optional[CacheLookup[V]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        now = self._clock()
+        if entry.expires_at > now:
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return CacheLookup(entry.value, stale=False)
+
+        if entry.expires_at + self._stale_seconds > now:
+            self._entries.move_to_end(key)
+            self._stats["stale_hits"] += 1
+            return CacheLookup(entry.value, stale=True)
+
+        self._remove(key)
+        self._stats["expirations"] += 1
+        self._stats["misses"] += 1
+        return None
+
+    def set(self, key: K, value: V, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self._ttl_seconds if ttl_seconds is None else max(0.0, float(ttl_seconds))
+        size = max(1, int(self._sizeof(value)))
+        if self._max_bytes is not None and size > self._max_bytes:
+            # 단일 항목이 전체 예산보다 크면 캐시하지 않는다
+            self.pop(key)
+            return
+
+        self._remove(key)
+        self._entries[key] = _Entry(value=value, expires_at=self._clock() + ttl, size=size)
+        self._bytes += size
+        self._evict_overflow()
+
+    def pop(self, key: K) -> Optional[V]:
+        entry = self._remove(key)
+        return entry.value if entry is not None else None
+
+    def items(self) -> list[tuple[K, V]]:
+        """LRU 순서를 바꾸지 않고 현재 항목 목록을 돌려준다 (만료 여부 무관)."""
+        return [(key, entry.value) for key, entry in self._entries.items()]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """stale 허용 구간까지 지난 항목을 일괄 제거."""
+        now = self._clock()
+        expired = [
+            key for key, entry in self._entries.items() if entry.expires_at + self._stale_seconds <= now
+        ]
+        for key in expired:
+            self._remove(key)
+        self._stats["expirations"] += len(expired)
+        return len(expired)
+
+    def stats(self) -> dict[str, int | float | None]:
+        lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "hit_ratio": (
+                (self._stats["hits"] + self._stats["stale_hits"]) / lookups if lookups else 0.0
+            ),
+        }
+
+    def _remove(self, key: K) -> Optional[_Entry[V]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def _evict_overflow(self) -> None:
+        while self._entries and (
+            len(self._entries) > self._max_entries
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._stats["evictions"] += 1
@@ -0,0 +1,153 @@
+"""인증 세션/사용자 조회 캐시와 last_used_at 지연 기록.
+
+`require_auth`가 요청마다 세션·사용자를 조회하고 `touch_session`으로 커밋하던 것을
+짧은 TTL 메모리 캐시와 주기적 일괄 UPDATE로 대체한다. 세션 폐기/토큰 회전 시
+`UserRepository`가 해당 세션을 즉시 무효화한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
+
+import aiosqlite
+
+from src.core.config import settings
+from src.core.ttl_cache import BoundedTTLCache
+
+if TYPE_CHECKING:
+    from src.infrastructure.persistence.connection_pool import SqliteConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    user_id: str
+    email: str
+    name: str | None
+
+
+class AuthSessionCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 10000,
+        touch_flush_interval_seconds: float = 15.0,
+    ) -> None:
+        self._principals: BoundedTTLCache[str, CachedPrincipal] = BoundedTTLCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+        self._touch_flush_interval_seconds = max(0.1, float(touch_flush_interval_seconds))
+        # session_id -> 마지막 사용 시각(ISO). flush 때 한 번에 기록
+        self._pending_touches: dict[str, str] = {}
+        # 무효화마다 증가. 조회 도중 폐기된 세션을 뒤늦게 캐시하지 않기 위해 쓴다
+        self._generation = 0
+        self._db: Optional[aiosqlite.Connection] = None
+        self._pool: Optional["SqliteConnectionPool"] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def deferred_touch(self) -> bool:
+        return self._flush_task is not None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, session_id: str, user_id: str) -> Optional[CachedPrincipal]:
+        cached = self._principals.get(session_id)
+        if cached is None or cached.value.user_id != user_id:
+            return None
+        return cached.value
+
+    def put(self, session_id: str, user: dict, generation: int) -> CachedPrincipal:
+        principal = CachedPrincipal(
+            user_id=str(user["user_id"]),
+            email=str(user.get("email") or ""),
+            name=user.get("name"),
+        )
+        if generation == self._generation:
+            self._principals.set(session_id, principal)
+        return principal
+
+    def invalidate_session(self, session_id: str) -> None:
+        self._generation += 1
+        self._principals.pop(session_id)
+        self._pending_touches.pop(session_id, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        self._generation += 1
+        for session_id, principal in self._principals.items():
+            if principal.user_id == user_id:
+                self._principals.pop(session_id)
+
+    def touch(self, session_id: str) -> None:
+        self._pending_touches[session_id] = datetime.now(timezone.utc).isoformat()
+
+    def start(self, db: aiosqlite.Connection, pool: Optional["SqliteConnectionPool"] = None) -> None:
+        """last_used_at 일괄 기록 루프 시작 (lifespan에서 호출). pool이 있으면 writer 큐로 기록한다."""
+        if self._flush_task is not None:
+            return
+        self._db = db
+        self._pool = pool
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        task, self._flush_task = self._flush_task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await self.flush_touches()
+        self._db = None
+        self._pool = None
+
+    async def flush_touches(self) -> int:
+        if not self._pending_touches or self._db is None:
+            return 0
+        pending, self._pending_touches = self._pending_touches, {}
+        rows = [(used_at, session_id) for session_id, used_at in pending.items()]
+
+        async def op(db: aiosqlite.Connection) -> None:
+            await db.executemany("UPDATE auth_sessions SET last_used_at = ? WHERE session_id = ?", rows)
+
+        try:
+            if self._pool is not None:
+                # writer 연결을 직접 commit하면 같은 배치의 다른 쓰기까지 커밋되므로 큐에 태운다
+                await self._pool.write(op)
+            else:
+                await op(self._db)
+                await self._db.commit()
+        except Exception:
+            for session_id, used_at in pending.items():
+                self._pending_touches.setdefault(session_id, used_at)
+            raise
+        return len(pending)
+
+    def stats(self) -> dict:
+        return {**self._principals.stats(), "pending_touches": len(self._pending_touches)}
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._touch_flush_interval_seconds)
+            try:
+                await self.flush_touches()
+            except Exception as exc:
+                logger.warning("세션 사용 시각 기록 실패: %s", exc)
+
+
+_auth_session_cache = AuthSessionCache(
+    ttl_seconds=settings.auth_session_cache_ttl_seconds,
+    max_entries=settings.auth_session_cache_max_entries,
+    touch_flush_interval_seconds=settings.auth_touch_flush_interval_seconds,
+)
+
+
+def get_auth_session_cache() -> AuthSessionCache:
+    return _auth_session_cache
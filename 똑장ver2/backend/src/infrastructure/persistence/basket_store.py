@@ -0,0 +1,193 @@
+"""행 버전 기반 장바구니 read-through 캐시.
+
+`user_baskets.version`은 저장할 때마다 1씩 오른다. 조회 시 버전만 확인해 바뀌지 않았으면
+파싱해 둔 장바구니를 그대로 쓰고, 바뀌었을 때만 JSON을 다시 읽는다. 워커가 여러 개여도
+버전 확인은 항상 DB 기준이라 다른 워커의 변경을 놓치지 않는다.
+
+품목 단위 변경(`update`)은 읽은 버전을 조건으로 저장하고(낙관적 동시성), 그 사이 다른
+워커가 먼저 저장했으면 새 버전으로 다시 적용한다. 요청 전체에 걸쳐 고친 작업본은
+`save_changes`로 저장해, 충돌하면 그 요청의 변경분만 최신 장바구니에 다시 얹는다.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from src.core.config import settings
+from src.core.ttl_cache import BoundedTTLCache
+from src.domain.models.basket import Basket, BasketItem
+from src.infrastructure.persistence.user_repository import UserRepository
+
+T = TypeVar("T")
+
+
+class BasketVersionConflict(RuntimeError):
+    """기대한 버전이 아니어서 장바구니를 저장하지 못함."""
+
+
+@dataclass(frozen=True)
+class BasketSnapshot:
+    basket: Basket
+    version: int
+
+
+@dataclass(frozen=True)
+class _CachedBasket:
+    version: int
+    payload: str
+    # 밖으로 내보낼 때는 항상 복사본을 준다 (호출자가 제자리 수정하므로)
+    basket: Basket
+
+
+def _serialize(basket: Basket) -> str:
+    return json.dumps(basket.model_dump(mode="json"), ensure_ascii=False)
+
+
+def _item_key(item: BasketItem) -> tuple[str, str | None, str | None]:
+    return item.item_name, item.size, item.brand
+
+
+def rebase_basket(latest: Basket, base: Basket, ours: Basket) -> None:
+    """`base`→`ours` 변경분(추가·삭제·수량 증감)을 `latest`에 제자리로 다시 적용한다."""
+    base_items = {_item_key(item): item for item in base.items}
+    our_items = {_item_key(item): item for item in ours.items}
+    latest_items = {_item_key(item): item for item in latest.items}
+
+    for key in base_items.keys() - our_items.keys():
+        removed = latest_items.pop(key, None)
+        if removed is not None:
+            latest.items.remove(removed)
+
+    for key, item in our_items.items():
+        before = base_items.get(key)
+        if before == item:
+            continue
+        current = latest_items.get(key)
+        if current is None:
+            latest.items.append(item.model_copy())
+            continue
+        # 수량은 이 요청이 바꾼 만큼만 더해 다른 요청의 증감을 보존한다
+        delta = item.quantity - (before.quantity if before is not None else 0)
+        merged = item.model_copy(update={"quantity": max(1, current.quantity + delta)})
+        latest.items[latest.items.index(current)] = merged
+
+
+def _parse(payload: str) -> Basket:
+    try:
+        return Basket.model_validate(json.loads(payload))
+    except Exception:
+        return Basket(items=[])
+
+
+class VersionedBasketStore:
+    def __init__(self, *, max_entries: int = 10000, ttl_seconds: float = 3600.0, max_retries: int = 3) -> None:
+        self._entries: BoundedTTLCache[str, _CachedBasket] = BoundedTTLCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+        self._max_retries = max(0, int(max_retries))
+        self._stats = {"reloads": 0, "writes": 0, "skipped_writes": 0, "conflicts": 0}
+
+    async def load(self, repo: UserRepository, user_id: str) -> BasketSnapshot:
+        cached = self._entries.get(user_id)
+        if cached is not None:
+            version = await repo.get_basket_version(user_id)
+            if version == cached.value.version:
+                return BasketSnapshot(cached.value.basket.model_copy(deep=True), version)
+
+        payload, version = await repo.get_basket_payload(user_id)
+        self._stats["reloads"] += 1
+        basket = _parse(payload)
+        self._entries.set(user_id, _CachedBasket(version=version, payload=payload, basket=basket))
+        return BasketSnapshot(basket.model_copy(deep=True), version)
+
+    async def save(
+        self,
+        repo: UserRepository,
+        user_id: str,
+        basket: Basket,
+        *,
+        expected_version: int | None = None,
+    ) -> int:
+        """저장 후 새 버전을 돌려준다. 기대 버전의 내용과 같으면 쓰지 않는다."""
+        payload = _serialize(basket)
+        cached = self._entries.get(user_id)
+        if (
+            expected_version is not None
+            and cached is not None
+            and cached.value.version == expected_version
+            and cached.value.payload == payload
+        ):
+            self._stats["skipped_writes"] += 1
+            return cached.value.version
+
+        version = await repo.save_basket_payload(user_id, payload, expected_version=expected_version)
+        if version is None:
+            self._stats["conflicts"] += 1
+            self._entries.pop(user_id)
+            raise BasketVersionConflict(user_id)
+        self._stats["writes"] += 1
+        self._entries.set(
+            user_id,
+            _CachedBasket(version=version, payload=payload, basket=basket.model_copy(deep=True)),
+        )
+        return version
+
+    async def update(
+        self,
+        repo: UserRepository,
+        user_id: str,
+        mutate: Callable[[Basket], T],
+    ) -> tuple[BasketSnapshot, T]:
+        """최신 장바구니에 `mutate`를 적용해 저장한다. 버전 충돌이면 다시 읽어 재시도한다."""
+        attempt = 0
+        while True:
+            snapshot = await self.load(repo, user_id)
+            result = mutate(snapshot.basket)
+            try:
+                version = await self.save(repo, user_id, snapshot.basket, expected_version=snapshot.version)
+            except BasketVersionConflict:
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                continue
+            return BasketSnapshot(snapshot.basket, version), result
+
+    async def save_changes(
+        self,
+        repo: UserRepository,
+        user_id: str,
+        base: BasketSnapshot,
+        basket: Basket,
+    ) -> BasketSnapshot:
+        """`base`를 읽은 뒤 고친 `basket`을 저장한다.
+
+        `base`와 같으면 쓰지 않는다. 그 사이 다른 요청이 저장했으면 `base`→`basket` 변경분만
+        최신 장바구니에 다시 적용해 덮어쓰기를 막는다.
+        """
+        if basket == base.basket:
+            self._stats["skipped_writes"] += 1
+            return BasketSnapshot(basket, base.version)
+        try:
+            version = await self.save(repo, user_id, basket, expected_version=base.version)
+        except BasketVersionConflict:
+            snapshot, _ = await self.update(repo, user_id, lambda latest: rebase_basket(latest, base.basket, basket))
+            return snapshot
+        return BasketSnapshot(basket, version)
+
+    def invalidate(self, user_id: str) -> None:
+        self._entries.pop(user_id)
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), **self._stats}
+
+
+_versioned_basket_store = VersionedBasketStore(
+    max_entries=settings.basket_cache_max_entries,
+    max_retries=settings.basket_update_max_retries,
+)
+
+
+def get_versioned_basket_store() -> VersionedBasketStore:
+    return _versioned_basket_store
@@ -1,38 +1,218 @@
-import aiosqlite
+"""2단 캐시: 인프로세스 LRU + SQLite(cache.db) write-behind.
+
+읽기는 메모리 LRU → 아직 flush 안 된 쓰기 버퍼 → SQLite 순서로 찾는다.
+`start()` 이후에는 쓰기를 버퍼에 모았다가 주기적으로 한 트랜잭션에 묶어 커밋하고,
+만료 행은 백그라운드 sweeper가 배치 단위로 지운다. `start()` 전에는 호출마다
+바로 커밋한다(스크립트/테스트용).
+"""
+import asyncio
 import json
+import logging
 import time
-from typing import Optional
+from contextlib import suppress
+from typing import Iterable, Optional
+
+import aiosqlite
+
+from src.core.ttl_cache import BoundedTTLCache
+
+logger = logging.getLogger(__name__)
+
+# SQLite 바인딩 변수 상한(999) 아래로 IN 절을 나눈다
+_KEYS_PER_QUERY = 500
+
+_UPSERT_SQL = """
+INSERT OR REPLACE INTO cache_entries (cache_key, value_json, expires_at, created_at)
+VALUES (?, ?, ?, datetime('now'))
+"""
+
 
 class CacheService:
-    def __init__(self, db: aiosqlite.Connection):
+    def __init__(
+        self,
+        db: aiosqlite.Connection,
+        *,
+        memory_max_entries: int = 2048,
+        memory_max_bytes: Optional[int] = 4 * 1024 * 1024,
+        flush_interval_seconds: float = 0.5,
+        flush_max_pending: int = 256,
+        sweep_interval_seconds: float = 300.0,
+        sweep_batch_size: int = 500,
+    ):
         self.db = db
+        # 값은 JSON 문자열로 보관해 호출자가 받은 dict를 고쳐도 캐시가 오염되지 않는다
+        self._memory: BoundedTTLCache[str, str] = BoundedTTLCache(
+            max_entries=memory_max_entries,
+            max_bytes=memory_max_bytes,
+            ttl_seconds=0,
+            sizeof=len,
+            clock=time.time,
+        )
+        # cache_key -> (value_json, expires_at) / None(삭제)
+        self._pending: dict[str, Optional[tuple[str, float]]] = {}
+        self._flush_interval_seconds = max(0.01, float(flush_interval_seconds))
+        self._flush_max_pending = max(1, int(flush_max_pending))
+        self._sweep_interval_seconds = max(1.0, float(sweep_interval_seconds))
+        self._sweep_batch_size = max(1, int(sweep_batch_size))
+        self._flush_lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task] = []
+        self._stats = {"db_reads": 0, "flushes": 0, "flushed_rows": 0, "swept_rows": 0}
+
+    @classmethod
+    def from_settings(cls, db: aiosqlite.Connection, settings) -> "CacheService":
+        return cls(
+            db,
+            memory_max_entries=settings.cache_memory_max_entries,
+            memory_max_bytes=settings.cache_memory_max_bytes,
+            flush_interval_seconds=settings.cache_flush_interval_seconds,
+            flush_max_pending=settings.cache_flush_max_pending,
+            sweep_interval_seconds=settings.cache_sweep_interval_seconds,
+            sweep_batch_size=settings.cache_sweep_batch_size,
+        )
+
+    @property
+    def write_behind(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """백그라운드 flush/sweep 루프 시작 (lifespan에서 호출)."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._sweep_loop()),
+        ]
+
+    async def close(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
 
     async def get(self, key: str) -> Optional[dict]:
-        async with self.db.execute(
-            "SELECT value_json, expires_at FROM cache_entries WHERE cache_key = ?", (key,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                value_json, expires_at = row
-                if expires_at > time.time():
-                    return json.loads(value_json)
-                else:
-                    # Expired
-                    await self.delete(key)
-        return None
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, dict]:
+        now = time.time()
+        found: dict[str, dict] = {}
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            cached = self._memory.get(key)
+            if cached is not None:
+                found[key] = json.loads(cached.value)
+                continue
+            if key in self._pending:
+                pending = self._pending[key]
+                if pending is not None and pending[1] > now:
+                    found[key] = json.loads(pending[0])
+                continue
+            missing.append(key)
+
+        for start in range(0, len(missing), _KEYS_PER_QUERY):
+            chunk = missing[start:start + _KEYS_PER_QUERY]
+            placeholders = ",".join("?" for _ in chunk)
+            self._stats["db_reads"] += 1
+            async with self.db.execute(
+                f"""
+                SELECT cache_key, value_json, expires_at
+                FROM cache_entries
+                WHERE cache_key IN ({placeholders}) AND expires_at > ?
+                """,
+                (*chunk, now),
+            ) as cursor:
+                rows = await cursor.fetchall()
+            for key, value_json, expires_at in rows:
+                found[key] = json.loads(value_json)
+                self._memory.set(key, value_json, ttl_seconds=float(expires_at) - now)
+        return found
 
     async def set(self, key: str, value: dict, ttl_seconds: int):
+        await self.set_many({key: value}, ttl_seconds)
+
+    async def set_many(self, values: dict[str, dict], ttl_seconds: int) -> None:
         expires_at = time.time() + ttl_seconds
-        value_json = json.dumps(value, ensure_ascii=False)
-        await self.db.execute(
-            """
-            INSERT OR REPLACE INTO cache_entries (cache_key, value_json, expires_at, created_at)
-            VALUES (?, ?, ?, datetime('now'))
-            """,
-            (key, value_json, expires_at)
-        )
-        await self.db.commit()
+        for key, value in values.items():
+            value_json = json.dumps(value, ensure_ascii=False)
+            self._memory.set(key, value_json, ttl_seconds=ttl_seconds)
+            self._pending[key] = (value_json, expires_at)
+        await self._maybe_flush()
 
     async def delete(self, key: str):
-        await self.db.execute("DELETE FROM cache_entries WHERE cache_key = ?", (key,))
-        await self.db.commit()
+        self._memory.pop(key)
+        self._pending[key] = None
+        await self._maybe_flush()
+
+    async def flush(self) -> int:
+        """버퍼된 쓰기/삭제를 한 트랜잭션으로 커밋."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            upserts = [(key, row[0], row[1]) for key, row in pending.items() if row is not None]
+            deletes = [(key,) for key, row in pending.items() if row is None]
+            try:
+                if upserts:
+                    await self.db.executemany(_UPSERT_SQL, upserts)
+                if deletes:
+                    await self.db.executemany("DELETE FROM cache_entries WHERE cache_key = ?", deletes)
+                await self.db.commit()
+            except Exception:
+                # 실패한 배치는 이후 쓰기에 덮이지 않은 키만 되돌려 다음 flush에서 재시도
+                for key, row in pending.items():
+                    self._pending.setdefault(key, row)
+                raise
+            self._stats["flushes"] += 1
+            self._stats["flushed_rows"] += len(pending)
+            return len(pending)
+
+    async def sweep_expired(self) -> int:
+        """만료 행을 배치 단위로 삭제. 배치마다 커밋해 쓰기 잠금을 짧게 유지한다."""
+        self._memory.purge_expired()
+        removed = 0
+        while True:
+            async with self._flush_lock:
+                cursor = await self.db.execute(
+                    """
+                    DELETE FROM cache_entries
+                    WHERE rowid IN (
+                        SELECT rowid FROM cache_entries WHERE expires_at <= ? LIMIT ?
+                    )
+                    """,
+                    (time.time(), self._sweep_batch_size),
+                )
+                deleted = cursor.rowcount or 0
+                await self.db.commit()
+            removed += deleted
+            if deleted < self._sweep_batch_size:
+                break
+            await asyncio.sleep(0)
+        self._stats["swept_rows"] += removed
+        return removed
+
+    def stats(self) -> dict:
+        return {**self._stats, "pending": len(self._pending), "memory": self._memory.stats()}
+
+    async def _maybe_flush(self) -> None:
+        if not self.write_behind or len(self._pending) >= self._flush_max_pending:
+            await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as exc:
+                logger.warning("캐시 flush 실패: %s", exc)
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                removed = await self.sweep_expired()
+                if removed:
+                    logger.info("만료 캐시 %s건 정리", removed)
+            except Exception as exc:
+                logger.warning("만료 캐시 정리 실패: %s", exc)
+            await asyncio.sleep(self._sweep_interval_seconds)
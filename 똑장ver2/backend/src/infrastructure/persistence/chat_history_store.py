@@ -0,0 +1,92 @@
+"""사용자별 대화 히스토리 저장소 (SQLite SoR + 인프로세스 링 버퍼).
+
+최근 `max_messages`개만 DB와 메모리에 유지한다. 메모리 사본은 마지막 메시지 ID와 함께
+두고, 조회 때 DB의 마지막 ID와 다르면(다른 워커가 추가/삭제) 다시 읽는다.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+from src.application.services.chat_context import ChatTurn
+from src.core.config import settings
+from src.core.ttl_cache import BoundedTTLCache
+from src.infrastructure.persistence.user_repository import UserRepository
+
+
+@dataclass
+class _CachedHistory:
+    head: int
+    turns: deque[ChatTurn]
+
+
+class ChatHistoryStore:
+    def __init__(self, *, max_messages: int = 40, max_users: int = 5000, ttl_seconds: float = 3600.0) -> None:
+        self._max_messages = max(2, int(max_messages))
+        self._histories: BoundedTTLCache[str, _CachedHistory] = BoundedTTLCache(
+            max_entries=max_users,
+            ttl_seconds=ttl_seconds,
+        )
+        self._reloads = 0
+
+    @property
+    def max_messages(self) -> int:
+        return self._max_messages
+
+    async def load(self, repo: UserRepository, user_id: str) -> list[ChatTurn]:
+        head = await repo.get_chat_head(user_id)
+        cached = self._histories.get(user_id)
+        if cached is not None and cached.value.head == head:
+            return list(cached.value.turns)
+
+        rows, head = await repo.list_chat_messages(user_id, limit=self._max_messages)
+        self._reloads += 1
+        turns = deque((ChatTurn(role=role, content=content) for role, content in rows), maxlen=self._max_messages)
+        self._histories.set(user_id, _CachedHistory(head=head, turns=turns))
+        return list(turns)
+
+    async def append(self, repo: UserRepository, user_id: str, turns: list[ChatTurn]) -> None:
+        if not turns:
+            return
+        cached = self._histories.get(user_id)
+        since = cached.value.head if cached is not None else 0
+        appended = await repo.append_chat_messages(
+            user_id,
+            [(turn.role, turn.content) for turn in turns],
+            keep=self._max_messages,
+            since=since,
+        )
+        if appended is None:
+            # unit of work 안에서는 쓰기가 반영된 뒤 DB 기준으로 메모리 사본을 맞춘다
+            async def remember() -> None:
+                self._remember_append(user_id, turns, since, *await repo.count_chat_messages_since(user_id, since))
+
+            repo.after_commit(remember)
+            return
+        self._remember_append(user_id, turns, since, *appended)
+
+    def _remember_append(self, user_id: str, turns: list[ChatTurn], since: int, head: int, appended_since: int) -> None:
+        cached = self._histories.get(user_id)
+        if cached is not None and cached.value.head == since and appended_since == len(turns):
+            # 그 사이 다른 워커가 끼어들지 않았으면 메모리 사본만 이어 붙인다
+            cached.value.turns.extend(turns)
+            cached.value.head = head
+        else:
+            self._histories.pop(user_id)
+
+    async def clear(self, repo: UserRepository, user_id: str) -> None:
+        await repo.clear_chat_messages(user_id)
+        self._histories.pop(user_id)
+
+    def stats(self) -> dict:
+        return {**self._histories.stats(), "reloads": self._reloads}
+
+
+_chat_history_store = ChatHistoryStore(
+    max_messages=settings.chat_history_max_messages,
+    max_users=settings.chat_history_cache_max_users,
+)
+
+
+def get_chat_history_store() -> ChatHistoryStore:
+    return _chat_history_store
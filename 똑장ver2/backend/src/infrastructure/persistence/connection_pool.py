@@ -0,0 +1,291 @@
+"""SQLite 연결 관리자: 읽기 전용 연결 N개 + 단일 writer 큐(group commit).
+
+WAL 모드에서는 읽기 연결이 writer와 동시에 돌 수 있다. 플랜 생성처럼 읽기만 하는
+경로는 `reader()`로 읽기 연결을 빌려 쓰고, 쓰기는 writer 연결 하나로 모은다.
+`write()`로 넘긴 작업은 큐에 쌓였다가(첫 작업 후 `commit_window_ms` 동안 더 모은다)
+한 트랜잭션(작업별 SAVEPOINT)으로 묶여 한 번에 커밋된다. 기존 코드 호환을 위해 writer 연결은 `app.state.db`로도 노출된다.
+요청 처리 중에는 writer 연결을 직접 commit/rollback하지 않는다 — 큐에 쌓인 다른 작업까지 커밋·롤백되어
+배치 원자성이 깨진다. 직접 커밋은 서비스 시작 전(시드·백필)에만 허용된다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteOp = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class PragmaProfile:
+    """연결별 PRAGMA 설정. None 항목은 건드리지 않는다."""
+
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    cache_size_kib: Optional[int] = None
+    mmap_size_bytes: Optional[int] = None
+    busy_timeout_ms: Optional[int] = None
+    foreign_keys: Optional[bool] = None
+    query_only: Optional[bool] = None
+
+    def statements(self) -> list[str]:
+        statements: list[str] = []
+        if self.journal_mode:
+            statements.append(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.synchronous:
+            statements.append(f"PRAGMA synchronous={self.synchronous}")
+        if self.cache_size_kib is not None:
+            # 음수는 페이지 수가 아닌 KiB 단위
+            statements.append(f"PRAGMA cache_size=-{abs(int(self.cache_size_kib))}")
+        if self.mmap_size_bytes is not None:
+            statements.append(f"PRAGMA mmap_size={int(self.mmap_size_bytes)}")
+        if self.busy_timeout_ms is not None:
+            statements.append(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        if self.foreign_keys is not None:
+            statements.append(f"PRAGMA foreign_keys={'ON' if self.foreign_keys else 'OFF'}")
+        if self.query_only is not None:
+            statements.append(f"PRAGMA query_only={'ON' if self.query_only else 'OFF'}")
+        return statements
+
+
+WRITER_PROFILE = PragmaProfile(
+    journal_mode="WAL",
+    synchronous="NORMAL",
+    cache_size_kib=16 * 1024,
+    busy_timeout_ms=5000,
+    foreign_keys=True,
+)
+READER_PROFILE = PragmaProfile(
+    cache_size_kib=16 * 1024,
+    mmap_size_bytes=256 * 1024 * 1024,
+    busy_timeout_ms=5000,
+    foreign_keys=True,
+    query_only=True,
+)
+
+
+@dataclass
+class _WriteRequest:
+    op: WriteOp
+    future: asyncio.Future
+
+
+class SqliteConnectionPool:
+    def __init__(
+        self,
+        path: str,
+        *,
+        readers: int = 4,
+        writer_profile: PragmaProfile = WRITER_PROFILE,
+        reader_profile: PragmaProfile = READER_PROFILE,
+        max_batch_size: int = 64,
+        commit_window_ms: float = 0.0,
+    ) -> None:
+        self._path = str(path)
+        self._reader_count = max(1, int(readers))
+        self._writer_profile = writer_profile
+        self._reader_profile = reader_profile
+        self._max_batch_size = max(1, int(max_batch_size))
+        self._commit_window_seconds = max(0.0, float(commit_window_ms)) / 1000.0
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._write_queue: asyncio.Queue[_WriteRequest] = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stats = {"reads": 0, "read_waits": 0, "writes": 0, "write_batches": 0, "write_errors": 0}
+        # 최근 커밋 소요 시간(ms). fsync 부하 관측용
+        self._commit_latencies_ms: deque[float] = deque(maxlen=512)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "SqliteConnectionPool":
+        return cls(
+            settings.db_path,
+            readers=settings.db_read_pool_size,
+            writer_profile=PragmaProfile(
+                journal_mode="WAL",
+                synchronous=settings.db_synchronous,
+                cache_size_kib=settings.db_cache_size_kib,
+                busy_timeout_ms=settings.db_busy_timeout_ms,
+                foreign_keys=True,
+            ),
+            reader_profile=PragmaProfile(
+                cache_size_kib=settings.db_cache_size_kib,
+                mmap_size_bytes=settings.db_mmap_size_bytes,
+                busy_timeout_ms=settings.db_busy_timeout_ms,
+                foreign_keys=True,
+                query_only=True,
+            ),
+            max_batch_size=settings.db_write_batch_size,
+            commit_window_ms=settings.db_commit_window_ms,
+        )
+
+    @property
+    def writer(self) -> aiosqlite.Connection:
+        if self._writer is None:
+            raise RuntimeError("DB_POOL_NOT_OPEN")
+        return self._writer
+
+    async def open(self) -> "SqliteConnectionPool":
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        # writer가 먼저 WAL로 전환해야 읽기 전용 연결이 동시 읽기를 할 수 있다
+        self._writer = await self._connect(self._path, self._writer_profile)
+        for _ in range(self._reader_count):
+            reader = await self._connect(
+                f"{Path(self._path).resolve().as_uri()}?mode=ro",
+                self._reader_profile,
+                uri=True,
+            )
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        return self
+
+    async def close(self) -> None:
+        task, self._writer_task = self._writer_task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        queued: list[_WriteRequest] = []
+        while not self._write_queue.empty():
+            queued.append(self._write_queue.get_nowait())
+        _fail_unresolved(queued, RuntimeError("DB_POOL_CLOSED"))
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """읽기 전용 연결을 빌려준다. 모두 사용 중이면 반납될 때까지 기다린다."""
+        self._stats["reads"] += 1
+        if self._idle_readers.empty():
+            self._stats["read_waits"] += 1
+        connection = await self._idle_readers.get()
+        try:
+            yield connection
+        finally:
+            self._idle_readers.put_nowait(connection)
+
+    async def write(self, op: Callable[[aiosqlite.Connection], Awaitable[T]]) -> T:
+        """writer 큐에 작업을 넣고 커밋될 때까지 기다린다. 작업 안에서 commit()하지 않는다."""
+        if self._writer_task is None:
+            raise RuntimeError("DB_POOL_NOT_OPEN")
+        future = asyncio.get_running_loop().create_future()
+        self._write_queue.put_nowait(_WriteRequest(op=op, future=future))
+        return await future
+
+    def stats(self) -> dict:
+        latencies = sorted(self._commit_latencies_ms)
+        batches = self._stats["write_batches"]
+        return {
+            **self._stats,
+            "readers": len(self._readers),
+            "idle_readers": self._idle_readers.qsize(),
+            "queued_writes": self._write_queue.qsize(),
+            "writes_per_batch": round(self._stats["writes"] / batches, 2) if batches else None,
+            "commit_latency": {
+                "samples": len(latencies),
+                "p50_ms": _percentile(latencies, 0.50),
+                "p95_ms": _percentile(latencies, 0.95),
+                "max_ms": round(latencies[-1], 3) if latencies else None,
+            },
+        }
+
+    @staticmethod
+    async def _connect(database: str, profile: PragmaProfile, uri: bool = False) -> aiosqlite.Connection:
+        connection = await aiosqlite.connect(database, uri=uri)
+        connection.row_factory = aiosqlite.Row
+        for statement in profile.statements():
+            await connection.execute(statement)
+        return connection
+
+    async def _writer_loop(self) -> None:
+        while True:
+            batch = [await self._write_queue.get()]
+            try:
+                if self._commit_window_seconds > 0:
+                    # 짧게 기다려 다른 요청의 쓰기까지 같은 커밋에 태운다
+                    await asyncio.sleep(self._commit_window_seconds)
+                while len(batch) < self._max_batch_size and not self._write_queue.empty():
+                    batch.append(self._write_queue.get_nowait())
+                await self._run_batch(batch)
+            except asyncio.CancelledError:
+                # close() 중 취소: 커밋되지 않은 배치는 writer 연결을 닫을 때 롤백되므로 호출자에게 알린다
+                _fail_unresolved(batch, RuntimeError("DB_POOL_CLOSED"))
+                raise
+
+    async def _run_batch(self, batch: list[_WriteRequest]) -> None:
+        db = self.writer
+        results: list[tuple[_WriteRequest, Any]] = []
+        started = time.perf_counter()
+        try:
+            if not db.in_transaction:
+                # 바깥 트랜잭션이 없으면 최상위 SAVEPOINT의 RELEASE가 곧 커밋이 되므로 먼저 연다
+                await db.execute("BEGIN")
+            for idx, request in enumerate(batch):
+                if request.future.cancelled():
+                    continue
+                savepoint = f"write_{idx}"
+                await db.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    result = await request.op(db)
+                except Exception as exc:
+                    self._stats["write_errors"] += 1
+                    await db.execute(f"ROLLBACK TO {savepoint}")
+                    await db.execute(f"RELEASE {savepoint}")
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+                    continue
+                await db.execute(f"RELEASE {savepoint}")
+                results.append((request, result))
+            started = time.perf_counter()
+            await db.commit()
+        except Exception as exc:
+            # SAVEPOINT가 사라졌거나(누군가 writer를 직접 commit) 커밋이 실패하면 배치 원자성을 보장할 수 없다
+            logger.warning("DB group commit 실패: %s", exc)
+            await self._abort(db)
+            self._stats["write_errors"] += len(results)
+            _fail_unresolved(batch, exc)
+            return
+
+        self._commit_latencies_ms.append((time.perf_counter() - started) * 1000)
+        self._stats["write_batches"] += 1
+        self._stats["writes"] += len(results)
+        for request, result in results:
+            if not request.future.done():
+                request.future.set_result(result)
+
+    @staticmethod
+    async def _abort(db: aiosqlite.Connection) -> None:
+        if not db.in_transaction:
+            return
+        try:
+            await db.rollback()
+        except Exception:
+            logger.exception("DB 배치 롤백 실패")
+
+
+def _fail_unresolved(requests: list[_WriteRequest], exc: BaseException) -> None:
+    for request in requests:
+        if not request.future.done():
+            request.future.set_exception(exc)
+
+
+def _percentile(sorted_values: list[float], ratio: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(ratio * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
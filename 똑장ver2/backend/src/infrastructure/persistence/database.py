@@ -65,6 +65,29 @@ CREATE TABLE IF NOT EXISTS offline_price_snapshot (
     created_at         DATETIME NOT NULL
 );
 
+-- (매장, 품목)별 최신 스냅샷 (스냅샷 적재 시점에 갱신)
+CREATE TABLE IF NOT EXISTS latest_offline_price (
+    store_id           TEXT NOT NULL REFERENCES store_master(store_id),
+    product_norm_key   TEXT NOT NULL REFERENCES product_norm(product_norm_key),
+    price_snapshot_key TEXT NOT NULL,
+    price_won          INTEGER NOT NULL,
+    observed_at        DATETIME NOT NULL,
+    source             TEXT NOT NULL,
+    notice             TEXT NOT NULL,
+    PRIMARY KEY (store_id, product_norm_key)
+);
+CREATE INDEX IF NOT EXISTS idx_latest_offline_price_product ON latest_offline_price(product_norm_key);
+
+-- 품목별 가격 이상치 허용 범위 (스냅샷 적재 시점에 갱신)
+CREATE TABLE IF NOT EXISTS offline_price_guardrail (
+    product_norm_key TEXT PRIMARY KEY REFERENCES product_norm(product_norm_key),
+    median_price     REAL NOT NULL,
+    lower_bound      INTEGER NOT NULL,
+    upper_bound      INTEGER NOT NULL,
+    sample_count     INTEGER NOT NULL,
+    updated_at       DATETIME NOT NULL
+);
+
 -- 캐시 테이블
 CREATE TABLE IF NOT EXISTS cache_entries (
     cache_key  TEXT PRIMARY KEY,
@@ -102,6 +125,7 @@ CREATE INDEX IF NOT EXISTS idx_auth_sessions_user_id ON auth_sessions(user_id);
 CREATE TABLE IF NOT EXISTS user_baskets (
     user_id     TEXT PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
     basket_json TEXT NOT NULL,
+    version     INTEGER NOT NULL DEFAULT 0,
     updated_at  DATETIME NOT NULL
 );
 
@@ -128,6 +152,16 @@ CREATE TABLE IF NOT EXISTS user_orders (
 );
 CREATE INDEX IF NOT EXISTS idx_user_orders_user_created ON user_orders(user_id, created_at DESC);
 
+-- 챗봇 대화 히스토리 (사용자별 최근 N개만 유지)
+CREATE TABLE IF NOT EXISTS chat_messages (
+    message_id  INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id     TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    role        TEXT NOT NULL,
+    content     TEXT NOT NULL,
+    created_at  DATETIME NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_user ON chat_messages(user_id, message_id);
+
 -- 예약 SoR + 실행 상태
 CREATE TABLE IF NOT EXISTS user_reservations (
     reservation_id      TEXT PRIMARY KEY,
@@ -188,6 +222,19 @@ CREATE INDEX IF NOT EXISTS idx_payment_intents_user_created
 ON payment_intents(user_id, created_at DESC);
 """
 
+# CREATE TABLE IF NOT EXISTS로는 반영되지 않는, 기존 테이블에 추가된 컬럼
+_ADDED_COLUMNS = (
+    ("user_baskets", "version", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+async def _add_missing_columns(db: aiosqlite.Connection) -> None:
+    for table, column, definition in _ADDED_COLUMNS:
+        cursor = await db.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in await cursor.fetchall()}
+        if column not in existing:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
 async def init_db():
     """DB 테이블 초기화"""
     # 디렉토리 자동 생성
@@ -196,6 +243,7 @@ async def init_db():
 
     async with aiosqlite.connect(settings.db_path) as db:
         await db.executescript(INIT_SQL)
+        await _add_missing_columns(db)
         await db.commit()
     
     async with aiosqlite.connect(settings.cache_db_path) as cache_db:
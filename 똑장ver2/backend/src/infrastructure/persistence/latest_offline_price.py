@@ -0,0 +1,126 @@
+"""오프라인 가격 스냅샷의 최신가/가드레일 물질화 테이블 관리.
+
+`offline_price_snapshot`은 동기화할 때마다 이력이 쌓이므로, 플랜 생성 시점에
+전체 이력을 정렬하지 않도록 쓰기 시점에 아래 두 테이블을 함께 갱신한다.
+
+- latest_offline_price: (매장, 품목)별 최신 스냅샷 1건
+- offline_price_guardrail: 품목별 중앙값 기반 이상치 허용 범위
+"""
+from __future__ import annotations
+
+import statistics
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+import aiosqlite
+
+MIN_REASONABLE_OFFLINE_UNIT_PRICE = 100
+OFFLINE_OUTLIER_LOWER_RATIO = 0.45
+OFFLINE_OUTLIER_UPPER_RATIO = 2.2
+
+_KEY_CHUNK_SIZE = 500
+
+
+def compute_price_guardrail(prices: list[int]) -> Optional[tuple[float, int, int]]:
+    """(중앙값, 하한, 상한). 유효 가격이 없으면 None."""
+    valid = [price for price in prices if price > 0]
+    if not valid:
+        return None
+    median_price = float(statistics.median(valid))
+    lower_bound = max(MIN_REASONABLE_OFFLINE_UNIT_PRICE, int(median_price * OFFLINE_OUTLIER_LOWER_RATIO))
+    upper_bound = max(lower_bound + 1, int(median_price * OFFLINE_OUTLIER_UPPER_RATIO))
+    return median_price, lower_bound, upper_bound
+
+
+async def refresh_latest_offline_prices(
+    db: aiosqlite.Connection,
+    product_keys: Optional[Iterable[str]] = None,
+) -> int:
+    """지정 품목(None이면 전체)의 최신가/가드레일을 스냅샷 이력에서 다시 계산.
+
+    커밋하지 않는다. 스냅샷을 적재한 호출자가 같은 트랜잭션 안에서 호출한다.
+    """
+    if product_keys is None:
+        await db.execute("DELETE FROM latest_offline_price")
+        await db.execute("DELETE FROM offline_price_guardrail")
+        return await _refresh_chunk(db, None)
+
+    unique_keys = list(dict.fromkeys(str(key) for key in product_keys if key))
+    refreshed = 0
+    for offset in range(0, len(unique_keys), _KEY_CHUNK_SIZE):
+        chunk = unique_keys[offset : offset + _KEY_CHUNK_SIZE]
+        placeholders = ",".join("?" for _ in chunk)
+        await db.execute(f"DELETE FROM latest_offline_price WHERE product_norm_key IN ({placeholders})", chunk)
+        await db.execute(f"DELETE FROM offline_price_guardrail WHERE product_norm_key IN ({placeholders})", chunk)
+        refreshed += await _refresh_chunk(db, chunk)
+    return refreshed
+
+
+async def ensure_latest_offline_prices(db: aiosqlite.Connection) -> int:
+    """기존 DB에 물질화 테이블이 비어 있으면 전체 이력으로 채운다."""
+    cursor = await db.execute("SELECT 1 FROM latest_offline_price LIMIT 1")
+    has_latest = await cursor.fetchone()
+    await cursor.close()
+    if has_latest:
+        return 0
+
+    cursor = await db.execute("SELECT 1 FROM offline_price_snapshot LIMIT 1")
+    has_snapshot = await cursor.fetchone()
+    await cursor.close()
+    if not has_snapshot:
+        return 0
+
+    refreshed = await refresh_latest_offline_prices(db)
+    await db.commit()
+    return refreshed
+
+
+async def _refresh_chunk(db: aiosqlite.Connection, product_keys: Optional[list[str]]) -> int:
+    where = ""
+    params: list[str] = []
+    if product_keys is not None:
+        where = f"WHERE product_norm_key IN ({','.join('?' for _ in product_keys)})"
+        params = product_keys
+
+    await db.execute(
+        f"""INSERT INTO latest_offline_price
+            (store_id, product_norm_key, price_snapshot_key, price_won, observed_at, source, notice)
+            SELECT store_id, product_norm_key, price_snapshot_key, price_won, observed_at, source, notice
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY store_id, product_norm_key
+                    ORDER BY observed_at DESC, created_at DESC
+                ) AS _rank
+                FROM offline_price_snapshot
+                {where}
+            )
+            WHERE _rank = 1""",
+        params,
+    )
+
+    cursor = await db.execute(
+        f"SELECT product_norm_key, price_won FROM offline_price_snapshot {where}",
+        params,
+    )
+    rows = await cursor.fetchall()
+    await cursor.close()
+
+    prices_by_key: dict[str, list[int]] = {}
+    for row in rows:
+        prices_by_key.setdefault(str(row[0]), []).append(int(row[1]))
+
+    updated_at = datetime.now(timezone.utc).isoformat()
+    guardrail_rows = []
+    for key, prices in prices_by_key.items():
+        guardrail = compute_price_guardrail(prices)
+        if guardrail is None:
+            continue
+        median_price, lower_bound, upper_bound = guardrail
+        guardrail_rows.append((key, median_price, lower_bound, upper_bound, len(prices), updated_at))
+    await db.executemany(
+        """INSERT OR REPLACE INTO offline_price_guardrail
+           (product_norm_key, median_price, lower_bound, upper_bound, sample_count, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        guardrail_rows,
+    )
+    return len(prices_by_key)
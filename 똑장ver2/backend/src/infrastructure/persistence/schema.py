@@ -60,6 +60,30 @@ offline_price_snapshot = Table(
     CheckConstraint("price_won > 0", name="ck_offline_price_snapshot_price_won_positive"),
 )
 
+latest_offline_price = Table(
+    "latest_offline_price",
+    metadata,
+    Column("store_id", String(64), ForeignKey("store_master.store_id"), primary_key=True),
+    Column("product_norm_key", String(128), ForeignKey("product_norm.product_norm_key"), primary_key=True),
+    Column("price_snapshot_key", String(160), nullable=False),
+    Column("price_won", Integer, nullable=False),
+    Column("observed_at", String(64), nullable=False),
+    Column("source", String(120), nullable=False),
+    Column("notice", String(255), nullable=False),
+)
+Index("idx_latest_offline_price_product", latest_offline_price.c.product_norm_key)
+
+offline_price_guardrail = Table(
+    "offline_price_guardrail",
+    metadata,
+    Column("product_norm_key", String(128), ForeignKey("product_norm.product_norm_key"), primary_key=True),
+    Column("median_price", Float, nullable=False),
+    Column("lower_bound", Integer, nullable=False),
+    Column("upper_bound", Integer, nullable=False),
+    Column("sample_count", Integer, nullable=False),
+    Column("updated_at", String(64), nullable=False),
+)
+
 cache_entries = Table(
     "cache_entries",
     metadata,
@@ -101,6 +125,7 @@ user_baskets = Table(
     metadata,
     Column("user_id", String(64), ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True),
     Column("basket_json", Text, nullable=False),
+    Column("version", Integer, nullable=False, server_default="0"),
     Column("updated_at", String(64), nullable=False),
 )
 
@@ -130,6 +155,17 @@ user_orders = Table(
 )
 Index("idx_user_orders_user_created", user_orders.c.user_id, user_orders.c.created_at)
 
+chat_messages = Table(
+    "chat_messages",
+    metadata,
+    Column("message_id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", String(64), ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False),
+    Column("role", String(16), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("created_at", String(64), nullable=False),
+)
+Index("idx_chat_messages_user", chat_messages.c.user_id, chat_messages.c.message_id)
+
 user_reservations = Table(
     "user_reservations",
     metadata,
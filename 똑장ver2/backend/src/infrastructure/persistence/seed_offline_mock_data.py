@@ -7,6 +7,8 @@ from pathlib import Path
 
 import aiosqlite
 
+from src.infrastructure.persistence.latest_offline_price import refresh_latest_offline_prices
+
 logger = logging.getLogger(__name__)
 
 
@@ -100,6 +102,7 @@ async def seed_offline_mock_data(db: aiosqlite.Connection) -> dict[str, int]:
                 ),
             )
 
+        await refresh_latest_offline_prices(db)
         await db.commit()
     except Exception:
         await db.rollback()
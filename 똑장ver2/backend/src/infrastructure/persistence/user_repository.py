@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
 from uuid import uuid4
 from zoneinfo import ZoneInfo
 
 import aiosqlite
 
 from src.domain.models.basket import Basket
+from src.infrastructure.persistence.auth_session_cache import get_auth_session_cache
+
+if TYPE_CHECKING:
+    from src.infrastructure.persistence.connection_pool import SqliteConnectionPool
 
 
 DEFAULT_PREFERENCES = {"like": [], "dislike": []}
@@ -119,23 +124,112 @@ def compute_next_one_time_run(next_run_at: str | None, timezone_name: str) -> st
     return _to_iso(rounded.astimezone(timezone.utc))
 
 
+Statement = tuple[str, tuple[Any, ...]]
+
+
+async def _select(db: aiosqlite.Connection, query: str, params: tuple[Any, ...]) -> list[aiosqlite.Row]:
+    cursor = await db.execute(query, params)
+    rows = await cursor.fetchall()
+    await cursor.close()
+    return list(rows)
+
+
+def _chat_head_statement(user_id: str, since: int) -> Statement:
+    return (
+        """
+        SELECT COALESCE(MAX(message_id), 0), COUNT(*) FILTER (WHERE message_id > ?)
+        FROM chat_messages
+        WHERE user_id = ?
+        """,
+        (int(since), user_id),
+    )
+
+
 class UserRepository:
-    """사용자별 데이터 SoR를 위한 sqlite repository."""
+    """사용자별 데이터 SoR를 위한 sqlite repository.
+
+    읽기는 연결 풀이 있으면 읽기 연결에서 커밋된 데이터만 본다.
+    쓰기는 `_write()`로 모은다. 연결 풀이 있으면 writer 큐로 보내 다른 요청의 쓰기와
+    한 번에 커밋(group commit)하고, `unit_of_work()` 안에서는 요청 안의 쓰기를 모았다가
+    블록이 끝날 때 한 트랜잭션으로 반영한다. API에서는 요청마다 인스턴스 하나를 공유한다
+    (`dependencies.user_repository`).
+    """
 
-    def __init__(self, db: aiosqlite.Connection):
+    def __init__(self, db: aiosqlite.Connection, pool: SqliteConnectionPool | None = None):
         self.db = db
+        self.pool = pool
+        self._pending: list[Statement] | None = None
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def in_unit_of_work(self) -> bool:
+        return self._pending is not None
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """unit of work의 쓰기가 반영된 뒤 실행할 작업 (캐시 갱신 등). 블록이 실패하면 버린다."""
+        self._after_commit.append(callback)
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator["UserRepository"]:
+        """블록 안의 쓰기를 모아 끝날 때 한 번에 커밋한다. 예외가 나면 버린다.
+
+        블록 안에서는 아직 반영 전인 쓰기가 조회에 보이지 않는다. 곧바로 다시 읽어야 하는
+        쓰기(`flush=True`)는 그때까지 모인 것과 함께 즉시 반영된다.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        except BaseException:
+            self._pending = None
+            self._after_commit.clear()
+            raise
+        pending, self._pending = self._pending, None
+        callbacks, self._after_commit = self._after_commit, []
+        await self._apply(pending)
+        for callback in callbacks:
+            await callback()
+
+    async def _write(self, *statements: Statement, flush: bool = False) -> list[aiosqlite.Row]:
+        """쓰기를 반영하고 마지막 문장의 결과 행(RETURNING)을 돌려준다. 미뤄지면 빈 목록."""
+        if self._pending is not None:
+            self._pending.extend(statements)
+            if not flush:
+                return []
+            statements, self._pending = tuple(self._pending), []
+        return await self._apply(list(statements))
+
+    async def _apply(self, statements: list[Statement]) -> list[aiosqlite.Row]:
+        if not statements:
+            return []
+
+        async def op(db: aiosqlite.Connection) -> list[aiosqlite.Row]:
+            rows: list[aiosqlite.Row] = []
+            for query, params in statements:
+                cursor = await db.execute(query, params)
+                rows = list(await cursor.fetchall())
+                await cursor.close()
+            return rows
+
+        if self.pool is not None:
+            return await self.pool.write(op)
+        rows = await op(self.db)
+        await self.db.commit()
+        return rows
 
     async def _fetchone(self, query: str, params: tuple[Any, ...] = ()) -> aiosqlite.Row | None:
-        cursor = await self.db.execute(query, params)
-        row = await cursor.fetchone()
-        await cursor.close()
-        return row
+        rows = await self._fetchall(query, params)
+        return rows[0] if rows else None
 
     async def _fetchall(self, query: str, params: tuple[Any, ...] = ()) -> list[aiosqlite.Row]:
-        cursor = await self.db.execute(query, params)
-        rows = await cursor.fetchall()
-        await cursor.close()
-        return rows
+        if self.pool is None:
+            return await _select(self.db, query, params)
+        # writer 연결은 group commit 배치가 열어 둔 트랜잭션 안에 있어 커밋 전 쓰기가 보인다.
+        # 읽기는 커밋된 것만 보는 읽기 연결로 (pool.write()는 커밋 뒤에 반환하므로 자기 쓰기는 보인다)
+        async with self.pool.reader() as db:
+            return await _select(db, query, params)
 
     # --- User / Auth -------------------------------------------------
 
@@ -154,68 +248,88 @@ class UserRepository:
 
         if existing:
             if name and (existing.get("name") or "") != name.strip():
-                await self.db.execute(
-                    "UPDATE users SET name = ?, updated_at = ? WHERE user_id = ?",
-                    (name.strip(), now, existing["user_id"]),
+                await self._write(
+                    (
+                        "UPDATE users SET name = ?, updated_at = ? WHERE user_id = ?",
+                        (name.strip(), now, existing["user_id"]),
+                    ),
+                    flush=True,
                 )
-                await self.db.commit()
+                get_auth_session_cache().invalidate_user(existing["user_id"])
                 existing = await self.get_user_by_id(existing["user_id"])
             await self.ensure_user_defaults(existing["user_id"])
             return existing or {}
 
         user_id = f"usr-{uuid4().hex[:20]}"
-        await self.db.execute(
-            """
-            INSERT INTO users (user_id, email, name, is_active, created_at, updated_at)
-            VALUES (?, ?, ?, 1, ?, ?)
-            """,
-            (user_id, normalized_email, (name or "").strip() or None, now, now),
+        await self._write(
+            (
+                """
+                INSERT INTO users (user_id, email, name, is_active, created_at, updated_at)
+                VALUES (?, ?, ?, 1, ?, ?)
+                """,
+                (user_id, normalized_email, (name or "").strip() or None, now, now),
+            ),
+            flush=True,
         )
-        await self.db.commit()
         await self.ensure_user_defaults(user_id)
         created = await self.get_user_by_id(user_id)
         return created or {}
 
     async def ensure_user_defaults(self, user_id: str) -> None:
+        # 조회 경로마다 불리므로 이미 있으면 쓰기(커밋) 없이 끝낸다
+        row = await self._fetchone(
+            """
+            SELECT
+                EXISTS(SELECT 1 FROM user_baskets WHERE user_id = ?) AS has_basket,
+                EXISTS(SELECT 1 FROM user_preferences WHERE user_id = ?) AS has_preferences,
+                EXISTS(SELECT 1 FROM user_profiles WHERE user_id = ?) AS has_profile
+            """,
+            (user_id, user_id, user_id),
+        )
+        if row and all(row):
+            return
+
         now = _to_iso(_now_utc())
         user = await self.get_user_by_id(user_id)
         email = (user or {}).get("email", "")
         name = (user or {}).get("name", "") or "사용자"
 
-        await self.db.execute(
-            """
-            INSERT OR IGNORE INTO user_baskets (user_id, basket_json, updated_at)
-            VALUES (?, ?, ?)
-            """,
-            (user_id, json.dumps({"items": []}, ensure_ascii=False), now),
-        )
-        await self.db.execute(
-            """
-            INSERT OR IGNORE INTO user_preferences (user_id, preferences_json, updated_at)
-            VALUES (?, ?, ?)
-            """,
-            (user_id, json.dumps(DEFAULT_PREFERENCES, ensure_ascii=False), now),
-        )
-        await self.db.execute(
-            """
-            INSERT OR IGNORE INTO user_profiles (user_id, profile_json, updated_at)
-            VALUES (?, ?, ?)
-            """,
+        await self._write(
             (
-                user_id,
-                json.dumps(
-                    {
-                        "name": name,
-                        "email": email,
-                        "phone": "",
-                        "addresses": [],
-                    },
-                    ensure_ascii=False,
+                """
+                INSERT OR IGNORE INTO user_baskets (user_id, basket_json, updated_at)
+                VALUES (?, ?, ?)
+                """,
+                (user_id, json.dumps({"items": []}, ensure_ascii=False), now),
+            ),
+            (
+                """
+                INSERT OR IGNORE INTO user_preferences (user_id, preferences_json, updated_at)
+                VALUES (?, ?, ?)
+                """,
+                (user_id, json.dumps(DEFAULT_PREFERENCES, ensure_ascii=False), now),
+            ),
+            (
+                """
+                INSERT OR IGNORE INTO user_profiles (user_id, profile_json, updated_at)
+                VALUES (?, ?, ?)
+                """,
+                (
+                    user_id,
+                    json.dumps(
+                        {
+                            "name": name,
+                            "email": email,
+                            "phone": "",
+                            "addresses": [],
+                        },
+                        ensure_ascii=False,
+                    ),
+                    now,
                 ),
-                now,
             ),
+            flush=True,
         )
-        await self.db.commit()
 
     async def create_session(
         self,
@@ -228,27 +342,29 @@ class UserRepository:
         ip_address: str | None,
     ) -> None:
         now = _to_iso(_now_utc())
-        await self.db.execute(
-            """
-            INSERT INTO auth_sessions (
-                session_id, user_id, refresh_token_hash, refresh_expires_at,
-                revoked_at, user_agent, ip_address, created_at, last_used_at
-            ) VALUES (?, ?, ?, ?, NULL, ?, ?, ?, ?)
-            """,
-            (session_id, user_id, refresh_token_hash, refresh_expires_at, user_agent, ip_address, now, now),
+        await self._write(
+            (
+                """
+                INSERT INTO auth_sessions (
+                    session_id, user_id, refresh_token_hash, refresh_expires_at,
+                    revoked_at, user_agent, ip_address, created_at, last_used_at
+                ) VALUES (?, ?, ?, ?, NULL, ?, ?, ?, ?)
+                """,
+                (session_id, user_id, refresh_token_hash, refresh_expires_at, user_agent, ip_address, now, now),
+            )
         )
-        await self.db.commit()
 
     async def get_session(self, session_id: str) -> dict[str, Any] | None:
         row = await self._fetchone("SELECT * FROM auth_sessions WHERE session_id = ?", (session_id,))
         return dict(row) if row else None
 
     async def touch_session(self, session_id: str) -> None:
-        await self.db.execute(
-            "UPDATE auth_sessions SET last_used_at = ? WHERE session_id = ?",
-            (_to_iso(_now_utc()), session_id),
+        await self._write(
+            (
+                "UPDATE auth_sessions SET last_used_at = ? WHERE session_id = ?",
+                (_to_iso(_now_utc()), session_id),
+            )
         )
-        await self.db.commit()
 
     async def rotate_refresh_token(
         self,
@@ -258,22 +374,28 @@ class UserRepository:
         refresh_expires_at: str,
     ) -> None:
         now = _to_iso(_now_utc())
-        await self.db.execute(
-            """
-            UPDATE auth_sessions
-            SET refresh_token_hash = ?, refresh_expires_at = ?, last_used_at = ?, revoked_at = NULL
-            WHERE session_id = ?
-            """,
-            (refresh_token_hash, refresh_expires_at, now, session_id),
+        await self._write(
+            (
+                """
+                UPDATE auth_sessions
+                SET refresh_token_hash = ?, refresh_expires_at = ?, last_used_at = ?, revoked_at = NULL
+                WHERE session_id = ?
+                """,
+                (refresh_token_hash, refresh_expires_at, now, session_id),
+            ),
+            flush=True,
         )
-        await self.db.commit()
+        get_auth_session_cache().invalidate_session(session_id)
 
     async def revoke_session(self, session_id: str) -> None:
-        await self.db.execute(
-            "UPDATE auth_sessions SET revoked_at = ?, last_used_at = ? WHERE session_id = ?",
-            (_to_iso(_now_utc()), _to_iso(_now_utc()), session_id),
+        await self._write(
+            (
+                "UPDATE auth_sessions SET revoked_at = ?, last_used_at = ? WHERE session_id = ?",
+                (_to_iso(_now_utc()), _to_iso(_now_utc()), session_id),
+            ),
+            flush=True,
         )
-        await self.db.commit()
+        get_auth_session_cache().invalidate_session(session_id)
 
     # --- Basket / Preferences ---------------------------------------
 
@@ -292,17 +414,71 @@ class UserRepository:
     async def save_basket(self, user_id: str, basket: Basket) -> None:
         await self.ensure_user_defaults(user_id)
         payload = json.dumps(basket.model_dump(mode="json"), ensure_ascii=False)
-        await self.db.execute(
-            """
-            INSERT INTO user_baskets (user_id, basket_json, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE
-            SET basket_json = excluded.basket_json,
-                updated_at = excluded.updated_at
-            """,
-            (user_id, payload, _to_iso(_now_utc())),
+        await self._write(
+            (
+                """
+                INSERT INTO user_baskets (user_id, basket_json, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE
+                SET basket_json = excluded.basket_json,
+                    version = user_baskets.version + 1,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, payload, _to_iso(_now_utc())),
+            )
         )
-        await self.db.commit()
+
+    async def get_basket_version(self, user_id: str) -> int | None:
+        row = await self._fetchone("SELECT version FROM user_baskets WHERE user_id = ?", (user_id,))
+        return int(row[0]) if row else None
+
+    async def get_basket_payload(self, user_id: str) -> tuple[str, int]:
+        """장바구니 원본 JSON과 행 버전. 파싱은 호출자(버전 캐시)가 필요할 때만 한다."""
+        await self.ensure_user_defaults(user_id)
+        row = await self._fetchone(
+            "SELECT basket_json, version FROM user_baskets WHERE user_id = ?",
+            (user_id,),
+        )
+        if not row:
+            return json.dumps({"items": []}), 0
+        return str(row[0]), int(row[1])
+
+    async def save_basket_payload(
+        self,
+        user_id: str,
+        payload: str,
+        *,
+        expected_version: int | None = None,
+    ) -> int | None:
+        """장바구니 JSON을 저장하고 새 버전을 돌려준다.
+
+        `expected_version`이 주어지면 그 버전일 때만 바꾸고(낙관적 동시성), 그 사이 다른
+        워커가 먼저 고쳤으면 None을 돌려준다.
+        """
+        await self.ensure_user_defaults(user_id)
+        now = _to_iso(_now_utc())
+        if expected_version is None:
+            statement: Statement = (
+                """
+                UPDATE user_baskets
+                SET basket_json = ?, version = version + 1, updated_at = ?
+                WHERE user_id = ?
+                RETURNING version
+                """,
+                (payload, now, user_id),
+            )
+        else:
+            statement = (
+                """
+                UPDATE user_baskets
+                SET basket_json = ?, version = version + 1, updated_at = ?
+                WHERE user_id = ? AND version = ?
+                RETURNING version
+                """,
+                (payload, now, user_id, int(expected_version)),
+            )
+        rows = await self._write(statement, flush=True)
+        return int(rows[0][0]) if rows else None
 
     async def get_preferences(self, user_id: str) -> dict[str, list[str]]:
         await self.ensure_user_defaults(user_id)
@@ -322,17 +498,18 @@ class UserRepository:
     async def save_preferences(self, user_id: str, preferences: dict[str, Any]) -> dict[str, list[str]]:
         normalized = _normalize_preferences(preferences)
         await self.ensure_user_defaults(user_id)
-        await self.db.execute(
-            """
-            INSERT INTO user_preferences (user_id, preferences_json, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE
-            SET preferences_json = excluded.preferences_json,
-                updated_at = excluded.updated_at
-            """,
-            (user_id, json.dumps(normalized, ensure_ascii=False), _to_iso(_now_utc())),
+        await self._write(
+            (
+                """
+                INSERT INTO user_preferences (user_id, preferences_json, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE
+                SET preferences_json = excluded.preferences_json,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, json.dumps(normalized, ensure_ascii=False), _to_iso(_now_utc())),
+            )
         )
-        await self.db.commit()
         return normalized
 
     # --- Profile / Orders -------------------------------------------
@@ -369,21 +546,24 @@ class UserRepository:
             "addresses": list(profile.get("addresses", current.get("addresses", []))),
         }
 
-        await self.db.execute(
-            """
-            INSERT INTO user_profiles (user_id, profile_json, updated_at)
-            VALUES (?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE
-            SET profile_json = excluded.profile_json,
-                updated_at = excluded.updated_at
-            """,
-            (user_id, json.dumps(merged, ensure_ascii=False), _to_iso(_now_utc())),
-        )
-        await self.db.execute(
-            "UPDATE users SET name = ?, updated_at = ? WHERE user_id = ?",
-            (merged["name"], _to_iso(_now_utc()), user_id),
+        await self._write(
+            (
+                """
+                INSERT INTO user_profiles (user_id, profile_json, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE
+                SET profile_json = excluded.profile_json,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, json.dumps(merged, ensure_ascii=False), _to_iso(_now_utc())),
+            ),
+            (
+                "UPDATE users SET name = ?, updated_at = ? WHERE user_id = ?",
+                (merged["name"], _to_iso(_now_utc()), user_id),
+            ),
+            flush=True,
         )
-        await self.db.commit()
+        get_auth_session_cache().invalidate_user(user_id)
         return merged
 
     async def list_orders(self, user_id: str, *, limit: int = 200) -> list[dict[str, Any]]:
@@ -411,16 +591,17 @@ class UserRepository:
         order_id = str(payload.get("id") or f"ORD-{int(_now_utc().timestamp() * 1000)}")
         stored = dict(payload)
         stored["id"] = order_id
-        await self.db.execute(
-            """
-            INSERT INTO user_orders (order_id, user_id, order_json, created_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(order_id) DO UPDATE
-            SET order_json = excluded.order_json
-            """,
-            (order_id, user_id, json.dumps(stored, ensure_ascii=False), now),
+        await self._write(
+            (
+                """
+                INSERT INTO user_orders (order_id, user_id, order_json, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(order_id) DO UPDATE
+                SET order_json = excluded.order_json
+                """,
+                (order_id, user_id, json.dumps(stored, ensure_ascii=False), now),
+            )
         )
-        await self.db.commit()
         return stored
 
     # --- Reservations ------------------------------------------------
@@ -492,39 +673,41 @@ class UserRepository:
         now = _to_iso(_now_utc())
         planned_items = _normalize_list(list(payload.get("planned_items") or []))
 
-        await self.db.execute(
-            """
-            INSERT INTO user_reservations (
-                reservation_id, user_id, label, weekday, time, enabled, status,
-                schedule_type, next_run_at, timezone, channel,
-                source_order_id, source_mart_name, planned_items_json,
-                last_run_at, last_result_status, retry_count,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        await self._write(
             (
-                reservation_id,
-                user_id,
-                str(payload.get("label") or "장보기 예약").strip()[:100],
-                weekday,
-                time_str,
-                int(bool(payload.get("enabled", True))),
-                str(payload.get("status") or "active"),
-                schedule_type,
-                normalized_next_run_at,
-                timezone_name,
-                str(payload.get("channel") or "in_app"),
-                payload.get("source_order_id"),
-                payload.get("source_mart_name"),
-                json.dumps(planned_items, ensure_ascii=False),
-                payload.get("last_run_at"),
-                payload.get("last_result_status"),
-                int(payload.get("retry_count") or 0),
-                now,
-                now,
+                """
+                INSERT INTO user_reservations (
+                    reservation_id, user_id, label, weekday, time, enabled, status,
+                    schedule_type, next_run_at, timezone, channel,
+                    source_order_id, source_mart_name, planned_items_json,
+                    last_run_at, last_result_status, retry_count,
+                    created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    reservation_id,
+                    user_id,
+                    str(payload.get("label") or "장보기 예약").strip()[:100],
+                    weekday,
+                    time_str,
+                    int(bool(payload.get("enabled", True))),
+                    str(payload.get("status") or "active"),
+                    schedule_type,
+                    normalized_next_run_at,
+                    timezone_name,
+                    str(payload.get("channel") or "in_app"),
+                    payload.get("source_order_id"),
+                    payload.get("source_mart_name"),
+                    json.dumps(planned_items, ensure_ascii=False),
+                    payload.get("last_run_at"),
+                    payload.get("last_result_status"),
+                    int(payload.get("retry_count") or 0),
+                    now,
+                    now,
+                ),
             ),
+            flush=True,
         )
-        await self.db.commit()
         created = await self.get_reservation(user_id, reservation_id)
         return created or {}
 
@@ -562,45 +745,48 @@ class UserRepository:
 
         planned_items = _normalize_list(list(next_record.get("planned_items") or []))
 
-        await self.db.execute(
-            """
-            UPDATE user_reservations
-            SET label = ?, weekday = ?, time = ?, enabled = ?, status = ?,
-                schedule_type = ?, next_run_at = ?, timezone = ?, channel = ?,
-                source_order_id = ?, source_mart_name = ?, planned_items_json = ?,
-                last_run_at = ?, last_result_status = ?, retry_count = ?, updated_at = ?
-            WHERE user_id = ? AND reservation_id = ?
-            """,
+        await self._write(
             (
-                str(next_record.get("label") or "장보기 예약").strip()[:100],
-                weekday,
-                time_str,
-                int(bool(next_record.get("enabled", True))),
-                str(next_record.get("status") or "active"),
-                schedule_type,
-                next_record.get("next_run_at"),
-                timezone_name,
-                str(next_record.get("channel") or "in_app"),
-                next_record.get("source_order_id"),
-                next_record.get("source_mart_name"),
-                json.dumps(planned_items, ensure_ascii=False),
-                next_record.get("last_run_at"),
-                next_record.get("last_result_status"),
-                int(next_record.get("retry_count") or 0),
-                _to_iso(_now_utc()),
-                user_id,
-                reservation_id,
+                """
+                UPDATE user_reservations
+                SET label = ?, weekday = ?, time = ?, enabled = ?, status = ?,
+                    schedule_type = ?, next_run_at = ?, timezone = ?, channel = ?,
+                    source_order_id = ?, source_mart_name = ?, planned_items_json = ?,
+                    last_run_at = ?, last_result_status = ?, retry_count = ?, updated_at = ?
+                WHERE user_id = ? AND reservation_id = ?
+                """,
+                (
+                    str(next_record.get("label") or "장보기 예약").strip()[:100],
+                    weekday,
+                    time_str,
+                    int(bool(next_record.get("enabled", True))),
+                    str(next_record.get("status") or "active"),
+                    schedule_type,
+                    next_record.get("next_run_at"),
+                    timezone_name,
+                    str(next_record.get("channel") or "in_app"),
+                    next_record.get("source_order_id"),
+                    next_record.get("source_mart_name"),
+                    json.dumps(planned_items, ensure_ascii=False),
+                    next_record.get("last_run_at"),
+                    next_record.get("last_result_status"),
+                    int(next_record.get("retry_count") or 0),
+                    _to_iso(_now_utc()),
+                    user_id,
+                    reservation_id,
+                ),
             ),
+            flush=True,
         )
-        await self.db.commit()
         return await self.get_reservation(user_id, reservation_id)
 
     async def delete_reservation(self, user_id: str, reservation_id: str) -> None:
-        await self.db.execute(
-            "DELETE FROM user_reservations WHERE user_id = ? AND reservation_id = ?",
-            (user_id, reservation_id),
+        await self._write(
+            (
+                "DELETE FROM user_reservations WHERE user_id = ? AND reservation_id = ?",
+                (user_id, reservation_id),
+            )
         )
-        await self.db.commit()
 
     async def dispatch_due_reservations(self, now_utc: datetime | None = None) -> int:
         now = now_utc or _now_utc()
@@ -616,6 +802,7 @@ class UserRepository:
             (_to_iso(now),),
         )
 
+        statements: list[Statement] = []
         dispatched_count = 0
         for row in rows:
             record = dict(row)
@@ -639,56 +826,134 @@ class UserRepository:
                     next_run_at = None
                     status = "awaiting_approval"
 
-                await self.db.execute(
-                    """
-                    UPDATE user_reservations
-                    SET status = ?,
-                        next_run_at = ?,
-                        last_run_at = ?,
-                        last_result_status = ?,
-                        retry_count = ?,
-                        updated_at = ?
-                    WHERE reservation_id = ?
-                    """,
+                statements.append(
                     (
-                        status,
-                        next_run_at,
-                        _to_iso(now),
-                        "approval_required",
-                        retry_count,
-                        _to_iso(now),
-                        reservation_id,
-                    ),
+                        """
+                        UPDATE user_reservations
+                        SET status = ?,
+                            next_run_at = ?,
+                            last_run_at = ?,
+                            last_result_status = ?,
+                            retry_count = ?,
+                            updated_at = ?
+                        WHERE reservation_id = ?
+                        """,
+                        (
+                            status,
+                            next_run_at,
+                            _to_iso(now),
+                            "approval_required",
+                            retry_count,
+                            _to_iso(now),
+                            reservation_id,
+                        ),
+                    )
                 )
                 dispatched_count += 1
             except Exception:
                 next_retry = _to_iso(now + timedelta(minutes=5))
                 next_retry_count = retry_count + 1
                 failed_status = "expired" if next_retry_count >= 3 else "active"
-                await self.db.execute(
-                    """
-                    UPDATE user_reservations
-                    SET status = ?,
-                        next_run_at = ?,
-                        last_result_status = ?,
-                        retry_count = ?,
-                        updated_at = ?
-                    WHERE reservation_id = ?
-                    """,
+                statements.append(
                     (
-                        failed_status,
-                        next_retry,
-                        "dispatch_failed",
-                        next_retry_count,
-                        _to_iso(now),
-                        reservation_id,
-                    ),
+                        """
+                        UPDATE user_reservations
+                        SET status = ?,
+                            next_run_at = ?,
+                            last_result_status = ?,
+                            retry_count = ?,
+                            updated_at = ?
+                        WHERE reservation_id = ?
+                        """,
+                        (
+                            failed_status,
+                            next_retry,
+                            "dispatch_failed",
+                            next_retry_count,
+                            _to_iso(now),
+                            reservation_id,
+                        ),
+                    )
                 )
 
-        if rows:
-            await self.db.commit()
+        await self._write(*statements)
         return dispatched_count
 
+    # --- Chat history ------------------------------------------------
+
+    async def get_chat_head(self, user_id: str) -> int:
+        """사용자의 마지막 메시지 ID (없으면 0). 다른 워커의 추가 여부 확인용."""
+        row = await self._fetchone(
+            "SELECT COALESCE(MAX(message_id), 0) FROM chat_messages WHERE user_id = ?",
+            (user_id,),
+        )
+        return int(row[0]) if row else 0
+
+    async def list_chat_messages(self, user_id: str, *, limit: int) -> tuple[list[tuple[str, str]], int]:
+        rows = await self._fetchall(
+            """
+            SELECT message_id, role, content FROM chat_messages
+            WHERE user_id = ?
+            ORDER BY message_id DESC
+            LIMIT ?
+            """,
+            (user_id, max(1, limit)),
+        )
+        head = int(rows[0]["message_id"]) if rows else 0
+        return [(str(row["role"]), str(row["content"])) for row in reversed(rows)], head
+
+    async def append_chat_messages(
+        self,
+        user_id: str,
+        messages: list[tuple[str, str]],
+        *,
+        keep: int,
+        since: int = 0,
+    ) -> tuple[int, int] | None:
+        """메시지를 추가하고 최근 `keep`개만 남긴다.
+
+        (마지막 메시지 ID, `since` 이후 메시지 수)를 돌려준다. 호출자는 이 수로 그 사이 다른
+        워커가 메시지를 추가했는지 판단한다. unit of work 안에서는 쓰기를 미루고 None을
+        돌려주므로, 반영 후 `count_chat_messages_since`로 확인한다.
+        """
+        now = _to_iso(_now_utc())
+        statements: list[Statement] = [
+            (
+                "INSERT INTO chat_messages (user_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                (user_id, role, content, now),
+            )
+            for role, content in messages
+        ]
+        statements.append(
+            (
+                """
+                DELETE FROM chat_messages
+                WHERE user_id = ?
+                  AND message_id <= (
+                      SELECT message_id FROM chat_messages
+                      WHERE user_id = ?
+                      ORDER BY message_id DESC
+                      LIMIT 1 OFFSET ?
+                  )
+                """,
+                (user_id, user_id, max(1, keep)),
+            )
+        )
+        if self.in_unit_of_work:
+            await self._write(*statements)
+            return None
+        statements.append(_chat_head_statement(user_id, since))
+        rows = await self._write(*statements, flush=True)
+        return (int(rows[0][0]), int(rows[0][1])) if rows else (0, 0)
+
+    async def count_chat_messages_since(self, user_id: str, since: int) -> tuple[int, int]:
+        """(마지막 메시지 ID, `since` 이후 메시지 수)."""
+        row = await self._fetchone(*_chat_head_statement(user_id, since))
+        return (int(row[0]), int(row[1])) if row else (0, 0)
+
+    async def clear_chat_messages(self, user_id: str) -> None:
+        await self._write(("DELETE FROM chat_messages WHERE user_id = ?", (user_id,)), flush=True)
+
     # --- Plan request storage ---------------------------------------
 
     async def save_plan_request(
@@ -701,21 +966,22 @@ class UserRepository:
         ttl_hours: int = 24,
     ) -> None:
         now = _now_utc()
-        await self.db.execute(
-            """
-            INSERT INTO plan_requests (request_id, user_id, mode, response_json, created_at, expires_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+        await self._write(
             (
-                request_id,
-                user_id,
-                mode,
-                json.dumps(response, ensure_ascii=False),
-                _to_iso(now),
-                _to_iso(now + timedelta(hours=max(1, ttl_hours))),
-            ),
+                """
+                INSERT INTO plan_requests (request_id, user_id, mode, response_json, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    request_id,
+                    user_id,
+                    mode,
+                    json.dumps(response, ensure_ascii=False),
+                    _to_iso(now),
+                    _to_iso(now + timedelta(hours=max(1, ttl_hours))),
+                ),
+            )
         )
-        await self.db.commit()
 
     async def get_plan_request(self, *, request_id: str, user_id: str, mode: str) -> dict[str, Any] | None:
         row = await self._fetchone(
@@ -781,30 +1047,31 @@ class UserRepository:
         payload: dict[str, Any],
     ) -> None:
         now = _to_iso(_now_utc())
-        await self.db.execute(
-            """
-            INSERT INTO payment_intents (
-                intent_id, user_id, request_id, amount_won, currency, mall_name, plan_type,
-                status, idempotency_key, payload_json, result_json, created_at, updated_at, confirmed_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
-            """,
+        await self._write(
             (
-                intent_id,
-                user_id,
-                request_id,
-                amount_won,
-                currency,
-                mall_name,
-                plan_type,
-                status,
-                idempotency_key,
-                json.dumps(payload, ensure_ascii=False),
-                json.dumps({}, ensure_ascii=False),
-                now,
-                now,
-            ),
+                """
+                INSERT INTO payment_intents (
+                    intent_id, user_id, request_id, amount_won, currency, mall_name, plan_type,
+                    status, idempotency_key, payload_json, result_json, created_at, updated_at, confirmed_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
+                """,
+                (
+                    intent_id,
+                    user_id,
+                    request_id,
+                    amount_won,
+                    currency,
+                    mall_name,
+                    plan_type,
+                    status,
+                    idempotency_key,
+                    json.dumps(payload, ensure_ascii=False),
+                    json.dumps({}, ensure_ascii=False),
+                    now,
+                    now,
+                ),
+            )
         )
-        await self.db.commit()
 
     async def get_payment_intent(self, *, intent_id: str, user_id: str) -> dict[str, Any] | None:
         row = await self._fetchone(
@@ -838,24 +1105,26 @@ class UserRepository:
         confirmed: bool = False,
     ) -> dict[str, Any] | None:
         now = _to_iso(_now_utc())
-        await self.db.execute(
-            """
-            UPDATE payment_intents
-            SET status = ?,
-                result_json = ?,
-                updated_at = ?,
-                confirmed_at = CASE WHEN ? THEN ? ELSE confirmed_at END
-            WHERE intent_id = ? AND user_id = ?
-            """,
+        await self._write(
             (
-                status,
-                json.dumps(result, ensure_ascii=False),
-                now,
-                int(confirmed),
-                now,
-                intent_id,
-                user_id,
+                """
+                UPDATE payment_intents
+                SET status = ?,
+                    result_json = ?,
+                    updated_at = ?,
+                    confirmed_at = CASE WHEN ? THEN ? ELSE confirmed_at END
+                WHERE intent_id = ? AND user_id = ?
+                """,
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False),
+                    now,
+                    int(confirmed),
+                    now,
+                    intent_id,
+                    user_id,
+                ),
             ),
+            flush=True,
         )
-        await self.db.commit()
         return await self.get_payment_intent(intent_id=intent_id, user_id=user_id)
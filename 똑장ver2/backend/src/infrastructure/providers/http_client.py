@@ -0,0 +1,82 @@
+"""외부 API 공용 httpx.AsyncClient 풀.
+
+요청마다 AsyncClient를 만들면 TCP/TLS 연결을 매번 새로 맺는다. 앱 수명 동안
+업스트림 호스트별 클라이언트를 하나씩 유지해 keep-alive 연결을 재사용하고,
+호스트별 연결 수 상한을 둔다. HTTP/2는 `h2` 패키지가 설치된 경우에만 켠다.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:  # HTTP/2는 선택 의존성
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - 설치 환경에 따라 다름
+    _HTTP2_AVAILABLE = False
+
+
+class HttpClientPool:
+    """업스트림 이름(naver_shopping, kamis 등)별 공유 AsyncClient.
+
+    lifespan에서 만들어 `app.state.http_clients`에 두고, 종료 시 `aclose()`한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections_per_host: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry_seconds: float = 30.0,
+        connect_timeout_seconds: float = 3.0,
+        read_timeout_seconds: float = 10.0,
+        http2: bool = True,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max(1, max_connections_per_host),
+            max_keepalive_connections=max(0, max_keepalive_connections),
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self._timeout = httpx.Timeout(read_timeout_seconds, connect=connect_timeout_seconds)
+        self._http2 = bool(http2) and _HTTP2_AVAILABLE
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._closed = False
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "HttpClientPool":
+        return cls(
+            max_connections_per_host=settings.http_max_connections_per_host,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry_seconds=settings.http_keepalive_expiry_seconds,
+            connect_timeout_seconds=settings.http_connect_timeout_seconds,
+            read_timeout_seconds=settings.http_read_timeout_seconds,
+            http2=settings.http_enable_http2,
+        )
+
+    @property
+    def http2_enabled(self) -> bool:
+        return self._http2
+
+    def client(self, upstream: str) -> httpx.AsyncClient:
+        if self._closed:
+            raise RuntimeError("HTTP_CLIENT_POOL_CLOSED")
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self._limits, timeout=self._timeout, http2=self._http2)
+            self._clients[upstream] = client
+        return client
+
+    async def aclose(self) -> None:
+        self._closed = True
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as exc:
+                logger.warning("HTTP 클라이언트 종료 실패: %s", exc)
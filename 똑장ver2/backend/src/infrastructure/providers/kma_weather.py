@@ -4,10 +4,15 @@ from __future__ import annotations
 import logging
 from typing import Dict
 
+import httpx
+
 from src.infrastructure.providers.base import WeatherProvider
 
 logger = logging.getLogger(__name__)
 
+# 약 1km 격자 단위로 날씨 캐시를 공유
+_GRID_DIGITS = 2
+
 
 class KmaWeatherProvider(WeatherProvider):
     """기상청 단기예보 API.
@@ -16,12 +21,40 @@ class KmaWeatherProvider(WeatherProvider):
     실제 구현 시 _to_grid() LCC DFS 좌표변환 포함.
     """
 
-    def __init__(self, settings=None, cache=None, db=None):
+    def __init__(self, settings=None, cache=None, db=None, http_client: httpx.AsyncClient | None = None):
         self.settings = settings
         self.cache = cache
         self.db = db
+        self.http_client = http_client
 
     async def get_current_weather(self, lat: float, lng: float) -> Dict:
+        cache_key = f"weather:{round(float(lat), _GRID_DIGITS)},{round(float(lng), _GRID_DIGITS)}"
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        weather = await self._fetch_weather(lat, lng)
+        await self._cache_set(cache_key, weather)
+        return weather
+
+    async def _cache_get(self, key: str) -> Dict | None:
+        if self.cache is None:
+            return None
+        try:
+            return await self.cache.get(key)
+        except Exception as exc:
+            logger.warning("날씨 캐시 조회 실패: %s", exc)
+            return None
+
+    async def _cache_set(self, key: str, value: Dict) -> None:
+        if self.cache is None or self.settings is None:
+            return
+        try:
+            await self.cache.set(key, value, self.settings.cache_ttl_weather)
+        except Exception as exc:
+            logger.warning("날씨 캐시 저장 실패: %s", exc)
+
+    async def _fetch_weather(self, lat: float, lng: float) -> Dict:
         logger.info("KmaWeatherProvider 호출: lat=%.4f, lng=%.4f", lat, lng)
 
         # TODO: 실제 기상청 API 호출 구현
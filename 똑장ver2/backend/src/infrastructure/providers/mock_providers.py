@@ -1,5 +1,5 @@
 from typing import List, Dict
-import math
+from src.application.services.geo import haversine_km
 from src.infrastructure.providers.base import OfflinePriceProvider, WeatherProvider, RoutingProvider, PlaceProvider
 from src.domain.models.basket import BasketItem
 from src.domain.models.plan import PlanItem
@@ -54,7 +54,7 @@ class MockRoutingProvider(RoutingProvider):
         origin_lng = float(origin.get("lng", 0.0))
         dest_lat = float(destination.get("lat", 0.0))
         dest_lng = float(destination.get("lng", 0.0))
-        distance_km = _haversine_km(origin_lat, origin_lng, dest_lat, dest_lng)
+        distance_km = haversine_km(origin_lat, origin_lng, dest_lat, dest_lng)
 
         if mode == "walk":
             duration = round(distance_km * 1000 * 1.3 / 66.7)
@@ -75,16 +75,3 @@ class MockPlaceProvider(PlaceProvider):
             {"name": "이마트 역삼점", "lat": lat + 0.01, "lng": lng + 0.01, "category": "대형마트"},
             {"name": "홈플러스 강남점", "lat": lat - 0.01, "lng": lng - 0.01, "category": "대형마트"},
         ]
-
-
-def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    r = 6371.0
-    d_lat = math.radians(lat2 - lat1)
-    d_lng = math.radians(lng2 - lng1)
-    a = (
-        math.sin(d_lat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(d_lng / 2) ** 2
-    )
-    return r * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
@@ -4,6 +4,8 @@ from __future__ import annotations
 import logging
 from typing import Dict, List
 
+import httpx
+
 from src.infrastructure.providers.base import PlaceProvider
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,9 @@ class NaverLocalProvider(PlaceProvider):
     실제 구현 시 Haversine 후처리 필수 (좌표 미지원 주의).
     """
 
+    def __init__(self, http_client: httpx.AsyncClient | None = None) -> None:
+        self.http_client = http_client
+
     async def search_nearby_stores(
         self,
         lat: float,
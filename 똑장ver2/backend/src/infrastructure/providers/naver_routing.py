@@ -2,13 +2,19 @@
 from __future__ import annotations
 
 import logging
-import math
 from typing import Dict
 
+import httpx
+
+from src.application.services.geo import haversine_km
 from src.infrastructure.providers.base import RoutingProvider
 
 logger = logging.getLogger(__name__)
 
+# 출발지는 소수 3자리(약 100m) 격자로 묶어 같은 동네의 반복 조회를 캐시로 흡수
+_ORIGIN_CELL_DIGITS = 3
+_DEST_DIGITS = 5
+
 
 class NaverRoutingProvider(RoutingProvider):
     """네이버 클라우드 Directions API.
@@ -17,12 +23,18 @@ class NaverRoutingProvider(RoutingProvider):
     실제 구현 시 직선거리 Fallback 포함.
     """
 
-    def __init__(self, settings=None, cache=None, db=None):
+    def __init__(self, settings=None, cache=None, db=None, http_client: httpx.AsyncClient | None = None):
         self.settings = settings
         self.cache = cache
         self.db = db
+        self.http_client = http_client
 
     async def estimate_route(self, origin: Dict, destination: Dict, mode: str) -> Dict:
+        cache_key = self._cache_key(origin, destination, mode)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         logger.info("NaverRoutingProvider 호출: %s → %s (%s)", origin, destination, mode)
 
         # TODO: 실제 NCP Directions API 호출 구현
@@ -30,7 +42,7 @@ class NaverRoutingProvider(RoutingProvider):
         origin_lng = float(origin.get("lng", 0.0))
         dest_lat = float(destination.get("lat", 0.0))
         dest_lng = float(destination.get("lng", 0.0))
-        distance_km = _haversine_km(origin_lat, origin_lng, dest_lat, dest_lng)
+        distance_km = haversine_km(origin_lat, origin_lng, dest_lat, dest_lng)
 
         if mode == "walk":
             duration = round(distance_km * 1000 * 1.3 / 66.7)
@@ -39,22 +51,48 @@ class NaverRoutingProvider(RoutingProvider):
         else:
             duration = max(1, round(distance_km / 0.5))
 
-        return {
+        result = {
             "duration_min": max(1, int(duration)),
             "distance_km": round(distance_km, 1),
             "mode": mode,
             "source": "ncp_stub",
         }
+        await self._cache_set(cache_key, result, mode)
+        return result
+
+    def _cache_key(self, origin: Dict, destination: Dict, mode: str) -> str:
+        origin_cell = (
+            f"{round(float(origin.get('lat', 0.0)), _ORIGIN_CELL_DIGITS)},"
+            f"{round(float(origin.get('lng', 0.0)), _ORIGIN_CELL_DIGITS)}"
+        )
+        store_id = destination.get("store_id")
+        if store_id:
+            dest = f"store:{store_id}"
+        else:
+            dest = (
+                f"{round(float(destination.get('lat', 0.0)), _DEST_DIGITS)},"
+                f"{round(float(destination.get('lng', 0.0)), _DEST_DIGITS)}"
+            )
+        return f"route:{str(mode).lower()}:{origin_cell}:{dest}"
 
+    async def _cache_get(self, key: str) -> Dict | None:
+        if self.cache is None:
+            return None
+        try:
+            return await self.cache.get(key)
+        except Exception as exc:
+            logger.warning("경로 캐시 조회 실패: %s", exc)
+            return None
 
-def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    r = 6371.0
-    d_lat = math.radians(lat2 - lat1)
-    d_lng = math.radians(lng2 - lng1)
-    a = (
-        math.sin(d_lat / 2) ** 2
-        + math.cos(math.radians(lat1))
-        * math.cos(math.radians(lat2))
-        * math.sin(d_lng / 2) ** 2
-    )
-    return r * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    async def _cache_set(self, key: str, value: Dict, mode: str) -> None:
+        if self.cache is None or self.settings is None:
+            return
+        ttl = (
+            self.settings.cache_ttl_route_car
+            if str(mode).lower() == "car"
+            else self.settings.cache_ttl_route_default
+        )
+        try:
+            await self.cache.set(key, value, ttl)
+        except Exception as exc:
+            logger.warning("경로 캐시 저장 실패: %s", exc)
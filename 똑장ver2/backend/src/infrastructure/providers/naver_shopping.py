@@ -5,8 +5,10 @@ import logging
 import re
 import time
 import httpx
+from pydantic import ConfigDict
 
 from src.core.config import settings
+from src.core.ttl_cache import BoundedTTLCache
 from src.domain.models.basket import BasketItem, ItemMode
 from src.domain.models.plan import PlanItem
 from src.infrastructure.providers.base import OnlinePriceProvider
@@ -91,12 +93,23 @@ ITEM_TITLE_SYNONYMS = {
 logger = logging.getLogger(__name__)
 
 
+class _FrozenPlanItem(PlanItem):
+    """캐시에 보관하는 불변 PlanItem. 적중 시 복사 없이 그대로 돌려준다."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+def _rows_size(rows: tuple[PlanItem, ...]) -> int:
+    return sum(len(row.model_dump_json()) for row in rows) or 1
+
+
 class NaverShoppingProvider(OnlinePriceProvider):
     """네이버 쇼핑 검색 API — Hybrid Search Strategy."""
 
     BASE_URL = "https://openapi.naver.com/v1/search/shop.json"
 
-    def __init__(self) -> None:
+    def __init__(self, http_client: httpx.AsyncClient | None = None) -> None:
+        self._http_client = http_client
         self._timeout_seconds = max(1.0, float(settings.naver_shopping_timeout_seconds))
         self._max_retries = max(0, int(settings.naver_shopping_max_retries))
         self._retry_backoff_seconds = max(0.05, float(settings.naver_shopping_retry_backoff_seconds))
@@ -104,7 +117,18 @@ class NaverShoppingProvider(OnlinePriceProvider):
         self._circuit_failure_threshold = max(1, int(settings.naver_shopping_circuit_failure_threshold))
         self._circuit_cooldown_seconds = max(1, int(settings.naver_shopping_circuit_cooldown_seconds))
 
-        self._response_cache: dict[str, tuple[float, list[PlanItem]]] = {}
+        # 항목 수/바이트 상한 LRU + TTL. 만료 후 stale 구간에는 이전 결과로 즉시 응답하고 백그라운드 갱신
+        self._response_cache: BoundedTTLCache[str, tuple[PlanItem, ...]] = BoundedTTLCache(
+            max_entries=settings.naver_shopping_cache_max_entries,
+            max_bytes=settings.naver_shopping_cache_max_bytes,
+            ttl_seconds=self._cache_ttl_seconds,
+            stale_seconds=settings.naver_shopping_cache_stale_seconds,
+            sizeof=_rows_size,
+        )
+        # 같은 cache_key 동시 요청은 먼저 시작한 검색 결과를 함께 기다린다 (single-flight)
+        self._inflight: dict[str, asyncio.Future[tuple[PlanItem, ...]]] = {}
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+        self._stats = {"cache_hits": 0, "coalesced_hits": 0, "upstream_searches": 0, "stale_refreshes": 0}
         self._failure_count = 0
         self._circuit_open_until = 0.0
         self._state_lock = asyncio.Lock()
@@ -173,24 +197,6 @@ class NaverShoppingProvider(OnlinePriceProvider):
             and "__SET_IN_SECRET_MANAGER__" not in settings.naver_client_secret
         )
 
-    async def _read_cache(self, cache_key: str) -> list[PlanItem] | None:
-        now = time.monotonic()
-        async with self._state_lock:
-            cached = self._response_cache.get(cache_key)
-            if not cached:
-                return None
-            expires_at, rows = cached
-            if expires_at <= now:
-                self._response_cache.pop(cache_key, None)
-                return None
-            return [item.model_copy(deep=True) for item in rows]
-
-    async def _write_cache(self, cache_key: str, rows: list[PlanItem]) -> None:
-        expires_at = time.monotonic() + self._cache_ttl_seconds
-        cloned = [item.model_copy(deep=True) for item in rows]
-        async with self._state_lock:
-            self._response_cache[cache_key] = (expires_at, cloned)
-
     async def _is_circuit_open(self) -> bool:
         now = time.monotonic()
         async with self._state_lock:
@@ -217,9 +223,17 @@ class NaverShoppingProvider(OnlinePriceProvider):
         last_error: Exception | None = None
         for attempt in range(self._max_retries + 1):
             try:
-                async with httpx.AsyncClient(timeout=self._timeout_seconds) as client:
-                    response = await client.get(self.BASE_URL, headers=headers, params=params)
-                    response.raise_for_status()
+                if self._http_client is not None:
+                    response = await self._http_client.get(
+                        self.BASE_URL,
+                        headers=headers,
+                        params=params,
+                        timeout=self._timeout_seconds,
+                    )
+                else:
+                    async with httpx.AsyncClient(timeout=self._timeout_seconds) as client:
+                        response = await client.get(self.BASE_URL, headers=headers, params=params)
+                response.raise_for_status()
                 await self._register_success()
                 payload = response.json()
                 return list(payload.get("items", []))
@@ -253,10 +267,82 @@ class NaverShoppingProvider(OnlinePriceProvider):
         required_keywords = required_keywords or []
         keyword_key = ",".join(sorted(set(required_keywords)))
         cache_key = f"{base_query}|max:{max_results}|kw:{keyword_key}"
-        cached = await self._read_cache(cache_key)
+        cached = self._response_cache.get(cache_key)
         if cached is not None:
-            return cached
+            async with self._state_lock:
+                self._stats["cache_hits"] += 1
+                if cached.stale and cache_key not in self._inflight and cache_key not in self._refresh_tasks:
+                    self._stats["stale_refreshes"] += 1
+                    task = asyncio.create_task(
+                        self._search_coalesced(item, base_query, max_results, required_keywords, cache_key)
+                    )
+                    self._refresh_tasks[cache_key] = task
+                    task.add_done_callback(lambda done, key=cache_key: self._on_refresh_done(key, done))
+            return list(cached.value)
 
+        return list(await self._search_coalesced(item, base_query, max_results, required_keywords, cache_key))
+
+    def _on_refresh_done(self, cache_key: str, task: asyncio.Task) -> None:
+        if self._refresh_tasks.get(cache_key) is task:
+            self._refresh_tasks.pop(cache_key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("[NaverShopping] 백그라운드 갱신 실패: %s", task.exception())
+
+    async def _search_coalesced(
+        self,
+        item: BasketItem,
+        base_query: str,
+        max_results: int,
+        required_keywords: list[str],
+        cache_key: str,
+    ) -> tuple[PlanItem, ...]:
+        async with self._state_lock:
+            inflight = self._inflight.get(cache_key)
+            if inflight is None:
+                inflight = asyncio.get_running_loop().create_future()
+                self._inflight[cache_key] = inflight
+                is_leader = True
+                self._stats["upstream_searches"] += 1
+            else:
+                is_leader = False
+                self._stats["coalesced_hits"] += 1
+
+        if not is_leader:
+            return await asyncio.shield(inflight)
+
+        try:
+            rows = await self._search_uncached(item, base_query, max_results, required_keywords, cache_key)
+        except BaseException as exc:
+            # 선행 요청이 취소돼도 대기자까지 취소 전파하지 않고 실패로 알린다
+            error = exc if isinstance(exc, Exception) else RuntimeError("NAVER_SHOPPING_SEARCH_CANCELLED")
+            inflight.set_exception(error)
+            # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+            inflight.exception()
+            raise
+        else:
+            inflight.set_result(rows)
+        finally:
+            async with self._state_lock:
+                if self._inflight.get(cache_key) is inflight:
+                    self._inflight.pop(cache_key, None)
+        return rows
+
+    async def stats_snapshot(self) -> dict:
+        async with self._state_lock:
+            return {
+                **self._stats,
+                "inflight": len(self._inflight),
+                "cache": self._response_cache.stats(),
+            }
+
+    async def _search_uncached(
+        self,
+        item: BasketItem,
+        base_query: str,
+        max_results: int,
+        required_keywords: list[str],
+        cache_key: str,
+    ) -> tuple[PlanItem, ...]:
         headers = {
             "X-Naver-Client-Id": settings.naver_client_id,
             "X-Naver-Client-Secret": settings.naver_client_secret,
@@ -308,9 +394,9 @@ class NaverShoppingProvider(OnlinePriceProvider):
                 logger.warning("[NaverShopping] Phase2 %s 실패: %s", kw, e)
 
         results.sort(key=lambda x: x.price)
-        bounded = results[:max_results] if max_results > 0 else results
-        await self._write_cache(cache_key, bounded)
-        return [item.model_copy(deep=True) for item in bounded]
+        bounded = tuple(results[:max_results] if max_results > 0 else results)
+        self._response_cache.set(cache_key, bounded)
+        return bounded
 
     @staticmethod
     def detect_mall_key(mall_name: str) -> str | None:
@@ -338,7 +424,7 @@ class NaverShoppingProvider(OnlinePriceProvider):
             return None
         if not self._matches_item_name(title, original_item.item_name):
             return None
-        return PlanItem(
+        return _FrozenPlanItem(
             item_name=original_item.item_name,
             brand=raw.get("brand") or None,
             size=original_item.size,
@@ -20,13 +20,22 @@ from src.api.v1.routers import (
     stt,
     user_data,
 )
+from src.application.services.offline_plan_adapter import CandidateWorkingSetStore
+from src.application.services.plan_result_cache import PlanResultCache
+from src.application.services.product_search_index import ProductSearchIndex
 from src.application.services.public_catalog_sync import PublicCatalogSyncService
+from src.application.services.store_spatial_index import StoreSpatialIndex
 from src.core.config import settings
+from src.core.llm import get_chat_client_pool, get_llm_response_cache
 from src.core.logging_mask import install_sensitive_data_filter
+from src.infrastructure.persistence.auth_session_cache import get_auth_session_cache
 from src.infrastructure.persistence.cache_service import CacheService
-from src.infrastructure.persistence.database import get_app_db, get_cache_db, init_db
+from src.infrastructure.persistence.connection_pool import SqliteConnectionPool
+from src.infrastructure.persistence.database import get_cache_db, init_db
+from src.infrastructure.persistence.latest_offline_price import ensure_latest_offline_prices
 from src.infrastructure.persistence.seed_offline_mock_data import seed_offline_mock_data
 from src.infrastructure.persistence.user_repository import UserRepository
+from src.infrastructure.providers.http_client import HttpClientPool
 from src.infrastructure.providers.mock_providers import MockRoutingProvider, MockWeatherProvider
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
@@ -46,7 +55,7 @@ def _is_secret_configured(value: str | None) -> bool:
 async def _reservation_scheduler(app: FastAPI, stop_event: asyncio.Event) -> None:
     while not stop_event.is_set():
         try:
-            repo = UserRepository(app.state.db)
+            repo = UserRepository(app.state.db, pool=getattr(app.state, "db_pool", None))
             dispatched = await repo.dispatch_due_reservations()
             if dispatched:
                 logger.info("예약 스케줄러 디스패치 완료: %s건", dispatched)
@@ -62,16 +71,25 @@ async def _reservation_scheduler(app: FastAPI, stop_event: asyncio.Event) -> Non
             continue
 
 
-async def _run_public_catalog_sync_on_startup(db) -> None:
+async def _run_public_catalog_sync_on_startup(
+    db_pool: SqliteConnectionPool,
+    product_index: ProductSearchIndex,
+    store_index: StoreSpatialIndex,
+    http_clients: HttpClientPool,
+) -> None:
     if not settings.public_catalog_sync_on_startup:
         logger.info("PUBLIC_CATALOG_SYNC_ON_STARTUP=false → 공공데이터 동기화 생략")
         return
 
     service = PublicCatalogSyncService(
-        db=db,
+        db=db_pool.writer,
         cert_key=settings.kamis_cert_key,
         cert_id=settings.kamis_cert_id,
         timeout_seconds=settings.public_catalog_timeout_seconds,
+        search_index=product_index,
+        http_client=http_clients.client("kamis"),
+        pool=db_pool,
+        store_index=store_index,
     )
     result = await service.sync_catalog()
     status = str(result.get("status") or "unknown")
@@ -95,23 +113,53 @@ async def _run_public_catalog_sync_on_startup(db) -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
-    db = await get_app_db()
+    db_pool = await SqliteConnectionPool.from_settings(settings).open()
+    db = db_pool.writer
     cache_db = await get_cache_db()
-    cache = CacheService(cache_db)
+    cache = CacheService.from_settings(cache_db, settings)
+    cache.start()
+    get_llm_response_cache().attach(cache)
+    auth_cache = get_auth_session_cache()
+    http_clients = HttpClientPool.from_settings(settings)
+    get_chat_client_pool().attach_http_client(http_clients.client("openai"))
     await seed_offline_mock_data(db)
-    await _run_public_catalog_sync_on_startup(db)
+    backfilled_prices = await ensure_latest_offline_prices(db)
+    if backfilled_prices:
+        logger.info("최신 가격 테이블 백필 완료: %s개 품목", backfilled_prices)
+    product_index = ProductSearchIndex()
+    indexed_products = await product_index.rebuild(db)
+    logger.info("상품 검색 색인 적재 완료: %s건", indexed_products)
+    store_index = StoreSpatialIndex()
+    indexed_stores = await store_index.rebuild(db)
+    logger.info("매장 공간 색인 적재 완료: %s건", indexed_stores)
+    await _run_public_catalog_sync_on_startup(db_pool, product_index, store_index, http_clients)
+    plan_cache = PlanResultCache.from_settings(settings)
+    plan_working_sets = CandidateWorkingSetStore(
+        max_entries=settings.plan_working_set_max_entries,
+        ttl_seconds=settings.plan_working_set_ttl_seconds,
+    )
 
     # API 키 유무에 따라 실제 / Mock Provider 자동 선택
     if _is_secret_configured(settings.ncp_client_id) and _is_secret_configured(settings.ncp_client_secret):
         from src.infrastructure.providers.naver_routing import NaverRoutingProvider
-        routing = NaverRoutingProvider(settings=settings, cache=cache, db=db)
+        routing = NaverRoutingProvider(
+            settings=settings,
+            cache=cache,
+            db=db,
+            http_client=http_clients.client("ncp_directions"),
+        )
     else:
         routing = MockRoutingProvider()
         logger.info("NCP 키 없음 → MockRoutingProvider 사용")
 
     if _is_secret_configured(settings.kma_service_key):
         from src.infrastructure.providers.kma_weather import KmaWeatherProvider
-        weather = KmaWeatherProvider(settings=settings, cache=cache, db=db)
+        weather = KmaWeatherProvider(
+            settings=settings,
+            cache=cache,
+            db=db,
+            http_client=http_clients.client("kma"),
+        )
     else:
         weather = MockWeatherProvider()
         logger.info("KMA 키 없음 → MockWeatherProvider 사용")
@@ -119,15 +167,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if _is_secret_configured(settings.naver_client_id) and _is_secret_configured(settings.naver_client_secret):
         from src.infrastructure.providers.naver_local import NaverLocalProvider
         from src.infrastructure.providers.naver_shopping import NaverShoppingProvider
-        place = NaverLocalProvider()
-        shopping = NaverShoppingProvider()
+        place = NaverLocalProvider(http_client=http_clients.client("naver_local"))
+        shopping = NaverShoppingProvider(http_client=http_clients.client("naver_shopping"))
     else:
         place = None
         shopping = None
         logger.info("Naver 키 없음 → 오프라인 Mock 사용")
 
     app.state.db = db
+    app.state.db_pool = db_pool
     app.state.cache_db = cache_db
+    app.state.cache = cache
+    auth_cache.start(db, db_pool)
+    app.state.http_clients = http_clients
+    app.state.product_index = product_index
+    app.state.store_index = store_index
+    app.state.plan_cache = plan_cache
+    app.state.plan_working_sets = plan_working_sets
     app.state.routing = routing
     app.state.weather = weather
     app.state.place = place
@@ -146,7 +202,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     with suppress(asyncio.CancelledError):
         await scheduler_task
 
-    await db.close()
+    get_chat_client_pool().attach_http_client(None)
+    await http_clients.aclose()
+    await auth_cache.close()
+    get_llm_response_cache().attach(None)
+    await cache.close()
+    await db_pool.close()
     await cache_db.close()
     logger.info("똑장 백엔드 종료")
 
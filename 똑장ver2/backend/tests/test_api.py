@@ -1,4 +1,5 @@
 """API 통합 테스트 (JWT 인증 + 계약 정렬)."""
+import json
 from urllib.parse import urlparse
 
 import pytest
@@ -102,6 +103,18 @@ class TestAuthAPI:
         )
         assert logout_resp.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_logout_revokes_cached_session_immediately(self, client):
+        login_resp = await client.post("/api/v1/auth/login", json={"email": "cached@ddokjang.ai"})
+        headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+        # 첫 요청에서 세션이 캐시되고 두 번째는 캐시 적중
+        assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+        assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+        assert (await client.post("/api/v1/auth/logout", headers=headers, json={})).status_code == 200
+        assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
+
     @pytest.mark.asyncio
     async def test_unauthorized_request_blocked(self, client):
         resp = await client.get("/api/v1/basket")
@@ -233,6 +246,60 @@ class TestChatAPI:
         assert "장바구니" in payload["content"]
         assert payload["diff"] == []
 
+    @pytest.mark.asyncio
+    async def test_chat_stream_emits_intent_diff_tokens_and_done(self, client, auth):
+        headers = {"Authorization": auth["Authorization"]}
+        await client.delete("/api/v1/basket", headers=headers)
+
+        resp = await client.post(
+            "/api/v1/chat/message/stream",
+            headers=headers,
+            json={"message": "두부 2개 담아줘"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+
+        events = []
+        for block in resp.text.strip().split("\n\n"):
+            event_line, data_line = block.split("\n", 1)
+            events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+
+        names = [name for name, _ in events]
+        assert names[0] == "intent" and events[0][1]["intent"] == "modify"
+        assert names.index("diff") < names.index("token") < names.index("done") == len(names) - 1
+        diff = events[names.index("diff")][1]
+        assert any(entry["action"] == "add" and entry["item"]["item_name"] == "두부" for entry in diff)
+
+        done = events[-1][1]
+        assert "".join(data["text"] for name, data in events if name == "token") == done["content"]
+        basket = await client.get("/api/v1/basket", headers=headers)
+        assert any(item["item_name"] == "두부" for item in basket.json()["items"])
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_save_failure_does_not_replay_modifier(self, client, auth, monkeypatch):
+        from src.api.v1.routers import chat as chat_router
+
+        headers = {"Authorization": auth["Authorization"]}
+        await client.delete("/api/v1/basket", headers=headers)
+        fallbacks: list[Exception] = []
+
+        async def failing_save(request, user_id):
+            raise RuntimeError("save failed")
+
+        async def spy_fallback(run, error):
+            fallbacks.append(error)
+
+        monkeypatch.setattr(chat_router, "save_basket_store_to_db", failing_save)
+        monkeypatch.setattr(chat_router, "_run_fallback", spy_fallback)
+        with pytest.raises(RuntimeError, match="save failed"):
+            await client.post(
+                "/api/v1/chat/message/stream",
+                headers=headers,
+                json={"message": "두부 2개 담아줘"},
+            )
+        # 저장 실패는 그래프 실패가 아니므로 fallback이 modifier를 다시 돌리지 않는다
+        assert fallbacks == []
+
 
 class TestPlansAPI:
     @pytest.mark.asyncio
@@ -258,6 +325,57 @@ class TestPlansAPI:
         assert online_data["top3"]
         assert "request_id" in online_data["meta"]
 
+    @pytest.mark.asyncio
+    async def test_generate_stream_sends_provisional_top3_and_persisted_request(self, client, auth):
+        headers = {"Authorization": auth["Authorization"]}
+        payload = {
+            "items": [
+                {"item_name": "계란", "size": "30구", "quantity": 1},
+                {"item_name": "우유", "quantity": 2},
+            ]
+        }
+        resp = await client.post("/api/v1/offline/plans/generate/stream", headers=headers, json=payload)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+
+        events = []
+        for block in resp.text.strip().split("\n\n"):
+            event_line, data_line = block.split("\n", 1)
+            events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+
+        assert [name for name, _ in events] == ["provisional", "top3", "done"]
+        provisional, top3, done = (data for _, data in events)
+        assert provisional["plan"]["plan_type"] == "nearest"
+        assert done["top3"] == top3["top3"]
+
+        selected = await client.post(
+            "/api/v1/offline/plans/select",
+            headers=headers,
+            json={"request_id": done["meta"]["request_id"], "selected_plan_type": done["top3"][0]["plan_type"]},
+        )
+        assert selected.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_generate_reuses_cached_ranked_plans(self, client, auth, monkeypatch):
+        from src.application.services.plan_result_cache import PlanResultCache
+
+        monkeypatch.setattr(app.state, "plan_cache", PlanResultCache(), raising=False)
+        headers = {"Authorization": auth["Authorization"]}
+        payload = {
+            "items": [{"item_name": "우유", "quantity": 1}, {"item_name": "두부", "quantity": 1}],
+            "user_context": {"lat": 37.4982, "lng": 127.0292, "travel_mode": "walk"},
+        }
+        first = await client.post("/api/v1/offline/plans/generate", headers=headers, json=payload)
+        # 품목 순서와 격자 안 좌표 차이는 같은 키
+        payload["items"].reverse()
+        payload["user_context"]["lat"] = 37.4984
+        second = await client.post("/api/v1/offline/plans/generate", headers=headers, json=payload)
+
+        assert first.headers["X-Plan-Cache"] == "miss"
+        assert second.headers["X-Plan-Cache"] == "hit"
+        assert second.json()["top3"] == first.json()["top3"]
+        assert second.json()["meta"]["request_id"] != first.json()["meta"]["request_id"]
+
     @pytest.mark.asyncio
     async def test_online_select_invalid_redirect_url_returns_400(self, client, auth):
         headers = {"Authorization": auth["Authorization"]}
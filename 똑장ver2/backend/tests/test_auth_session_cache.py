@@ -0,0 +1,83 @@
+"""인증 세션 캐시/last_used_at 지연 기록 테스트."""
+from __future__ import annotations
+
+import aiosqlite
+import pytest
+
+from src.infrastructure.persistence.auth_session_cache import AuthSessionCache
+from src.infrastructure.persistence.connection_pool import SqliteConnectionPool
+from src.infrastructure.persistence.database import INIT_SQL
+
+USER = {"user_id": "usr-1", "email": "a@ddokjang.ai", "name": "테스터"}
+
+
+def test_put_is_skipped_when_invalidated_during_lookup():
+    cache = AuthSessionCache()
+    generation = cache.generation
+    cache.invalidate_session("sess-1")  # 조회 도중 폐기
+    cache.put("sess-1", USER, generation)
+    assert cache.get("sess-1", "usr-1") is None
+
+    cache.put("sess-1", USER, cache.generation)
+    assert cache.get("sess-1", "usr-1").email == "a@ddokjang.ai"
+    # 토큰의 사용자와 다르면 적중으로 보지 않는다
+    assert cache.get("sess-1", "usr-2") is None
+
+    cache.invalidate_user("usr-1")
+    assert cache.get("sess-1", "usr-1") is None
+
+
+@pytest.mark.asyncio
+async def test_touches_are_coalesced_into_one_flush():
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(INIT_SQL)
+        await db.executemany(
+            """INSERT INTO auth_sessions
+               (session_id, user_id, refresh_token_hash, refresh_expires_at, created_at, last_used_at)
+               VALUES (?, 'usr-1', 'hash', '2099-01-01T00:00:00+00:00', 'old', 'old')""",
+            [("sess-1",), ("sess-2",)],
+        )
+        await db.commit()
+
+        cache = AuthSessionCache(touch_flush_interval_seconds=60)
+        cache.start(db)
+        try:
+            for _ in range(5):
+                cache.touch("sess-1")
+            cache.touch("sess-2")
+            assert cache.stats()["pending_touches"] == 2
+        finally:
+            await cache.close()
+
+        cursor = await db.execute("SELECT COUNT(*) FROM auth_sessions WHERE last_used_at != 'old'")
+        assert (await cursor.fetchone())[0] == 2
+        assert cache.stats()["pending_touches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_touches_are_flushed_through_writer_queue(tmp_path):
+    pool = await SqliteConnectionPool(str(tmp_path / "main.db"), readers=1).open()
+    try:
+        await pool.writer.executescript(INIT_SQL)
+        await pool.writer.execute(
+            "INSERT INTO users (user_id, email, created_at, updated_at) VALUES ('usr-1', 'a@ddokjang.ai', 'now', 'now')"
+        )
+        await pool.writer.execute(
+            """INSERT INTO auth_sessions
+               (session_id, user_id, refresh_token_hash, refresh_expires_at, created_at, last_used_at)
+               VALUES ('sess-1', 'usr-1', 'hash', '2099-01-01T00:00:00+00:00', 'old', 'old')"""
+        )
+        await pool.writer.commit()
+
+        cache = AuthSessionCache(touch_flush_interval_seconds=60)
+        cache.start(pool.writer, pool)
+        cache.touch("sess-1")
+        assert await cache.flush_touches() == 1
+        await cache.close()
+
+        assert pool.stats()["writes"] == 1
+        async with pool.reader() as reader:
+            cursor = await reader.execute("SELECT last_used_at FROM auth_sessions WHERE session_id = 'sess-1'")
+            assert (await cursor.fetchone())[0] != "old"
+    finally:
+        await pool.close()
@@ -0,0 +1,151 @@
+"""버전 기반 장바구니 read-through 캐시 테스트."""
+from __future__ import annotations
+
+import contextvars
+
+import aiosqlite
+import pytest
+
+from src.api.v1.routers.basket import bind_basket, get_basket_store
+from src.domain.models.basket import Basket, BasketItem
+from src.infrastructure.persistence.basket_store import VersionedBasketStore, rebase_basket
+from src.infrastructure.persistence.database import INIT_SQL
+from src.infrastructure.persistence.user_repository import UserRepository
+
+
+@pytest.fixture
+async def repo():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        yield UserRepository(db)
+
+
+def _add(name: str, quantity: int = 1):
+    def mutate(basket: Basket) -> None:
+        basket.items.append(BasketItem(item_name=name, quantity=quantity))
+
+    return mutate
+
+
+@pytest.mark.asyncio
+async def test_load_reparses_only_when_version_changes(repo: UserRepository):
+    user_id = (await repo.ensure_user("basket@example.com"))["user_id"]
+    store = VersionedBasketStore()
+
+    first = await store.load(repo, user_id)
+    first.basket.items.append(BasketItem(item_name="작업본만 수정"))
+    second = await store.load(repo, user_id)
+    assert store.stats()["reloads"] == 1
+    # 호출자가 고친 작업본은 캐시에 섞이지 않는다
+    assert second.basket.items == []
+
+    # 다른 워커가 저장하면 버전이 바뀌어 다시 읽는다
+    await repo.save_basket(user_id, Basket(items=[BasketItem(item_name="우유")]))
+    third = await store.load(repo, user_id)
+    assert third.version == second.version + 1
+    assert [item.item_name for item in third.basket.items] == ["우유"]
+    assert store.stats()["reloads"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_basket_is_not_rewritten(repo: UserRepository):
+    user_id = (await repo.ensure_user("skip@example.com"))["user_id"]
+    store = VersionedBasketStore()
+
+    snapshot = await store.load(repo, user_id)
+    assert await store.save(repo, user_id, snapshot.basket, expected_version=snapshot.version) == snapshot.version
+    assert store.stats()["skipped_writes"] == 1
+    assert await repo.get_basket_version(user_id) == snapshot.version
+
+    # 요청이 읽은 스냅샷과 같으면 save_changes도 쓰지 않는다
+    unchanged = await store.save_changes(repo, user_id, snapshot, snapshot.basket.model_copy(deep=True))
+    assert unchanged.version == snapshot.version
+    assert store.stats()["skipped_writes"] == 2
+    assert await repo.get_basket_version(user_id) == snapshot.version
+
+
+class _RacingRepository(UserRepository):
+    """첫 조건부 저장 직전에 다른 워커의 저장이 끼어드는 repository."""
+
+    def __init__(self, db: aiosqlite.Connection, competing: Basket):
+        super().__init__(db)
+        self._competing: Basket | None = competing
+
+    async def save_basket_payload(self, user_id, payload, *, expected_version=None):
+        if self._competing is not None:
+            competing, self._competing = self._competing, None
+            await self.save_basket(user_id, competing)
+        return await super().save_basket_payload(user_id, payload, expected_version=expected_version)
+
+
+@pytest.mark.asyncio
+async def test_update_retries_on_concurrent_worker_write(repo: UserRepository):
+    user_id = (await repo.ensure_user("cas@example.com"))["user_id"]
+    competing = Basket(items=[BasketItem(item_name="계란"), BasketItem(item_name="우유")])
+    racing = _RacingRepository(repo.db, competing)
+    store = VersionedBasketStore()
+    calls = 0
+
+    def add_tofu(basket: Basket) -> None:
+        nonlocal calls
+        calls += 1
+        basket.items.append(BasketItem(item_name="두부"))
+
+    snapshot, _ = await store.update(racing, user_id, add_tofu)
+
+    assert calls == 2
+    assert store.stats()["conflicts"] == 1
+    assert [item.item_name for item in snapshot.basket.items] == ["계란", "우유", "두부"]
+    reloaded = await VersionedBasketStore().load(repo, user_id)
+    assert reloaded.version == snapshot.version
+    assert [item.item_name for item in reloaded.basket.items] == ["계란", "우유", "두부"]
+
+
+@pytest.mark.asyncio
+async def test_save_changes_rebases_request_changes_over_concurrent_write(repo: UserRepository):
+    user_id = (await repo.ensure_user("rebase@example.com"))["user_id"]
+    store = VersionedBasketStore()
+    await repo.save_basket(user_id, Basket(items=[BasketItem(item_name="우유", quantity=1), BasketItem(item_name="계란")]))
+    base = await store.load(repo, user_id)
+
+    # 요청 작업본: 우유 +1, 계란 삭제, 두부 추가
+    ours = base.basket.model_copy(deep=True)
+    ours.items[0].quantity = 2
+    ours.items.pop(1)
+    ours.items.append(BasketItem(item_name="두부"))
+
+    # 그 사이 다른 요청(PATCH)이 우유 +2, 김치 추가
+    competing = Basket(
+        items=[BasketItem(item_name="우유", quantity=3), BasketItem(item_name="계란"), BasketItem(item_name="김치")]
+    )
+    racing = _RacingRepository(repo.db, competing)
+    saved = await store.save_changes(racing, user_id, base, ours)
+
+    assert store.stats()["conflicts"] == 1
+    assert [(item.item_name, item.quantity) for item in saved.basket.items] == [("우유", 4), ("김치", 1), ("두부", 1)]
+    reloaded = await VersionedBasketStore().load(repo, user_id)
+    assert reloaded.version == saved.version
+    assert reloaded.basket == saved.basket
+
+
+def test_rebase_keeps_concurrent_changes_the_request_did_not_touch():
+    base = Basket(items=[BasketItem(item_name="우유")])
+    ours = Basket(items=[BasketItem(item_name="우유"), BasketItem(item_name="두부", quantity=2)])
+    latest = Basket(items=[BasketItem(item_name="우유", quantity=5)])
+
+    rebase_basket(latest, base, ours)
+    assert [(item.item_name, item.quantity) for item in latest.items] == [("우유", 5), ("두부", 2)]
+
+
+def test_working_baskets_are_scoped_to_the_request_context():
+    def handle_request(item_name: str) -> Basket:
+        bind_basket("usr-1").items.append(BasketItem(item_name=item_name))
+        return get_basket_store("usr-1")
+
+    first = contextvars.copy_context().run(handle_request, "우유")
+    second = contextvars.copy_context().run(handle_request, "두부")
+    # 같은 사용자의 동시 요청이어도 작업본을 공유하지 않고, 요청이 끝나면 남지 않는다
+    assert [item.item_name for item in first.items] == ["우유"]
+    assert [item.item_name for item in second.items] == ["두부"]
+    assert contextvars.copy_context().run(get_basket_store, "usr-1").items == []
@@ -0,0 +1,99 @@
+"""2단 CacheService (메모리 LRU + write-behind + 만료 정리) 테스트."""
+from __future__ import annotations
+
+import time
+
+import aiosqlite
+import pytest
+
+from src.infrastructure.persistence.cache_service import CacheService
+from src.infrastructure.persistence.database import INIT_SQL
+
+
+async def _count_rows(db: aiosqlite.Connection) -> int:
+    cursor = await db.execute("SELECT COUNT(*) FROM cache_entries")
+    return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_batches_writes_into_one_flush():
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(INIT_SQL)
+        cache = CacheService(db, flush_interval_seconds=60)
+        cache.start()
+        try:
+            for idx in range(20):
+                await cache.set(f"k{idx}", {"idx": idx}, 60)
+            # 아직 커밋 전이어도 메모리/버퍼에서 바로 읽힌다
+            assert await cache.get("k3") == {"idx": 3}
+            assert await _count_rows(db) == 0
+        finally:
+            await cache.close()
+
+        assert await _count_rows(db) == 20
+        assert cache.stats()["flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_flushes_early_when_pending_limit_reached():
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(INIT_SQL)
+        cache = CacheService(db, flush_interval_seconds=60, flush_max_pending=5)
+        cache.start()
+        try:
+            await cache.set_many({f"k{idx}": {"idx": idx} for idx in range(5)}, 60)
+            assert await _count_rows(db) == 5
+        finally:
+            await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_get_many_reads_missing_keys_from_sqlite_and_fills_memory():
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(INIT_SQL)
+        writer = CacheService(db)
+        await writer.set_many({"a": {"v": 1}, "b": {"v": 2}}, 60)
+
+        reader = CacheService(db)
+        assert await reader.get_many(["a", "b", "c"]) == {"a": {"v": 1}, "b": {"v": 2}}
+        assert reader.stats()["db_reads"] == 1
+
+        # 두 번째 조회는 메모리 적중, 반환값을 고쳐도 캐시는 그대로
+        value = await reader.get("a")
+        value["v"] = 99
+        assert await reader.get("a") == {"v": 1}
+        assert reader.stats()["db_reads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sweep_expired_removes_rows_in_batches():
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(INIT_SQL)
+        past = time.time() - 10
+        await db.executemany(
+            "INSERT INTO cache_entries (cache_key, value_json, expires_at, created_at) VALUES (?, '{}', ?, datetime('now'))",
+            [(f"old{idx}", past) for idx in range(7)],
+        )
+        await db.commit()
+        cache = CacheService(db, sweep_batch_size=3)
+        await cache.set("fresh", {"ok": True}, 60)
+
+        assert await cache.get("old1") is None
+        assert await cache.sweep_expired() == 7
+        assert await _count_rows(db) == 1
+        assert await cache.get("fresh") == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_delete_is_visible_before_flush():
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(INIT_SQL)
+        cache = CacheService(db, flush_interval_seconds=60)
+        await cache.set("k", {"v": 1}, 60)
+        cache.start()
+        try:
+            await cache.delete("k")
+            assert await cache.get("k") is None
+        finally:
+            await cache.close()
+        assert await _count_rows(db) == 0
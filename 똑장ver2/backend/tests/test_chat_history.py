@@ -0,0 +1,87 @@
+"""대화 히스토리 저장소(링 버퍼 + SQLite)와 토큰 예산 컨텍스트 테스트."""
+from __future__ import annotations
+
+import aiosqlite
+import pytest
+
+from src.application.services.chat_context import (
+    ROLE_ASSISTANT,
+    ROLE_USER,
+    ChatTurn,
+    build_context_window,
+    estimate_tokens,
+)
+from src.infrastructure.persistence.chat_history_store import ChatHistoryStore
+from src.infrastructure.persistence.database import INIT_SQL
+from src.infrastructure.persistence.user_repository import UserRepository
+
+
+def _exchange(idx: int) -> list[ChatTurn]:
+    return [
+        ChatTurn(role=ROLE_USER, content=f"{idx}번째 요청: 두부 {idx}모 추가해줘"),
+        ChatTurn(role=ROLE_ASSISTANT, content=f"두부 {idx}모를 장바구니에 담았어요. 더 필요한 게 있으면 알려주세요."),
+    ]
+
+
+def test_context_window_stays_within_budget_for_long_sessions():
+    short = [turn for idx in range(3) for turn in _exchange(idx)]
+    long = [turn for idx in range(200) for turn in _exchange(idx)]
+
+    small = build_context_window(short, max_tokens=300, summary_max_tokens=60)
+    assert small.turns == tuple(short)
+    assert small.summary is None
+
+    window = build_context_window(long, max_tokens=300, summary_max_tokens=60)
+    assert window.estimated_tokens <= 300 + 60
+    assert window.turns[0].role == ROLE_USER
+    assert window.turns[-1] == long[-1]
+    assert window.dropped_turns == len(long) - len(window.turns)
+    # 요약은 가장 가까운 과거 발화를 담는다
+    assert window.summary is not None and "199번째" not in window.summary
+    assert estimate_tokens(window.summary) <= 60
+
+
+@pytest.mark.asyncio
+async def test_history_is_persisted_and_trimmed_to_ring_size():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        repo = UserRepository(db)
+        user_id = (await repo.ensure_user("chat@example.com"))["user_id"]
+        store = ChatHistoryStore(max_messages=6)
+
+        for idx in range(5):
+            await store.load(repo, user_id)
+            await store.append(repo, user_id, _exchange(idx))
+
+        assert [turn.content for turn in await store.load(repo, user_id)][0].startswith("2번째")
+        assert store.stats()["reloads"] == 1
+        cursor = await db.execute("SELECT COUNT(*) FROM chat_messages WHERE user_id = ?", (user_id,))
+        assert (await cursor.fetchone())[0] == 6
+
+        # 재시작(새 저장소)해도 DB에서 복원된다
+        restored = await ChatHistoryStore(max_messages=6).load(repo, user_id)
+        assert restored == await store.load(repo, user_id)
+
+
+@pytest.mark.asyncio
+async def test_history_reloads_after_another_worker_appends():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        repo = UserRepository(db)
+        user_id = (await repo.ensure_user("workers@example.com"))["user_id"]
+        worker_a = ChatHistoryStore(max_messages=10)
+        worker_b = ChatHistoryStore(max_messages=10)
+
+        await worker_a.load(repo, user_id)
+        await worker_b.load(repo, user_id)
+        await worker_a.append(repo, user_id, _exchange(1))
+        await worker_b.append(repo, user_id, _exchange(2))
+
+        expected = _exchange(1) + _exchange(2)
+        assert await worker_a.load(repo, user_id) == expected
+        assert await worker_b.load(repo, user_id) == expected
+
+        await worker_a.clear(repo, user_id)
+        assert await worker_b.load(repo, user_id) == []
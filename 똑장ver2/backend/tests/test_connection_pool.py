@@ -0,0 +1,113 @@
+"""SQLite 연결 풀(읽기 연결 N개 + writer 큐 group commit) 테스트."""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from src.infrastructure.persistence.connection_pool import PragmaProfile, SqliteConnectionPool
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    pool = await SqliteConnectionPool(
+        str(tmp_path / "main.db"),
+        readers=2,
+        reader_profile=PragmaProfile(mmap_size_bytes=1024 * 1024, query_only=True),
+    ).open()
+    await pool.writer.execute("CREATE TABLE kv (k TEXT PRIMARY KEY, v INTEGER NOT NULL)")
+    await pool.writer.commit()
+    yield pool
+    await pool.close()
+
+
+def _insert(key: str, value: int):
+    async def op(db):
+        await db.execute("INSERT INTO kv (k, v) VALUES (?, ?)", (key, value))
+        return key
+
+    return op
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_group_committed(pool: SqliteConnectionPool):
+    ops = [_insert(f"k{idx}", idx) for idx in range(20)]
+    results = await asyncio.gather(*(pool.write(op) for op in ops))
+
+    assert results == [f"k{idx}" for idx in range(20)]
+    stats = pool.stats()
+    assert stats["writes"] == 20
+    assert stats["write_batches"] < 20
+    async with pool.reader() as reader:
+        cursor = await reader.execute("SELECT COUNT(*) FROM kv")
+        assert (await cursor.fetchone())[0] == 20
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_roll_back_batch_neighbours(pool: SqliteConnectionPool):
+    results = await asyncio.gather(
+        pool.write(_insert("a", 1)),
+        pool.write(_insert("a", 2)),  # PK 충돌
+        pool.write(_insert("b", 3)),
+        return_exceptions=True,
+    )
+    assert results[0] == "a" and results[2] == "b"
+    assert isinstance(results[1], sqlite3.IntegrityError)
+
+    async with pool.reader() as reader:
+        cursor = await reader.execute("SELECT k, v FROM kv ORDER BY k")
+        assert [tuple(row) for row in await cursor.fetchall()] == [("a", 1), ("b", 3)]
+
+
+@pytest.mark.asyncio
+async def test_readers_are_read_only_and_use_their_profile(pool: SqliteConnectionPool):
+    async with pool.reader() as first, pool.reader() as second:
+        assert first is not second
+        cursor = await first.execute("PRAGMA mmap_size")
+        assert (await cursor.fetchone())[0] == 1024 * 1024
+        with pytest.raises(sqlite3.OperationalError):
+            await second.execute("INSERT INTO kv (k, v) VALUES ('x', 1)")
+    assert pool.stats()["idle_readers"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lost_savepoint_fails_the_batch_instead_of_committing(pool: SqliteConnectionPool):
+    async def commits_directly(db):
+        await db.execute("INSERT INTO kv (k, v) VALUES ('direct', 1)")
+        await db.commit()  # 큐 밖 커밋이 SAVEPOINT를 날린다
+
+    results = await asyncio.gather(
+        pool.write(commits_directly),
+        pool.write(_insert("after", 2)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, sqlite3.OperationalError) for result in results)
+    assert pool.stats()["writes"] == 0
+
+    # 배치가 정리된 뒤에는 정상적으로 다시 쓸 수 있다
+    assert await pool.write(_insert("next", 3)) == "next"
+
+
+@pytest.mark.asyncio
+async def test_close_fails_writes_of_the_running_batch(pool: SqliteConnectionPool, tmp_path):
+    started = asyncio.Event()
+
+    async def blocked(db):
+        await db.execute("INSERT INTO kv (k, v) VALUES ('blocked', 1)")
+        started.set()
+        await asyncio.Event().wait()
+
+    running = asyncio.create_task(pool.write(blocked))
+    await started.wait()
+    queued = asyncio.create_task(pool.write(_insert("queued", 2)))
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(pool.close(), timeout=5)
+    for task in (running, queued):
+        with pytest.raises(RuntimeError, match="DB_POOL_CLOSED"):
+            await asyncio.wait_for(task, timeout=1)
+
+    # 실패로 알린 쓰기는 실제로도 반영되지 않았다
+    with sqlite3.connect(tmp_path / "main.db") as db:
+        assert db.execute("SELECT COUNT(*) FROM kv").fetchone()[0] == 0
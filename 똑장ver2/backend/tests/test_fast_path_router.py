@@ -0,0 +1,115 @@
+"""규칙 기반 fast-path 라우터 테스트."""
+from __future__ import annotations
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.api.v1.routers.basket import bind_basket
+from src.application import graph
+from src.application.graph import FAST_PATH_MIN_CONFIDENCE, agent_graph, score_fast_path
+from src.core.metrics import ChatRoutingTracker
+
+
+@pytest.mark.parametrize(
+    ("text", "intent"),
+    [
+        ("장바구니 보여줘", "show_cart"),
+        ("우유 빼줘", "modify"),
+        ("계란 30구 추가해줘", "modify"),
+        ("우유 2개, 두부 한 모 담아줘", "modify"),
+        ("김치찌개 재료 담아줘", "modify"),
+    ],
+)
+def test_unambiguous_requests_score_above_threshold(text, intent):
+    decision = score_fast_path(text)
+    assert decision.intent == intent
+    assert decision.confidence >= FAST_PATH_MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "그거 빼줘",
+        "아까 말한 거 추가해줘",
+        "김치찌개 레시피 추천해줘",
+        "오늘 뭐 먹지",
+        "우유 2개",
+        "크로와상 담아줘",
+        # 부정/대체
+        "우유 안 담아도 돼",
+        "우유 말고 두유 담아줘",
+        "계란 빼지 마",
+        # 질문 어미
+        "우유 담아도 될까",
+        "우유 추가했나요",
+        "계란 뺐니",
+        # 담기와 빼기가 섞인 발화
+        "우유 2개 담고 계란 빼줘",
+    ],
+)
+def test_ambiguous_requests_fall_through_to_llm(text):
+    assert score_fast_path(text).confidence < FAST_PATH_MIN_CONFIDENCE
+
+
+def _state(user_id: str, text: str) -> dict:
+    return {
+        "messages": [HumanMessage(content=text)],
+        "user_preferences": "없음",
+        "matcher_entities": None,
+        "intent": None,
+        "next_step": None,
+        "final_response": None,
+        "user_id": user_id,
+        "llm_degraded": False,
+        "llm_error": None,
+        "route_tier": None,
+        "fast_path_intent": None,
+        "fast_path_confidence": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_analyzer(monkeypatch):
+    calls: list[str] = []
+
+    async def fake_llm(messages, **kwargs):
+        calls.append("llm")
+        return {"intent": "general", "entities": []}
+
+    monkeypatch.setattr(graph, "is_openai_configured", lambda: True)
+    monkeypatch.setattr(graph, "ainvoke_json_with_model_fallback", fake_llm)
+    user_id = "fast-path-user"
+    basket = bind_basket(user_id)
+
+    added = await agent_graph.ainvoke(_state(user_id, "계란 30구 추가해줘"))
+    assert added["route_tier"] == "rule"
+    assert added["llm_degraded"] is False
+    assert [item.item_name for item in basket.items] == ["계란"]
+
+    removed = await agent_graph.ainvoke(_state(user_id, "계란 빼줘"))
+    assert removed["route_tier"] == "rule"
+    assert basket.items == []
+    assert calls == []
+
+    # 확신도가 낮으면 LLM 분석을 거친다
+    general = await agent_graph.ainvoke(_state(user_id, "오늘 뭐 먹지"))
+    assert general["route_tier"] == "llm"
+    assert calls == ["llm"]
+
+
+@pytest.mark.asyncio
+async def test_routing_tracker_reports_tiers_and_agreement():
+    tracker = ChatRoutingTracker(window_size=20)
+    for duration in (1.0, 2.0, 3.0):
+        await tracker.record(tier="rule", duration_ms=duration)
+    await tracker.record(tier="llm", duration_ms=800.0)
+    await tracker.record_agreement(rule_intent="modify", llm_intent="modify")
+    await tracker.record_agreement(rule_intent="modify", llm_intent="general")
+
+    snapshot = await tracker.snapshot()
+    assert snapshot["total_requests"] == 4
+    assert snapshot["tiers"]["rule"]["requests"] == 3
+    assert snapshot["tiers"]["rule"]["share"] == 0.75
+    assert snapshot["tiers"]["rule"]["p95_ms"] == 3.0
+    assert snapshot["tiers"]["llm"]["p50_ms"] == 800.0
+    assert snapshot["agreement"] == {"samples": 2, "ratio": 0.5}
@@ -0,0 +1,33 @@
+"""거리/이동시간 일괄 계산 테스트."""
+from __future__ import annotations
+
+import pytest
+
+from src.application.services.geo import (
+    estimate_travel_batch,
+    estimate_travel_minutes,
+    haversine_km,
+    haversine_many_km,
+)
+
+ORIGIN = (37.4985, 127.0292)
+POINTS = [(37.4985, 127.0292), (37.5045, 127.0490), (37.5665, 126.9780), (35.1796, 129.0756)]
+
+
+def test_haversine_many_matches_scalar():
+    batched = haversine_many_km(*ORIGIN, POINTS)
+    expected = [haversine_km(*ORIGIN, lat, lng) for lat, lng in POINTS]
+    assert batched == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    assert batched[0] == 0.0
+
+
+def test_estimate_travel_batch_covers_all_modes():
+    estimates = estimate_travel_batch(*ORIGIN, POINTS[:2])
+    near = estimates[1]
+    assert round(near.distance_km, 1) == 1.9
+    assert near.minutes_by_mode == {
+        mode: estimate_travel_minutes(near.distance_km, mode) for mode in ("walk", "transit", "car")
+    }
+    assert near.minutes("WALK") == 22
+    assert near.minutes("bike") == near.minutes("car")
+    assert estimates[0].minutes("walk") == 1
@@ -0,0 +1,111 @@
+"""공용 HTTP 클라이언트 풀 연결 재사용 테스트 (로컬 stub 서버)."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from src.infrastructure.providers.http_client import HttpClientPool
+from src.infrastructure.providers.naver_shopping import NaverShoppingProvider
+
+REQUEST_COUNT = 20
+
+
+class _StubServer:
+    """keep-alive HTTP/1.1 응답을 주는 로컬 서버. 수락한 TCP 연결 수를 센다."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.base_events.Server | None = None
+        self.url = ""
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                self.requests += 1
+                body = json.dumps({"items": [{"productId": str(self.requests)}]}).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def stub_server():
+    server = _StubServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_reuses_connection(stub_server: _StubServer):
+    pool = HttpClientPool(max_connections_per_host=4)
+    started = time.perf_counter()
+    for _ in range(REQUEST_COUNT):
+        response = await pool.client("stub").get(stub_server.url)
+        assert response.status_code == 200
+    pooled_seconds = time.perf_counter() - started
+    await pool.aclose()
+    pooled_connections = stub_server.connections
+
+    started = time.perf_counter()
+    for _ in range(REQUEST_COUNT):
+        async with httpx.AsyncClient() as client:
+            assert (await client.get(stub_server.url)).status_code == 200
+    fresh_seconds = time.perf_counter() - started
+
+    assert pooled_connections == 1
+    assert stub_server.connections - pooled_connections == REQUEST_COUNT
+    # 연결 재사용 쪽이 매 요청 새 연결보다 느리지 않아야 한다 (CI 지터 여유 포함)
+    assert pooled_seconds <= fresh_seconds * 1.5
+
+
+@pytest.mark.asyncio
+async def test_pool_returns_same_client_per_upstream_and_closes():
+    pool = HttpClientPool()
+    assert pool.client("kamis") is pool.client("kamis")
+    assert pool.client("kamis") is not pool.client("naver_shopping")
+
+    await pool.aclose()
+    with pytest.raises(RuntimeError):
+        pool.client("kamis")
+
+
+@pytest.mark.asyncio
+async def test_naver_shopping_uses_injected_client(stub_server: _StubServer):
+    pool = HttpClientPool()
+    provider = NaverShoppingProvider(http_client=pool.client("naver_shopping"))
+    provider.BASE_URL = stub_server.url
+
+    for _ in range(3):
+        items = await provider._request_items(headers={}, params={"query": "우유"})
+        assert items and items[0]["productId"]
+    await pool.aclose()
+
+    assert stub_server.requests == 3
+    assert stub_server.connections == 1
@@ -0,0 +1,82 @@
+"""LLM JSON 응답 캐시 테스트."""
+from __future__ import annotations
+
+import aiosqlite
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.application.graph import _analyzer_cache_key
+from src.core import llm
+from src.core.llm import LlmResponseCache, llm_cache_key
+from src.infrastructure.persistence.cache_service import CacheService
+from src.infrastructure.persistence.database import INIT_SQL
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    calls: list[int] = []
+
+    async def fake_invoke(messages, *, temperature):
+        calls.append(1)
+        return AIMessage(content='```json\n{"intent": "add_item", "entities": []}\n```')
+
+    monkeypatch.setattr(llm, "ainvoke_with_model_fallback", fake_invoke)
+    monkeypatch.setattr(llm, "_llm_response_cache", LlmResponseCache(max_entries=8, ttl_seconds=60))
+    return calls
+
+
+def test_cache_key_normalizes_text_and_tracks_template_version():
+    base = llm_cache_key(template_version="v1", temperature=0.1, parts=["계란 30구  우유 2개 담아줘"], model="m")
+    assert base == llm_cache_key(template_version="v1", temperature=0.1, parts=[" 계란 30구 우유 2개 담아줘 "], model="m")
+    assert base != llm_cache_key(template_version="v2", temperature=0.1, parts=["계란 30구 우유 2개 담아줘"], model="m")
+    assert base != llm_cache_key(template_version="v1", temperature=0.1, parts=["계란 30구 우유 2개 담아줘"], model="m2")
+
+
+@pytest.mark.asyncio
+async def test_repeated_request_is_served_from_cache(fake_openai):
+    messages = [HumanMessage(content="계란 30구 우유 2개 담아줘")]
+    first = await llm.ainvoke_json_with_model_fallback(messages, cache_key="k")
+    first["intent"] = "mutated"
+    second = await llm.ainvoke_json_with_model_fallback(messages, cache_key="k")
+
+    assert len(fake_openai) == 1
+    assert second == {"intent": "add_item", "entities": []}
+    stats = llm.get_llm_response_cache().stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+
+    # 키가 없으면 캐시하지 않는다
+    await llm.ainvoke_json_with_model_fallback(messages)
+    assert len(fake_openai) == 2
+
+
+@pytest.mark.asyncio
+async def test_persisted_entries_survive_process_cache_loss():
+    async with aiosqlite.connect(":memory:") as db:
+        await db.executescript(INIT_SQL)
+        persistent = CacheService(db)
+        writer = LlmResponseCache(max_entries=8, ttl_seconds=60)
+        writer.attach(persistent)
+        await writer.set("k", {"intent": "remove_item"})
+
+        # 새 프로세스: 메모리는 비어 있고 캐시 DB만 남아 있다
+        reader = LlmResponseCache(max_entries=8, ttl_seconds=60)
+        reader.attach(CacheService(db))
+        assert await reader.get("k") == {"intent": "remove_item"}
+        assert await reader.get("k") == {"intent": "remove_item"}
+        assert reader.stats()["persistent_hits"] == 1
+        assert reader.stats()["hits"] == 1
+
+
+def test_analyzer_key_includes_previous_turn_only_for_references():
+    earlier = [HumanMessage(content="두부 추가해줘"), AIMessage(content="두부를 담았어요")]
+    other = [HumanMessage(content="계란 추가해줘"), AIMessage(content="계란을 담았어요")]
+
+    plain = HumanMessage(content="우유 2개 담아줘")
+    assert _analyzer_cache_key(earlier + [plain], "없음", "비어 있음") == _analyzer_cache_key(
+        other + [plain], "없음", "비어 있음"
+    )
+
+    reference = HumanMessage(content="그거 빼줘")
+    assert _analyzer_cache_key(earlier + [reference], "없음", "비어 있음") != _analyzer_cache_key(
+        other + [reference], "없음", "비어 있음"
+    )
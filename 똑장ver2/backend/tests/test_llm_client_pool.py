@@ -0,0 +1,47 @@
+"""ChatOpenAI 클라이언트 재사용 테스트."""
+from __future__ import annotations
+
+import langchain_openai
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.core import llm
+from src.core.config import settings
+from src.core.llm import ChatClientPool
+
+
+class _FakeChatOpenAI:
+    created: list[dict] = []
+
+    def __init__(self, **options):
+        self.options = options
+        _FakeChatOpenAI.created.append(options)
+
+    async def ainvoke(self, messages):
+        return AIMessage(content="ok")
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    _FakeChatOpenAI.created = []
+    monkeypatch.setattr(langchain_openai, "ChatOpenAI", _FakeChatOpenAI)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(llm, "_chat_client_pool", ChatClientPool(timeout_seconds=5))
+    return _FakeChatOpenAI
+
+
+@pytest.mark.asyncio
+async def test_clients_are_reused_per_model_and_temperature(fake_openai):
+    messages = [HumanMessage(content="안녕")]
+    await llm.ainvoke_with_model_fallback(messages, temperature=0.2)
+    await llm.ainvoke_with_model_fallback(messages, temperature=0.2)
+    await llm.ainvoke_with_model_fallback(messages, temperature=0.7)
+
+    assert len(fake_openai.created) == 2
+    assert llm.get_chat_client_pool().stats()["reused"] == 1
+
+    shared = object()
+    llm.get_chat_client_pool().attach_http_client(shared)
+    await llm.ainvoke_with_model_fallback(messages, temperature=0.2)
+    assert fake_openai.created[-1]["http_async_client"] is shared
+
@@ -0,0 +1,120 @@
+"""NaverShoppingProvider 동시 요청 합치기(single-flight)/응답 캐시 테스트."""
+from __future__ import annotations
+
+import asyncio
+
+import pydantic
+import pytest
+
+from src.core.config import settings
+from src.domain.models.basket import BasketItem
+from src.infrastructure.providers.naver_shopping import NaverShoppingProvider
+
+RAW_ITEM = {
+    "productId": "p-1",
+    "lprice": "2980",
+    "mallName": "이마트몰",
+    "title": "<b>우유</b> 1L",
+    "category1": "식품",
+    "link": "https://ssg.com/p/1",
+}
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch) -> NaverShoppingProvider:
+    monkeypatch.setattr(settings, "naver_client_id", "test-id")
+    monkeypatch.setattr(settings, "naver_client_secret", "test-secret")
+    return NaverShoppingProvider()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_upstream_call(provider: NaverShoppingProvider):
+    calls = 0
+
+    async def fake_request_items(*, headers, params):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [RAW_ITEM]
+
+    provider._request_items = fake_request_items  # type: ignore[method-assign]
+
+    results = await asyncio.gather(*(provider.search_products(BasketItem(item_name="우유")) for _ in range(5)))
+
+    assert calls == 1
+    assert all(len(rows) == 1 and rows[0].price == 2980 for rows in results)
+    # 캐시된 항목은 불변이라 복사 없이 공유된다
+    with pytest.raises(pydantic.ValidationError):
+        results[0][0].price = 1
+    assert results[1][0].price == 2980
+
+    stats = await provider.stats_snapshot()
+    assert {key: stats[key] for key in ("cache_hits", "coalesced_hits", "upstream_searches", "inflight")} == {
+        "cache_hits": 0,
+        "coalesced_hits": 4,
+        "upstream_searches": 1,
+        "inflight": 0,
+    }
+
+    await provider.search_products(BasketItem(item_name="우유"))
+    assert calls == 1
+    assert (await provider.stats_snapshot())["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesced_waiters_receive_leader_failure(provider: NaverShoppingProvider):
+    calls = 0
+
+    async def failing_request_items(*, headers, params):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        raise RuntimeError("upstream down")
+
+    provider._request_items = failing_request_items  # type: ignore[method-assign]
+
+    results = await asyncio.gather(
+        *(provider.search_products(BasketItem(item_name="두부")) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # 실패는 캐시되지 않고 다음 요청이 다시 시도한다
+    await asyncio.gather(provider.search_products(BasketItem(item_name="두부")), return_exceptions=True)
+    assert calls == 2
+    assert (await provider.stats_snapshot())["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_hit_returns_immediately_and_refreshes_in_background(provider: NaverShoppingProvider):
+    now = [0.0]
+    provider._response_cache._clock = lambda: now[0]
+    calls = 0
+    price = ["2980"]
+
+    async def fake_request_items(*, headers, params):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return [{**RAW_ITEM, "lprice": price[0]}]
+
+    provider._request_items = fake_request_items  # type: ignore[method-assign]
+    await provider.search_products(BasketItem(item_name="우유"))
+
+    # TTL은 지났지만 stale 구간 — 이전 결과를 즉시 돌려주고 갱신은 한 번만 예약
+    now[0] = provider._cache_ttl_seconds + 1
+    price[0] = "2500"
+    stale = await asyncio.gather(*(provider.search_products(BasketItem(item_name="우유")) for _ in range(3)))
+    assert all(rows[0].price == 2980 for rows in stale)
+    assert len(provider._refresh_tasks) == 1
+
+    await asyncio.gather(*provider._refresh_tasks.values())
+    assert calls == 2
+    refreshed = await provider.search_products(BasketItem(item_name="우유"))
+    assert refreshed[0].price == 2500
+
+    stats = await provider.stats_snapshot()
+    assert stats["stale_refreshes"] == 1
+    assert stats["cache"]["stale_hits"] == 3
+    assert stats["cache"]["entries"] == 1
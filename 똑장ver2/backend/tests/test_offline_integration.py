@@ -8,6 +8,7 @@ from src.application.services.offline_plan_adapter import OfflinePlanAdapter
 from src.application.services.product_matcher_db import ProductMatcherDB
 from src.domain.models.basket import Basket, BasketItem
 from src.infrastructure.persistence.database import INIT_SQL
+from src.infrastructure.persistence.latest_offline_price import refresh_latest_offline_prices
 from src.infrastructure.persistence.seed_offline_mock_data import seed_offline_mock_data
 
 
@@ -83,6 +84,7 @@ async def test_offline_plan_adapter_filters_extreme_snapshot_price():
                 "2099-01-01T00:00:00+00:00",
             ),
         )
+        await refresh_latest_offline_prices(db, [product_norm_key])
         await db.commit()
 
         adapter = OfflinePlanAdapter(db)
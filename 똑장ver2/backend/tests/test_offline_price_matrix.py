@@ -0,0 +1,212 @@
+"""오프라인 플랜 가격 매트릭스(매장 × 품목 일괄 조회) 테스트."""
+from __future__ import annotations
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+from src.application.services.offline_plan_adapter import CandidateWorkingSetStore, OfflinePlanAdapter
+from src.application.services.store_spatial_index import StoreSpatialIndex
+from src.domain.models.basket import Basket, BasketItem
+from src.domain.models.plan import Plan
+from src.infrastructure.persistence.database import INIT_SQL
+from src.infrastructure.persistence.latest_offline_price import refresh_latest_offline_prices
+
+UPDATED_AT = "2026-02-20T00:00:00+00:00"
+
+STORES = [
+    ("store-a", "테스트마트 A점", 37.4990, 127.0300),
+    ("store-b", "테스트마트 B점", 37.5000, 127.0310),
+]
+PRODUCTS = [
+    ("우유|서울우유|1L", "우유", "서울우유", "1L", "dairy"),
+    ("우유|매일|900ml", "우유", "매일", "900ml", "dairy"),
+    ("두부|풀무원|300g", "두부", "풀무원", "300g", "tofu"),
+    ("순두부|풀무원|350g", "순두부", "풀무원", "350g", "tofu"),
+]
+SNAPSHOTS = [
+    ("store-a", "우유|서울우유|1L", 2000, "2026-02-01T00:00:00+00:00"),
+    ("store-a", "우유|서울우유|1L", 2500, "2026-02-10T00:00:00+00:00"),
+    ("store-a", "우유|매일|900ml", 2300, "2026-02-10T00:00:00+00:00"),
+    ("store-a", "순두부|풀무원|350g", 1500, "2026-02-10T00:00:00+00:00"),
+    ("store-b", "우유|매일|900ml", 1800, "2026-02-01T00:00:00+00:00"),
+    ("store-b", "우유|매일|900ml", 2400, "2026-02-10T00:00:00+00:00"),
+    ("store-b", "두부|풀무원|300g", 3000, "2026-02-10T00:00:00+00:00"),
+]
+
+
+async def _seed(db: aiosqlite.Connection) -> None:
+    await db.executemany(
+        """INSERT INTO store_master
+           (store_id, store_name, address, category, lat, lng, source, is_active, updated_at)
+           VALUES (?, ?, '서울', 'mart', ?, ?, 'test', 1, ?)""",
+        [(*store, UPDATED_AT) for store in STORES],
+    )
+    await db.executemany(
+        """INSERT INTO product_norm
+           (product_norm_key, normalized_name, brand, size_value, size_unit, size_display, category, aliases_json, updated_at)
+           VALUES (?, ?, ?, NULL, NULL, ?, ?, NULL, ?)""",
+        [(*product, UPDATED_AT) for product in PRODUCTS],
+    )
+    await db.executemany(
+        """INSERT INTO offline_price_snapshot
+           (price_snapshot_key, store_id, product_norm_key, price_won, observed_at, source, notice, created_at)
+           VALUES (?, ?, ?, ?, ?, 'test', '테스트 가격', ?)""",
+        [
+            (f"{store_id}|{key}|{observed_at}", store_id, key, price, observed_at, UPDATED_AT)
+            for store_id, key, price, observed_at in SNAPSHOTS
+        ],
+    )
+    await refresh_latest_offline_prices(db)
+    await db.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_store_index", [False, True])
+async def test_store_plans_use_latest_price_and_bulk_alternatives(use_store_index: bool):
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed(db)
+
+        store_index = None
+        if use_store_index:
+            store_index = StoreSpatialIndex()
+            await store_index.rebuild(db)
+        adapter = OfflinePlanAdapter(db, store_index=store_index)
+        basket = Basket(
+            items=[
+                BasketItem(item_name="우유", brand="서울우유", quantity=2),
+                BasketItem(item_name="두부", quantity=1),
+            ]
+        )
+        result = await adapter.build_candidates(basket, mode="offline")
+        plans = {plan.mart_name: plan for plan in result.candidates}
+        assert set(plans) == {"테스트마트 A점", "테스트마트 B점"}
+
+        store_a = plans["테스트마트 A점"]
+        assert [(item.item_name, item.price) for item in store_a.items] == [("우유", 5000)]
+        assert store_a.price_observed_at == "2026-02-10T00:00:00+00:00"
+        [missing_tofu] = store_a.missing_items
+        assert missing_tofu.alternative is not None
+        assert missing_tofu.alternative.item_name == "순두부"
+        assert missing_tofu.alternative.unit_price == 1500
+
+        store_b = plans["테스트마트 B점"]
+        assert [(item.item_name, item.price) for item in store_b.items] == [("두부", 3000)]
+        [missing_milk] = store_b.missing_items
+        assert missing_milk.alternative is not None
+        assert missing_milk.alternative.brand == "매일"
+        # 과거 이력의 더 싼 가격이 아니라 최신가
+        assert missing_milk.alternative.unit_price == 2400
+
+
+@pytest.mark.asyncio
+async def test_refresh_latest_offline_prices_tracks_new_snapshots():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed(db)
+
+        await db.execute(
+            """INSERT INTO offline_price_snapshot
+               (price_snapshot_key, store_id, product_norm_key, price_won, observed_at, source, notice, created_at)
+               VALUES ('new', 'store-a', '우유|서울우유|1L', 2700, '2026-02-15T00:00:00+00:00', 'test', '신규', ?)""",
+            (UPDATED_AT,),
+        )
+        assert await refresh_latest_offline_prices(db, ["우유|서울우유|1L"]) == 1
+        await db.commit()
+
+        cursor = await db.execute(
+            "SELECT price_won, notice FROM latest_offline_price WHERE store_id = 'store-a' AND product_norm_key = ?",
+            ("우유|서울우유|1L",),
+        )
+        row = await cursor.fetchone()
+        assert (row["price_won"], row["notice"]) == (2700, "신규")
+
+        cursor = await db.execute(
+            "SELECT median_price, lower_bound, upper_bound, sample_count FROM offline_price_guardrail WHERE product_norm_key = ?",
+            ("우유|서울우유|1L",),
+        )
+        row = await cursor.fetchone()
+        assert tuple(row) == (2500.0, 1125, 5500, 3)
+
+
+@pytest.mark.asyncio
+async def test_working_set_recomputes_only_changed_items():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed(db)
+
+        adapter = OfflinePlanAdapter(db, working_sets=CandidateWorkingSetStore())
+        matched_batches: list[list[str]] = []
+        match_many = adapter._matcher.match_many
+
+        async def spy_match_many(items, **kwargs):
+            matched_batches.append([item.item_name for item in items])
+            return await match_many(items, **kwargs)
+
+        adapter._matcher.match_many = spy_match_many  # type: ignore[method-assign]
+
+        async def plans_for(basket: Basket, incremental: bool) -> list[dict]:
+            if incremental:
+                result = await adapter.build_candidates(basket, mode="offline", working_set_key="user-1")
+            else:
+                result = await OfflinePlanAdapter(db).build_candidates(basket, mode="offline")
+            return sorted((plan.model_dump() for plan in result.candidates), key=lambda plan: plan["mart_name"])
+
+        milk = BasketItem(item_name="우유", brand="서울우유", quantity=2)
+        tofu = BasketItem(item_name="두부", quantity=1)
+
+        await plans_for(Basket(items=[milk]), incremental=True)
+        # 품목 추가: 새 품목만 매칭, 새로 후보가 된 매장의 기존 품목 대체품까지 전체 계산과 동일
+        added = Basket(items=[milk, tofu])
+        assert await plans_for(added, incremental=True) == await plans_for(added, incremental=False)
+        # 수량 변경/삭제는 매칭을 다시 하지 않는다
+        edited = Basket(items=[tofu.model_copy(update={"quantity": 3})])
+        assert await plans_for(edited, incremental=True) == await plans_for(edited, incremental=False)
+
+        assert matched_batches == [["우유"], ["두부"]]
+
+
+@pytest.mark.asyncio
+async def test_provisional_candidates_arrive_before_routing_finishes():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed(db)
+
+        provisional_seen = asyncio.Event()
+
+        class _WaitingRoutingProvider:
+            async def estimate_route(self, origin: dict, destination: dict, mode: str) -> dict:
+                # 임시 후보가 전달된 뒤에야 경로 응답을 돌려준다
+                await provisional_seen.wait()
+                return {"distance_km": 1.5, "duration_min": 25}
+
+        provisional: list[list[Plan]] = []
+
+        async def on_provisional(plans: list[Plan]) -> None:
+            provisional.append(plans)
+            provisional_seen.set()
+
+        adapter = OfflinePlanAdapter(db, working_sets=CandidateWorkingSetStore())
+        basket = Basket(items=[BasketItem(item_name="우유", brand="서울우유", quantity=1)])
+        result = await adapter.build_candidates(
+            basket,
+            mode="offline",
+            routing_provider=_WaitingRoutingProvider(),
+            working_set_key="user-1",
+            on_provisional=on_provisional,
+        )
+
+        assert len(provisional) == 1
+        assert {plan.mart_name for plan in provisional[0]} == {plan.mart_name for plan in result.candidates}
+        assert all(plan.travel_minutes < 25 for plan in provisional[0])
+        assert all(plan.travel_minutes == 25 for plan in result.candidates)
+
+        # 작업 집합 재사용 시에는 경로 조회가 없으므로 임시 후보도 없다
+        await adapter.build_candidates(basket, mode="offline", working_set_key="user-1", on_provisional=on_provisional)
+        assert len(provisional) == 1
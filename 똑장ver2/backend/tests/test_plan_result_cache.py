@@ -0,0 +1,52 @@
+"""플랜 결과 캐시 키 정규화/무효화 테스트."""
+from __future__ import annotations
+
+from src.application.services.plan_result_cache import PlanResultCache
+from src.domain.models.basket import BasketItem
+
+MILK = BasketItem(item_name="우유", quantity=1)
+TOFU = BasketItem(item_name="두부", quantity=2)
+
+
+def _key(cache: PlanResultCache, items, **overrides) -> str:
+    params = {
+        "items": items,
+        "lat": 37.4982,
+        "lng": 127.0292,
+        "travel_mode": "walk",
+        "max_travel_minutes": 20,
+        "mode": "offline",
+        "preferred_brands": ["서울우유"],
+        "disliked_brands": [],
+    }
+    params.update(overrides)
+    return cache.make_key(**params)
+
+
+def test_key_ignores_item_order_and_position_within_cell():
+    cache = PlanResultCache()
+    base = _key(cache, [MILK, TOFU])
+    assert _key(cache, [TOFU, MILK], lat=37.4983) == base
+    assert _key(cache, [MILK, TOFU], lat=37.4995) != base
+    assert _key(cache, [MILK, TOFU], travel_mode="car") != base
+    assert _key(cache, [MILK, TOFU], preferred_brands=[]) != base
+    assert _key(cache, [MILK, TOFU.model_copy(update={"quantity": 3})]) != base
+
+
+def test_invalidate_products_drops_only_entries_using_them():
+    cache: PlanResultCache[str] = PlanResultCache()
+    cache.set("a", "plans-a", product_keys=["milk-1l", "tofu"])
+    cache.set("b", "plans-b", product_keys=["egg-30"])
+
+    assert cache.invalidate_products(["tofu"]) == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == "plans-b"
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_degraded_results_use_short_ttl():
+    cache: PlanResultCache[str] = PlanResultCache(ttl_seconds=300, degraded_ttl_seconds=0)
+    cache.set("ok", "plans", product_keys=["milk"])
+    cache.set("degraded", "plans", degraded=True)
+    assert cache.get("ok") == "plans"
+    assert cache.get("degraded") is None
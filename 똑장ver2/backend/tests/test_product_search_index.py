@@ -0,0 +1,150 @@
+"""상품 검색 역색인 테스트."""
+from __future__ import annotations
+
+import json
+
+import aiosqlite
+import pytest
+
+from src.application.services.product_matcher_db import (
+    ProductMatcherDB,
+    get_candidate_features,
+    invalidate_candidate_features,
+)
+from src.application.services.product_search_index import ProductSearchIndex
+from src.domain.models.basket import BasketItem
+from src.infrastructure.persistence.database import INIT_SQL
+
+PRODUCTS = [
+    ("우유|서울우유|1L", "우유", "서울우유", "1L", "dairy", json.dumps(["흰우유", "milk"])),
+    ("우유|매일|900ml", "우유", "매일", "900ml", "dairy", None),
+    ("딸기우유|빙그레|240ml", "딸기우유", "빙그레", "240ml", "dairy", None),
+    ("두부|풀무원|300g", "두부", "풀무원", "300g", "tofu", json.dumps(["부침두부"])),
+    ("대파|참가격|1단", "대파", "참가격", "1단", "veg", None),
+]
+
+
+async def _seed_products(db: aiosqlite.Connection) -> None:
+    await db.executemany(
+        """INSERT INTO product_norm
+           (product_norm_key, normalized_name, brand, size_value, size_unit, size_display, category, aliases_json, updated_at)
+           VALUES (?, ?, ?, NULL, NULL, ?, ?, ?, '2026-02-20T00:00:00+00:00')""",
+        PRODUCTS,
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_full_coverage_and_alias_hits():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed_products(db)
+        index = ProductSearchIndex()
+        assert await index.rebuild(db) == len(PRODUCTS)
+
+        names = [row["normalized_name"] for row in index.search("우유")]
+        assert names[0] == "우유"
+        assert "두부" not in names
+
+        alias_hit = index.search("milk")
+        assert alias_hit[0]["product_norm_key"] == "우유|서울우유|1L"
+
+        single = index.search("파")
+        assert single[0]["normalized_name"] == "대파"
+
+
+@pytest.mark.asyncio
+async def test_upsert_rows_replaces_stale_postings():
+    index = ProductSearchIndex()
+    index.upsert_rows(
+        [{"product_norm_key": "k1", "normalized_name": "두부", "aliases_json": json.dumps(["연두부"])}]
+    )
+    assert index.search("연두부")[0]["product_norm_key"] == "k1"
+
+    index.upsert_rows([{"product_norm_key": "k1", "normalized_name": "순두부", "aliases_json": None}])
+    assert len(index) == 1
+    assert index.search("순두부")[0]["normalized_name"] == "순두부"
+    assert index.search("연")[0]["product_norm_key"] == "k1"  # 검색 실패 시 이름순 fallback
+
+    index.remove("k1")
+    assert index.search("두부") == []
+
+
+@pytest.mark.asyncio
+async def test_matcher_with_index_matches_like_query_result():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed_products(db)
+        index = ProductSearchIndex()
+        await index.rebuild(db)
+
+        item = BasketItem(item_name="우유", brand="서울우유")
+        with_index = await ProductMatcherDB(db, search_index=index).match(item)
+        without_index = await ProductMatcherDB(db).match(item)
+        assert with_index is not None
+        assert with_index == without_index
+
+
+def test_candidate_features_cached_until_row_changes():
+    row = {
+        "product_norm_key": "feat|k1",
+        "normalized_name": "서울 우유",
+        "brand": "서울우유",
+        "size_display": "1L",
+        "aliases_json": json.dumps(["흰우유"]),
+    }
+    first = get_candidate_features(row)
+    assert first.aliases == ("흰우유",)
+    assert first.size_metric == (1000.0, "ml")
+    assert get_candidate_features(dict(row)) is first
+
+    changed = get_candidate_features({**row, "size_display": "900ml"})
+    assert changed is not first
+    assert changed.size_metric == (900.0, "ml")
+
+    invalidate_candidate_features(["feat|k1"])
+    assert get_candidate_features({**row, "size_display": "900ml"}) is not changed
+
+
+@pytest.mark.asyncio
+async def test_matcher_prefers_requested_brand_with_cached_features():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed_products(db)
+        index = ProductSearchIndex()
+        await index.rebuild(db)
+
+        matcher = ProductMatcherDB(db, search_index=index)
+        result = await matcher.match(BasketItem(item_name="우유", brand="매일"))
+        assert result is not None
+        assert result.product_norm_key == "우유|매일|900ml"
+
+
+@pytest.mark.asyncio
+async def test_match_many_agrees_with_sequential_match():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await _seed_products(db)
+        matcher = ProductMatcherDB(db)
+
+        items = [
+            BasketItem(item_name="두부"),
+            BasketItem(item_name="우유", brand="매일"),
+            BasketItem(item_name="대파"),
+            BasketItem(item_name="두부"),
+        ]
+        batched = await matcher.match_many(items)
+        sequential = [await matcher.match(item) for item in items]
+
+        assert batched == sequential
+        assert [m.product_norm_key for m in batched if m] == [
+            "두부|풀무원|300g",
+            "우유|매일|900ml",
+            "대파|참가격|1단",
+            "두부|풀무원|300g",
+        ]
+        assert await matcher.match_many([]) == []
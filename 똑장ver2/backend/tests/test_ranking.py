@@ -1,4 +1,6 @@
 """RankingEngine 테스트 — TRD 12절 기반."""
+import random
+
 import pytest
 from src.application.services.ranking_engine import RankingEngine
 from src.domain.models.plan import Plan, PlanItem, PlanType
@@ -97,3 +99,80 @@ class TestRankingEngine:
         # 중복 매장이 없어야 함 (3개 후보가 모두 다른 매장이면)
         if len(result) == 3:
             assert len(set(mart_names)) >= 2  # 최소 2개 이상 서로 다른 매장
+
+
+def _random_pool(size: int, seed: int, total_items: int = 5) -> list[Plan]:
+    rng = random.Random(seed)
+    plans: list[Plan] = []
+    for idx in range(size):
+        coverage = rng.randint(2, total_items)
+        plan = _make_plan(f"mart-{idx % max(3, size // 2)}", rng.randint(8000, 20000), coverage, total_items)
+        plans.append(plan.model_copy(update={"travel_minutes": rng.choice([None, *range(3, 60)])}))
+    return plans
+
+
+def _expected_winners(candidates: list[Plan]) -> tuple[Plan, Plan, Plan]:
+    """프런티어 없이 전체 정렬로 구한 유형별 1위."""
+    filtered = [p for p in candidates if p.coverage_ratio >= RankingEngine.MIN_COVERAGE]
+    if len(filtered) < 3:
+        filtered = [p for p in candidates if p.coverage_ratio >= RankingEngine.FALLBACK_MIN_COVERAGE]
+    travel = [p.travel_minutes or 999 for p in filtered]
+    price_min, price_range = min(p.estimated_total for p in filtered), (
+        max(p.estimated_total for p in filtered) - min(p.estimated_total for p in filtered) or 1
+    )
+    travel_min, travel_range = min(travel), max(travel) - min(travel) or 1
+    cov_min = min(p.coverage_ratio for p in filtered)
+    cov_range = max(p.coverage_ratio for p in filtered) - cov_min or 1
+
+    def score(p: Plan) -> float:
+        return (
+            0.5 * (p.estimated_total - price_min) / price_range
+            + 0.3 * ((p.travel_minutes or 999) - travel_min) / travel_range
+            - 0.2 * (p.coverage_ratio - cov_min) / cov_range
+        )
+
+    cheapest = sorted(filtered, key=lambda p: (p.estimated_total, -p.coverage, p.travel_minutes or 999))[0]
+    nearest = sorted(filtered, key=lambda p: (p.travel_minutes or 999, p.estimated_total, -p.coverage))[0]
+    balanced = sorted(filtered, key=score)[0]
+    return cheapest, nearest, balanced
+
+
+class TestParetoRanking:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_frontier_winners_match_full_sort(self, engine, seed):
+        candidates = _random_pool(60, seed)
+        cheapest, nearest, balanced = _expected_winners(candidates)
+        result = engine.rank_plans(candidates)
+
+        assert [p.plan_type for p in result] == [PlanType.CHEAPEST, PlanType.NEAREST, PlanType.BALANCED]
+        assert result[0].model_copy(update={"plan_type": cheapest.plan_type, "badges": []}) == cheapest
+        assert result[1].model_copy(update={"plan_type": nearest.plan_type, "badges": []}) == nearest
+        if balanced.mart_name not in {cheapest.mart_name, nearest.mart_name}:
+            assert result[2].model_copy(update={"plan_type": balanced.plan_type, "badges": []}) == balanced
+        else:
+            assert result[2].mart_name not in {cheapest.mart_name, nearest.mart_name}
+
+    def test_balanced_runner_up_is_best_remaining_mart(self, engine):
+        candidates = [
+            _make_plan("먼 할인점", 15000, 5).model_copy(update={"travel_minutes": 40}),
+            _make_plan("동네마트", 9000, 5).model_copy(update={"travel_minutes": 5}),
+            _make_plan("중간마트", 10000, 5).model_copy(update={"travel_minutes": 8}),
+        ]
+        result = engine.rank_plans(candidates)
+        # 동네마트가 최저가·최단거리·균형 1위를 모두 차지 → 균형은 남은 매장 중 점수가 가장 좋은 곳
+        assert [p.mart_name for p in result] == ["동네마트", "동네마트", "중간마트"]
+        assert result[2].badges == ["추천"]
+
+    def test_large_pool_only_copies_top3(self, engine, monkeypatch):
+        candidates = _random_pool(10_000, seed=7)
+        copies: list[str] = []
+        original_copy = Plan.model_copy
+
+        def counting_copy(self, *args, **kwargs):
+            copies.append(self.mart_name)
+            return original_copy(self, *args, **kwargs)
+
+        monkeypatch.setattr(Plan, "model_copy", counting_copy)
+        result = engine.rank_plans(candidates)
+        assert len(result) == 3
+        assert len(copies) == 3
@@ -0,0 +1,81 @@
+"""매장 경로 병렬 조회/구간 캐시 테스트."""
+from __future__ import annotations
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+from src.application.services.offline_plan_adapter import OfflinePlanAdapter
+from src.core.config import settings
+from src.infrastructure.persistence.cache_service import CacheService
+from src.infrastructure.persistence.database import INIT_SQL
+from src.infrastructure.providers.naver_routing import NaverRoutingProvider
+
+ORIGIN = (37.4985, 127.0292)
+STORES = [
+    {"store_id": f"store-{idx}", "lat": 37.4990 + idx * 0.001, "lng": 127.0300}
+    for idx in range(6)
+]
+
+
+class _SlowRoutingProvider:
+    def __init__(self, slow_store_id: str) -> None:
+        self.slow_store_id = slow_store_id
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def estimate_route(self, origin: dict, destination: dict, mode: str) -> dict:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(5 if destination["store_id"] == self.slow_store_id else 0.01)
+            return {"distance_km": 0.7, "duration_min": 9}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_estimate_routes_bounds_concurrency_and_falls_back_after_deadline():
+    provider = _SlowRoutingProvider(slow_store_id="store-3")
+    adapter = OfflinePlanAdapter(db=None, routing_concurrency=2, routing_deadline_seconds=0.3)  # type: ignore[arg-type]
+
+    routes, degraded = await adapter._estimate_routes(*ORIGIN, STORES, travel_mode="walk", routing_provider=provider)
+
+    assert degraded is True
+    assert provider.max_in_flight <= 2
+    assert [route.travel_minutes for idx, route in enumerate(routes) if idx != 3] == [9] * 5
+    # 마감을 넘긴 구간은 직선거리 추정치
+    assert routes[3].travel_minutes != 9
+    assert routes[3].distance_km == pytest.approx(0.5, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_estimate_routes_without_provider_uses_straight_line():
+    adapter = OfflinePlanAdapter(db=None)  # type: ignore[arg-type]
+    routes, degraded = await adapter._estimate_routes(*ORIGIN, STORES[:2], travel_mode="walk")
+    assert degraded is True
+    assert [route.travel_minutes for route in routes] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_naver_routing_caches_leg_by_origin_cell_and_store():
+    async with aiosqlite.connect(":memory:") as cache_db:
+        await cache_db.executescript(INIT_SQL)
+        provider = NaverRoutingProvider(settings=settings, cache=CacheService(cache_db))
+
+        destination = {"lat": 37.5045, "lng": 127.0490, "store_id": "store-x"}
+        first = await provider.estimate_route({"lat": 37.49851, "lng": 127.02921}, destination, "walk")
+        # 같은 100m 격자 안의 다른 출발지는 캐시 적중 (목적지 좌표가 달라도 store_id 기준)
+        second = await provider.estimate_route(
+            {"lat": 37.49879, "lng": 127.02919},
+            {**destination, "lat": 0.0, "lng": 0.0},
+            "walk",
+        )
+        assert second == first
+
+        cursor = await cache_db.execute("SELECT COUNT(*) FROM cache_entries")
+        assert (await cursor.fetchone())[0] == 1
+
+        other_mode = await provider.estimate_route({"lat": 37.49851, "lng": 127.02921}, destination, "car")
+        assert other_mode["mode"] == "car"
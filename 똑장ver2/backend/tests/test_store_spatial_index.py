@@ -0,0 +1,119 @@
+"""매장 격자 공간 색인 테스트."""
+from __future__ import annotations
+
+import aiosqlite
+import httpx
+import pytest
+
+from src.application.services.offline_plan_adapter import CandidateWorkingSetStore
+from src.application.services.plan_result_cache import PlanResultCache
+from src.application.services.public_catalog_sync import PublicCatalogSyncService
+from src.application.services.store_spatial_index import StoreSpatialIndex
+from src.infrastructure.persistence.database import INIT_SQL
+
+ORIGIN = (37.4985, 127.0292)
+
+
+def _store(store_id: str, lat: float, lng: float, is_active: int = 1) -> dict:
+    return {"store_id": store_id, "store_name": store_id, "lat": lat, "lng": lng, "is_active": is_active}
+
+
+def test_nearest_orders_by_distance_within_radius():
+    index = StoreSpatialIndex()
+    index.upsert_rows(
+        [
+            _store("far", 37.5300, 127.0292),  # 약 3.5km
+            _store("mid", 37.5085, 127.0292),  # 약 1.1km
+            _store("near", 37.4990, 127.0295),
+            _store("busan", 35.1796, 129.0756),
+        ]
+    )
+
+    result = index.nearest(*ORIGIN, radius_km=3.0, limit=10)
+    assert [store["store_id"] for store, _ in result] == ["near", "mid"]
+    assert result[0][1] < result[1][1] <= 3.0
+
+    assert [store["store_id"] for store, _ in index.nearest(*ORIGIN, radius_km=5.0, limit=1)] == ["near"]
+    assert len(index.nearest(*ORIGIN, radius_km=500.0, limit=10)) == 4
+
+
+def test_upsert_moves_store_and_drops_inactive():
+    index = StoreSpatialIndex()
+    index.upsert_rows([_store("s1", 37.4990, 127.0295), _store("s2", 37.5000, 127.0300)])
+
+    index.upsert_rows([_store("s1", 37.6000, 127.1000)])
+    assert [store["store_id"] for store, _ in index.nearest(*ORIGIN, 2.0, 10)] == ["s2"]
+
+    index.upsert_rows([_store("s2", 37.5000, 127.0300, is_active=0)])
+    assert index.nearest(*ORIGIN, 2.0, 10) == []
+    assert len(index) == 1
+
+    index.remove("s1")
+    assert len(index) == 0
+
+
+@pytest.mark.asyncio
+async def test_rebuild_loads_active_stores_only():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await db.executemany(
+            """INSERT INTO store_master
+               (store_id, store_name, address, category, lat, lng, source, is_active, updated_at)
+               VALUES (?, ?, '서울', 'mart', ?, ?, 'test', ?, '2026-02-20T00:00:00+00:00')""",
+            [
+                ("store-a", "A점", 37.4990, 127.0300, 1),
+                ("store-b", "B점", 37.5000, 127.0310, 0),
+            ],
+        )
+        await db.commit()
+
+        index = StoreSpatialIndex()
+        assert await index.rebuild(db) == 1
+        assert index.is_ready
+        [(store, distance)] = index.nearest(*ORIGIN, 3.0, 30)
+        assert store["store_name"] == "A점"
+        assert distance < 0.2
+
+
+@pytest.mark.asyncio
+async def test_catalog_sync_reconciles_index_with_active_stores():
+    async with aiosqlite.connect(":memory:") as db:
+        db.row_factory = aiosqlite.Row
+        await db.executescript(INIT_SQL)
+        await db.execute(
+            """INSERT INTO store_master
+               (store_id, store_name, address, category, lat, lng, source, is_active, updated_at)
+               VALUES ('store-new', '신규점', '서울', 'mart', 37.4990, 127.0300, 'test', 1, '2026-02-20T00:00:00+00:00')"""
+        )
+        await db.commit()
+
+        index = StoreSpatialIndex()
+        index.upsert_rows([_store("closed", 37.4985, 127.0292)])  # 더 이상 활성 매장이 아님
+        plan_cache = PlanResultCache()
+        working_sets = CandidateWorkingSetStore()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"data": {"error_code": "000", "item": []}}))
+        async with httpx.AsyncClient(transport=transport) as client:
+            service = PublicCatalogSyncService(
+                db=db,
+                cert_key="key",
+                cert_id="id",
+                http_client=client,
+                store_index=index,
+                plan_cache=plan_cache,
+                working_sets=working_sets,
+            )
+            plan_cache.set("plans", {"top3": ["closed"]}, product_keys=["우유|서울우유|1L"])
+            working_sets.set("user", object())
+            result = await service.sync_catalog(category_codes=["100"])
+
+            assert result["stores"] == 1
+            assert [store["store_id"] for store, _ in index.nearest(*ORIGIN, 3.0, 10)] == ["store-new"]
+            # 매장 구성이 바뀌면 그 매장을 담았을 수 있는 플랜 캐시/작업 집합을 버린다
+            assert plan_cache.get("plans") is None
+            assert working_sets.get("user") is None
+
+            # 매장 변화가 없으면 캐시는 그대로 둔다
+            plan_cache.set("plans", {"top3": ["store-new"]}, product_keys=["우유|서울우유|1L"])
+            await service.sync_catalog(category_codes=["100"])
+            assert plan_cache.get("plans") == {"top3": ["store-new"]}
@@ -0,0 +1,65 @@
+"""BoundedTTLCache LRU/바이트 상한/TTL/stale 동작 테스트."""
+from __future__ import annotations
+
+from src.core.ttl_cache import BoundedTTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_evicts_least_recently_used_entry():
+    cache: BoundedTTLCache[str, int] = BoundedTTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a").value == 1  # a를 최근 사용으로 갱신
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_and_rejects_oversized_value():
+    cache: BoundedTTLCache[str, str] = BoundedTTLCache(max_entries=10, ttl_seconds=60, max_bytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "yyyy")
+    cache.set("c", "zzzz")
+    assert "a" not in cache
+    assert cache.total_bytes == 8
+
+    cache.set("big", "x" * 11)
+    assert "big" not in cache
+    assert cache.total_bytes == 8
+
+
+def test_stale_window_then_expiry():
+    clock = _Clock()
+    cache: BoundedTTLCache[str, int] = BoundedTTLCache(max_entries=4, ttl_seconds=10, stale_seconds=5, clock=clock)
+    cache.set("k", 1)
+
+    clock.now = 9
+    assert cache.get("k").stale is False
+    clock.now = 12
+    assert cache.get("k").stale is True
+    clock.now = 16
+    assert cache.get("k") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"], stats["expirations"]) == (1, 1, 1, 1)
+    assert stats["entries"] == 0 and stats["bytes"] == 0
+
+
+def test_purge_expired_drops_only_entries_past_stale_window():
+    clock = _Clock()
+    cache: BoundedTTLCache[str, int] = BoundedTTLCache(max_entries=4, ttl_seconds=10, stale_seconds=5, clock=clock)
+    cache.set("old", 1)
+    clock.now = 8
+    cache.set("new", 2)
+    clock.now = 15
+    assert cache.purge_expired() == 1
+    assert "old" not in cache and "new" in cache
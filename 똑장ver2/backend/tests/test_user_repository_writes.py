@@ -0,0 +1,152 @@
+"""UserRepository 쓰기 묶음(unit of work / group commit) 테스트."""
+from __future__ import annotations
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+from src.application.services.chat_context import ChatTurn
+from src.domain.models.basket import Basket, BasketItem
+from src.infrastructure.persistence.chat_history_store import ChatHistoryStore
+from src.infrastructure.persistence.connection_pool import SqliteConnectionPool
+from src.infrastructure.persistence.database import INIT_SQL
+from src.infrastructure.persistence.user_repository import UserRepository
+
+
+class _CountingConnection:
+    """commit 횟수만 세는 aiosqlite 연결 래퍼."""
+
+    def __init__(self, db: aiosqlite.Connection):
+        self._db = db
+        self.commits = 0
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    async def commit(self) -> None:
+        self.commits += 1
+        await self._db.commit()
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_commit_once_defaults_exist():
+    async with aiosqlite.connect(":memory:") as raw:
+        raw.row_factory = aiosqlite.Row
+        await raw.executescript(INIT_SQL)
+        db = _CountingConnection(raw)
+        repo = UserRepository(db)
+        user = await repo.ensure_user("reader@example.com")
+        commits = db.commits
+
+        await repo.get_basket(user["user_id"])
+        await repo.get_preferences(user["user_id"])
+        await repo.get_profile(user["user_id"])
+        assert db.commits == commits
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_and_discards_on_error():
+    async with aiosqlite.connect(":memory:") as raw:
+        raw.row_factory = aiosqlite.Row
+        await raw.executescript(INIT_SQL)
+        db = _CountingConnection(raw)
+        repo = UserRepository(db)
+        user_id = (await repo.ensure_user("uow@example.com"))["user_id"]
+        commits = db.commits
+
+        basket = Basket(items=[BasketItem(item_name="우유", quantity=1)])
+        async with repo.unit_of_work():
+            await repo.save_basket(user_id, basket)
+            await repo.save_preferences(user_id, {"like": ["서울우유"]})
+            await repo.upsert_order(user_id, {"id": "ORD-1", "total": 1000})
+            # 블록이 끝나기 전에는 반영되지 않는다
+            assert (await repo.get_basket(user_id)).items == []
+        assert db.commits == commits + 1
+        assert [item.item_name for item in (await repo.get_basket(user_id)).items] == ["우유"]
+        assert (await repo.get_preferences(user_id))["like"] == ["서울우유"]
+
+        with pytest.raises(RuntimeError):
+            async with repo.unit_of_work():
+                await repo.save_basket(user_id, Basket(items=[]))
+                raise RuntimeError("boom")
+        assert db.commits == commits + 1
+        assert len((await repo.get_basket(user_id)).items) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_group_commit(tmp_path):
+    pool = await SqliteConnectionPool(str(tmp_path / "main.db"), readers=1, commit_window_ms=5).open()
+    try:
+        await pool.writer.executescript(INIT_SQL)
+        await pool.writer.commit()
+        setup = UserRepository(pool.writer, pool=pool)
+        user_ids = [(await setup.ensure_user(f"u{idx}@example.com"))["user_id"] for idx in range(8)]
+        batches = pool.stats()["write_batches"]
+
+        await asyncio.gather(
+            *(
+                UserRepository(pool.writer, pool=pool).save_preferences(user_id, {"like": [f"brand{idx}"]})
+                for idx, user_id in enumerate(user_ids)
+            )
+        )
+
+        stats = pool.stats()
+        assert stats["write_batches"] - batches < len(user_ids)
+        assert stats["commit_latency"]["samples"] == stats["write_batches"]
+        assert (await setup.get_preferences(user_ids[3]))["like"] == ["brand3"]
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_chat_turn_writes_share_one_commit_and_refresh_history_cache():
+    async with aiosqlite.connect(":memory:") as raw:
+        raw.row_factory = aiosqlite.Row
+        await raw.executescript(INIT_SQL)
+        db = _CountingConnection(raw)
+        repo = UserRepository(db)
+        user_id = (await repo.ensure_user("turn@example.com"))["user_id"]
+        history = ChatHistoryStore(max_messages=10)
+        await history.load(repo, user_id)
+        commits = db.commits
+
+        async with repo.unit_of_work():
+            await history.append(repo, user_id, [ChatTurn(role="user", content="우유 담아줘")])
+            # 버전을 돌려받아야 하는 장바구니 저장이 모인 대화 기록까지 함께 반영한다
+            assert await repo.save_basket_payload(user_id, '{"items": []}', expected_version=0) == 1
+        assert db.commits == commits + 1
+
+        # 커밋 뒤 메모리 사본이 DB의 마지막 ID로 맞춰져 다시 읽지 않는다
+        reloads = history.stats()["reloads"]
+        assert [turn.content for turn in await history.load(repo, user_id)] == ["우유 담아줘"]
+        assert history.stats()["reloads"] == reloads
+
+
+@pytest.mark.asyncio
+async def test_pooled_reads_see_only_committed_writes(tmp_path):
+    pool = await SqliteConnectionPool(str(tmp_path / "main.db"), readers=1).open()
+    try:
+        await pool.writer.executescript(INIT_SQL)
+        await pool.writer.commit()
+        repo = UserRepository(pool.writer, pool=pool)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_insert(db):
+            await db.execute(
+                "INSERT INTO users (user_id, email, created_at, updated_at) VALUES ('usr-x', 'x@example.com', 'now', 'now')"
+            )
+            started.set()
+            await release.wait()
+
+        pending = asyncio.create_task(pool.write(slow_insert))
+        await started.wait()
+        # 배치 트랜잭션 안의 미커밋 쓰기는 읽기에 보이지 않는다
+        assert await repo.get_user_by_id("usr-x") is None
+
+        release.set()
+        await pending
+        assert (await repo.get_user_by_id("usr-x"))["email"] == "x@example.com"
+    finally:
+        await pool.close()